@@ -4,6 +4,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import timedelta
 import warnings
+from name_registration_data import load_name_registration
 warnings.filterwarnings('ignore')
 
 # Set style for better-looking plots
@@ -12,26 +13,22 @@ plt.rcParams['figure.figsize'] = (15, 10)
 
 # Load the data
 print("Loading data...")
-df_name = pd.read_csv('nameregisvation.csv', low_memory=False)
+df_name = load_name_registration()
 
 print(f"Dataset shape: {df_name.shape}")
 print(f"\nColumns: {df_name.columns.tolist()}\n")
 
-# Convert date columns to datetime
+# Date columns are parsed by the loader
 date_columns = ['created_date', 'updated_date', 'approved_date', 'expire_date', 'submission_date']
 for col in date_columns:
     if col in df_name.columns:
-        df_name[col] = pd.to_datetime(df_name[col], errors='coerce')
         print(f"{col} - Non-null values: {df_name[col].notna().sum()}")
 
 print("\n" + "="*80)
 print("CALCULATING TIME PERIODS")
 print("="*80 + "\n")
 
-# Calculate time differences (in days)
-df_name['created_to_updated_days'] = (df_name['updated_date'] - df_name['created_date']).dt.total_seconds() / 86400
-df_name['updated_to_approved_days'] = (df_name['approved_date'] - df_name['updated_date']).dt.total_seconds() / 86400
-df_name['created_to_approved_days'] = (df_name['approved_date'] - df_name['created_date']).dt.total_seconds() / 86400
+# Time differences (in days) come precomputed from the feature store
 
 # Basic statistics
 print("Time Period Statistics (in days):")
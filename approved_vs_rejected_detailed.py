@@ -4,6 +4,9 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.patches import Rectangle
 import warnings
+from name_registration_data import load_name_registration
+from time_bins import PERIOD_BINS, cut
+from remark_clusters import assign_reasons
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -14,16 +17,11 @@ print("="*80)
 print("LOADING DATA")
 print("="*80)
 
-# Load data
-df = pd.read_csv('nameregisvation.csv', low_memory=False)
+# Load data (dates already parsed)
+df = load_name_registration()
 
-# Convert dates
-df['created_date'] = pd.to_datetime(df['created_date'], errors='coerce')
-df['approved_date'] = pd.to_datetime(df['approved_date'], errors='coerce')
-df['updated_date'] = pd.to_datetime(df['updated_date'], errors='coerce')
-
-# Calculate processing time (created to approved)
-df['processing_days'] = (df['approved_date'] - df['created_date']).dt.total_seconds() / 86400
+# Processing time (created to approved) from the feature store
+df['processing_days'] = df['created_to_approved_days']
 
 # Filter for APPROVED and REJECTED with valid processing days
 approved = df[(df['status'] == 'APPROVED') & (df['processing_days'].notna())].copy()
@@ -33,23 +31,21 @@ print(f"\nAPPROVED records with processing time: {len(approved):,}")
 print(f"REJECTED records with processing time: {len(rejected):,}")
 print(f"Total analyzed: {len(approved) + len(rejected):,}")
 
-# Clean remarks
-for df_subset in [approved, rejected]:
-    df_subset['remarks_clean'] = df_subset['latest_remarks'].fillna('No remarks')
-    df_subset['remarks_clean'] = df_subset['remarks_clean'].str.strip()
-    df_subset['remarks_clean'] = df_subset['remarks_clean'].replace(['', ' '], 'No remarks')
+# Normalize and cluster rejection remarks once per distinct wording;
+# near-identical remarks share a reason_id
+reason_ids, reasons = assign_reasons(rejected['latest_remarks'])
+rejected['reason_id'] = reason_ids
+print(f"Rejection remarks: {rejected['latest_remarks'].nunique():,} distinct texts -> {len(reasons):,} reasons")
 
 print("\n" + "="*80)
 print("TIME PERIOD DISTRIBUTION BINS")
 print("="*80)
 
-# Define time bins for analysis
-bins = [-np.inf, 0, 1, 3, 7, 14, 30, 60, 90, 180, 365, np.inf]
-labels = ['Same day', '1 day', '2-3 days', '4-7 days', '1-2 weeks',
-          '2-4 weeks', '1-2 months', '2-3 months', '3-6 months', '6-12 months', '1+ year']
+# Time bins (shared period scheme)
+labels = PERIOD_BINS.labels
 
-approved['time_bin'] = pd.cut(approved['processing_days'], bins=bins, labels=labels)
-rejected['time_bin'] = pd.cut(rejected['processing_days'], bins=bins, labels=labels)
+approved['time_bin'] = cut(approved['processing_days'], PERIOD_BINS)
+rejected['time_bin'] = cut(rejected['processing_days'], PERIOD_BINS)
 
 # Calculate distributions
 print("\nAPPROVED - Time Distribution:")
@@ -260,8 +256,16 @@ print("\n" + "="*80)
 print("REJECTION REMARKS ANALYSIS")
 print("="*80)
 
+# Count and time every reason in one grouped pass
+reason_groups = rejected.groupby('reason_id')['processing_days']
+reason_stats = reason_groups.agg(['size', 'mean'])
+reason_stats['variants'] = reasons.loc[reason_stats.index, 'variants']
+reason_stats.index = reasons.loc[reason_stats.index, 'reason']
+reason_stats = reason_stats.sort_values('size', ascending=False, kind='stable')
+reason_days = {reasons.loc[reason_id, 'reason']: days for reason_id, days in reason_groups}
+
 # Get top rejection reasons
-top_reasons = rejected['remarks_clean'].value_counts().head(15)
+top_reasons = reason_stats['size'].head(15)
 print(f"\nTop 15 Rejection Reasons (out of {len(rejected):,} rejections):")
 print("-"*80)
 print(f"{'Rank':<6} {'Count':>8} {'Percentage':>12} {'Reason'}")
@@ -312,7 +316,7 @@ data_to_plot = []
 labels_to_plot = []
 
 for reason in top_reasons_list:
-    reason_data = rejected[rejected['remarks_clean'] == reason]['processing_days'].dropna()
+    reason_data = reason_days[reason].dropna()
     if len(reason_data) > 0:
         data_to_plot.append(reason_data)
         # Short label
@@ -343,7 +347,7 @@ top_3_reasons = top_reasons.head(3).index.tolist()
 colors = ['darkred', 'orangered', 'lightcoral']
 
 for reason, color in zip(top_3_reasons, colors):
-    reason_data = rejected[rejected['remarks_clean'] == reason]['processing_days']
+    reason_data = reason_days[reason]
     label = (reason[:30] + '...') if len(reason) > 30 else reason
     ax3.hist(reason_data, bins=30, alpha=0.5, label=label, color=color, edgecolor='black')
 
@@ -558,16 +562,13 @@ time_dist_df.to_csv('time_period_distribution_comparison.csv', index=False)
 print("✓ Saved: time_period_distribution_comparison.csv")
 
 # Rejection reasons export
-rejection_reasons_df = rejected['remarks_clean'].value_counts().reset_index()
-rejection_reasons_df.columns = ['Rejection_Reason', 'Count']
-rejection_reasons_df['Percentage'] = (rejection_reasons_df['Count'] / len(rejected)) * 100
-
-# Add average processing time for each reason
-avg_times = []
-for reason in rejection_reasons_df['Rejection_Reason']:
-    avg_time = rejected[rejected['remarks_clean'] == reason]['processing_days'].mean()
-    avg_times.append(avg_time)
-rejection_reasons_df['Average_Processing_Days'] = avg_times
+rejection_reasons_df = pd.DataFrame({
+    'Rejection_Reason': reason_stats.index,
+    'Count': reason_stats['size'].to_numpy(),
+    'Percentage': (reason_stats['size'] / len(rejected) * 100).to_numpy(),
+    'Average_Processing_Days': reason_stats['mean'].to_numpy(),
+    'Wording_Variants': reason_stats['variants'].to_numpy(),
+})
 
 rejection_reasons_df.to_csv('rejection_reasons_summary.csv', index=False)
 print("✓ Saved: rejection_reasons_summary.csv")
@@ -620,7 +621,7 @@ print(f"""
 
 4. TOP REJECTION REASON:
    - {top_reasons.index[0]}: {top_reasons.iloc[0]:,} rejections ({(top_reasons.iloc[0] / len(rejected) * 100):.1f}%)
-   - Average processing time: {rejected[rejected['remarks_clean'] == top_reasons.index[0]]['processing_days'].mean():.1f} days
+   - Average processing time: {reason_stats['mean'].iloc[0]:.1f} days
 
 5. FILES GENERATED:
    ✓ approved_vs_rejected_distribution_detailed.png
@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+
+# How an application's open interval is read from a record dataset:
+#   start, end -> date columns opening and closing it
+#   status     -> status column; the end date only closes records whose
+#   closed        status is in closed (others are still open)
+#   group      -> default column to split the backlog by (None: one total)
+BacklogSpec = namedtuple('BacklogSpec', ['start', 'end', 'status', 'closed', 'group'])
+
+BACKLOG_SPECS = {
+    'name_registration': BacklogSpec('created_date', 'approved_date', 'status',
+                                     ['APPROVED', 'REJECTED'], 'company_type_id'),
+    'company_registration': BacklogSpec('created_date', 'approved_date', 'status',
+                                        ['APPROVED', 'REJECTED'], 'company_type_id'),
+    'deregistration': BacklogSpec('submitted_date', 'approved_date', 'application_status',
+                                  ['APPROVED', 'REJECTED'], 'de_registration_type'),
+    # Verified/rejected share applications were decided at their last update
+    'share': BacklogSpec('submission_date', 'updated_date', 'post_event_process_status',
+                         ['VERIFIED', 'REJECTED'], None),
+}
+
+# Final workflow auth_status values that close an application
+# (1 approved, 2 rejected, 3 sent back and never resubmitted)
+WORKFLOW_CLOSED_STATUSES = [1, 2, 3]
+
+
+def _days(values):
+    """int64 day numbers of a date column (NaT -> NaT's int64 view)."""
+    return np.asarray(values, dtype='datetime64[ns]').astype('datetime64[D]').view(np.int64)
+
+
+def open_counts(start, end, groups=None, as_of=None):
+    """Daily number of open items per group, from +1/-1 events and one cumulative sum.
+
+    An item is open at the end of day d when start day <= d < end day; an
+    item with no end (or ending after as_of) is still open at as_of. Every
+    start adds +1 and every end -1 at its (group, day) slot; the slots are
+    counted with np.bincount (a bucket sort) and summed along the days. The
+    work is linear in the number of items plus groups x days.
+
+    groups is a Series, or a list of Series for a multi-column split;
+    items with a missing group are left out.
+    Returns a frame indexed by day with one column per group ('open'
+    without groups).
+    """
+    start_day = _days(start)
+    end_day = _days(end)
+    nat = np.datetime64('NaT').view(np.int64)
+
+    if groups is None:
+        group_codes = np.zeros(len(start_day), dtype=np.int64)
+        group_names = pd.Index(['open'])
+    elif isinstance(groups, list):
+        # A tuple with a missing part would still factorize; mark it -1 like pd.factorize
+        missing = np.logical_or.reduce([pd.Series(values).isna().to_numpy() for values in groups])
+        kept = [pd.Series(values)[~missing] for values in groups]
+        kept_codes, group_names = pd.MultiIndex.from_arrays(kept).factorize(sort=True)
+        group_codes = np.full(len(start_day), -1, dtype=np.int64)
+        group_codes[~missing] = kept_codes
+    else:
+        group_codes, group_names = pd.factorize(pd.Series(groups), sort=True)
+
+    valid = (start_day != nat) & (group_codes >= 0)
+    if as_of is None:
+        known_ends = end_day[valid & (end_day != nat)]
+        as_of_day = max(start_day[valid].max(initial=0), known_ends.max(initial=0))
+    else:
+        as_of_day = _days([pd.Timestamp(as_of)])[0]
+    valid &= start_day <= as_of_day
+    if not valid.any():
+        return pd.DataFrame(columns=group_names)
+
+    first_day = start_day[valid].min()
+    num_days = as_of_day - first_day + 1
+    # Column num_days collects the ends after as_of and is dropped
+    still_open = (end_day == nat) | (end_day > as_of_day)
+    end_slot = np.where(still_open, num_days, np.maximum(end_day, start_day) - first_day)
+    start_slot = start_day - first_day
+
+    width = num_days + 1
+    size = len(group_names) * width
+    group_codes = group_codes[valid]
+    events = np.bincount(group_codes * width + start_slot[valid], minlength=size) - \
+        np.bincount(group_codes * width + end_slot[valid], minlength=size)
+    counts = events.reshape(len(group_names), width)[:, :num_days].cumsum(axis=1)
+
+    days = pd.to_datetime(np.arange(first_day, as_of_day + 1).astype('datetime64[D]'))
+    return pd.DataFrame(counts.T, index=days, columns=group_names)
+
+
+def record_intervals(df, dataset):
+    """(start, end) of every record of a dataset; end is NaT while it is still open."""
+    spec = BACKLOG_SPECS[dataset]
+    end = df[spec.end]
+    if spec.status is not None:
+        end = end.where(df[spec.status].isin(spec.closed))
+    return df[spec.start], end
+
+
+def backlog(df, dataset, as_of=None, group='default'):
+    """Daily open applications of a record dataset, split by group (a column name or None).
+
+    Raises KeyError when group is not a column of df.
+    """
+    spec = BACKLOG_SPECS[dataset]
+    if group == 'default':
+        group = spec.group
+    if group is not None and group not in df.columns:
+        raise KeyError(f"Backlog group '{group}' is not a column of the {dataset} records")
+    start, end = record_intervals(df, dataset)
+    groups = df[group] if group is not None else None
+    return open_counts(start, end, groups, as_of)
+
+
+def workflow_stays(df):
+    """Split the workflow history into stays: one application at one authority level.
+
+    A stay runs from a workflow event to the application's next event. The
+    last event of an application stays open unless its auth_status is in
+    WORKFLOW_CLOSED_STATUSES. Returns table_data_id, menu_name, auth_level,
+    start and end (NaT while open).
+    """
+    events = df.sort_values(['table_data_id', 'workflow_datetime'], kind='stable')
+    next_event = events['workflow_datetime'].shift(-1)
+    last = events['table_data_id'].ne(events['table_data_id'].shift(-1)).to_numpy()
+    closed = events['auth_status'].isin(WORKFLOW_CLOSED_STATUSES).to_numpy()
+
+    end = next_event.where(~last, events['workflow_datetime'].where(closed))
+    stays = events[['table_data_id', 'menu_name', 'auth_level']].copy()
+    stays['start'] = events['workflow_datetime']
+    stays['end'] = end
+    return stays.reset_index(drop=True)
+
+
+def workflow_backlog(df, by='menu_name', as_of=None):
+    """Daily open workflow applications (by='menu_name') or stays per level (by='auth_level')."""
+    stays = workflow_stays(df)
+    if by == 'menu_name':
+        # An application is open from its first event until its last stay ends
+        first = stays.drop_duplicates('table_data_id', keep='first')
+        last = stays.drop_duplicates('table_data_id', keep='last')
+        return open_counts(first['start'].to_numpy(), last['end'].to_numpy(),
+                           pd.Series(first['menu_name'].to_numpy()), as_of)
+    return open_counts(stays['start'], stays['end'], stays[by], as_of)
+
+
+def month_end_rows(counts):
+    """Backlog on the last day of every month."""
+    return counts.groupby(counts.index.to_period('M')).tail(1)
+
+
+if __name__ == "__main__":
+    import os
+    from snapshots import SNAPSHOT_SPECS, get_as_of
+
+    dataset = 'deregistration'
+    spec = SNAPSHOT_SPECS[dataset]
+    df = pd.read_csv(spec.csv, low_memory=False)
+    for col in [spec.created] + spec.dates:
+        df[col] = pd.to_datetime(df[col], errors='coerce')
+
+    print("="*80)
+    print(f"BACKLOG: {dataset} by {BACKLOG_SPECS[dataset].group} (month ends)")
+    print("="*80)
+    print(month_end_rows(backlog(df, dataset, as_of=get_as_of(dataset))).to_string())
+
+    workflow_csv = SNAPSHOT_SPECS['workflow'].csv
+    if os.path.exists(workflow_csv):
+        events = pd.read_csv(workflow_csv)
+        events['workflow_datetime'] = pd.to_datetime(events['workflow_date'], format='%d/%m/%Y %H:%M',
+                                                     errors='coerce')
+        events = events[events['workflow_datetime'].notna()]
+        for by in ['menu_name', 'auth_level']:
+            print("\n" + "="*80)
+            print(f"BACKLOG: workflow by {by} (month ends)")
+            print("="*80)
+            print(month_end_rows(workflow_backlog(events, by, as_of=get_as_of('workflow'))).to_string())
@@ -0,0 +1,161 @@
+import os
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from banijya_reader import load_frame, parse_filename
+
+# Log-bucketed quantile sketch (DDSketch style): every bucket covers a range of
+# durations whose ends differ by at most RELATIVE_ACCURACY, so any quantile read
+# from it is within 1% of the exact value. The bucket layout is fixed, which
+# makes merging two sketches an exact element-wise sum of counts.
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = np.log(GAMMA)
+MIN_DAYS = 1 / 86400     # dwell shorter than one second goes to the zero bucket
+MAX_DAYS = 36500         # anything longer is clamped into the last bucket
+MIN_KEY = int(np.ceil(np.log(MIN_DAYS) / LOG_GAMMA))
+MAX_KEY = int(np.ceil(np.log(MAX_DAYS) / LOG_GAMMA))
+NUM_BUCKETS = MAX_KEY - MIN_KEY + 2
+
+QUANTILES = [0.5, 0.9, 0.99]
+
+SKETCH_STORE = 'banijya_dwell_sketches.parquet'
+GROUP_COLUMNS = ['entity_type', 'app_type', 'working_order']
+
+
+def bucket_index(days):
+    """Map dwell times (days) to sketch bucket indices; 0 is the zero bucket."""
+    days = np.asarray(days, dtype=np.float64)
+    index = np.zeros(len(days), dtype=np.int64)
+    positive = days >= MIN_DAYS
+    keys = np.ceil(np.log(days[positive]) / LOG_GAMMA).astype(np.int64)
+    index[positive] = np.clip(keys - MIN_KEY + 1, 1, NUM_BUCKETS - 1)
+    return index
+
+
+def bucket_values():
+    """Representative dwell time (days) for every bucket index."""
+    keys = np.arange(MIN_KEY - 1, MAX_KEY + 1, dtype=np.float64)
+    values = 2 * np.power(GAMMA, keys) / (GAMMA + 1)
+    values[0] = 0.0
+    return values
+
+
+def sketch_quantiles(counts, quantiles=QUANTILES):
+    """Read quantiles from one sketch (array of NUM_BUCKETS counts)."""
+    total = counts.sum()
+    if total == 0:
+        return [np.nan] * len(quantiles)
+    cumulative = np.cumsum(counts)
+    ranks = np.asarray(quantiles) * (total - 1)
+    positions = np.searchsorted(cumulative, ranks, side='right')
+    return bucket_values()[positions].tolist()
+
+
+def dwell_times(filename):
+    """Time each application spent at each Working_Order before its next action.
+
+    Returns a frame with working_order and dwell_days; the last action of an
+    application has no following action and is left out.
+    """
+    df = load_frame(filename).sort_values(['TrackCode', 'ActionDate'], kind='stable')
+    next_action = df.groupby('TrackCode', sort=False)['ActionDate'].shift(-1)
+    dwell_days = (next_action - df['ActionDate']).dt.total_seconds() / 86400
+
+    valid = dwell_days.notna()
+    return pd.DataFrame({
+        'working_order': df.loc[valid, 'Working_Order'].to_numpy(),
+        'dwell_days': dwell_days[valid].to_numpy(),
+    })
+
+
+def file_sketches(filename):
+    """Build one sketch per Working_Order for a workbook, in sparse long format."""
+    entity_type, app_type = parse_filename(filename)
+    dwell = dwell_times(filename)
+
+    orders = dwell['working_order'].to_numpy().astype(np.int64)
+    buckets = bucket_index(dwell['dwell_days'].to_numpy())
+    num_orders = int(orders.max()) + 1 if len(orders) > 0 else 0
+    counts = np.bincount(orders * NUM_BUCKETS + buckets,
+                         minlength=num_orders * NUM_BUCKETS).reshape(num_orders, NUM_BUCKETS)
+
+    order_idx, bucket_idx = np.nonzero(counts)
+    return pd.DataFrame({
+        'source_file': filename,
+        'source_mtime': os.path.getmtime(filename),
+        'entity_type': entity_type,
+        'app_type': app_type,
+        'working_order': order_idx.astype(np.int8),
+        'bucket': bucket_idx.astype(np.int16),
+        'count': counts[order_idx, bucket_idx].astype(np.int64),
+    })
+
+
+def update_sketch_store(files, store_path=SKETCH_STORE, workers=None):
+    """Recompute sketches only for new or changed workbooks and save the store.
+
+    Sketches are kept per source file, so a re-exported workbook replaces its
+    own sketches instead of being counted twice. Stale files are sketched in
+    parallel worker processes.
+    """
+    store = pd.read_parquet(store_path) if os.path.exists(store_path) else None
+
+    stale = list(files)
+    if store is not None:
+        known = store.groupby('source_file')['source_mtime'].first()
+        stale = [f for f in files if known.get(f) != os.path.getmtime(f)]
+        store = store.loc[store['source_file'].isin(files) & ~store['source_file'].isin(stale)]
+
+    if stale:
+        print(f"  Sketching {len(stale)} workbook(s)...")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fresh = list(pool.map(file_sketches, sorted(stale)))
+        store = pd.concat(([store] if store is not None else []) + fresh, ignore_index=True)
+        store.to_parquet(store_path, index=False)
+
+    return store
+
+
+def merge_sketches(store, by=GROUP_COLUMNS):
+    """Merge per-file sketches into one sketch per group (exact sum of bucket counts)."""
+    return store.groupby(by + ['bucket'], observed=True)['count'].sum().reset_index()
+
+
+def dwell_quantiles(store, by=GROUP_COLUMNS, quantiles=QUANTILES):
+    """p50/p90/p99 dwell days per group from the sketch store."""
+    merged = merge_sketches(store, by)
+
+    rows = []
+    for key, group in merged.groupby(by, observed=True):
+        counts = np.zeros(NUM_BUCKETS, dtype=np.int64)
+        counts[group['bucket'].to_numpy()] = group['count'].to_numpy()
+        row = dict(zip(by, key))
+        row['count'] = int(counts.sum())
+        for q, value in zip(quantiles, sketch_quantiles(counts, quantiles)):
+            row[f'p{int(round(q * 100))}_days'] = value
+        rows.append(row)
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print("="*80)
+    print("BANIJYA DWELL TIME BY WORKING ORDER")
+    print("="*80)
+    print()
+
+    files = [f for f in os.listdir('.') if f.endswith('.xlsx')]
+    store = update_sketch_store(files)
+
+    summary = dwell_quantiles(store)
+    summary.to_csv('banijya_dwell_quantiles.csv', index=False)
+    print("✓ Saved: banijya_dwell_quantiles.csv")
+    print()
+
+    # Slowest desks: highest p90 dwell among orders with enough traffic
+    busy = summary[summary['count'] >= 50]
+    print("Slowest Working_Order steps (p90, at least 50 actions):")
+    print("-" * 80)
+    print(busy.sort_values('p90_days', ascending=False).head(15).to_string(index=False,
+                                                                           float_format='%.2f'))
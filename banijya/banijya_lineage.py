@@ -0,0 +1,140 @@
+import os
+import pandas as pd
+import numpy as np
+from banijya_reader import load_frame, parse_filename
+from dataset_cache import spec_signature, stored_signature, write_cache
+
+# Application types in the order a business normally meets them
+APP_TYPES = ['New', 'Navikaran', 'Samsodhan', 'Khareji']
+
+LINEAGE_CACHE = 'banijya_lineage_index.parquet'
+
+# Characters dropped when matching firm names across workbooks
+# (spaces, dots, zero-width joiners and common punctuation)
+NAME_NOISE = '[\\s.,()/\u200c\u200d-]+'
+
+# Applications without a firm name cannot be linked by name; each is keyed
+# as its own business by this prefix, its workbook and its TrackCode
+UNNAMED_PREFIX = '#'
+
+
+def normalize_firm_name(names):
+    """Vectorized firm-name key so spelling variants of one business match (NA when unnamed)."""
+    keys = names.astype('string').str.replace(NAME_NOISE, '', regex=True).str.lower()
+    return keys.mask(keys == '')
+
+
+def summarize_file(filename):
+    """Collapse one workbook to one row per TrackCode."""
+    df = load_frame(filename, extra_columns=['Firm_Name'])
+    entity_type, app_type = parse_filename(filename)
+
+    df = df.sort_values(['TrackCode', 'ActionDate'], kind='stable')
+    apps = df.groupby('TrackCode', sort=False).agg(
+        firm_name=('Firm_Name', 'first'),
+        first_action=('ActionDate', 'first'),
+        last_action=('ActionDate', 'last'),
+        final_status=('Working_Status', 'last'),
+        num_steps=('ActionDate', 'size'),
+    ).reset_index().rename(columns={'TrackCode': 'track_code'})
+
+    apps['entity_type'] = entity_type
+    apps['app_type'] = app_type
+    apps['source_file'] = filename
+    return apps
+
+
+def build_lineage_index(files):
+    """Link every banijya application to its business across all workbooks.
+
+    Returns one row per (source_file, track_code) sorted by entity_id and
+    first_action, with the entity's first 'New' registration date and the
+    lead time of each application from that registration precomputed.
+    """
+    index = pd.concat([summarize_file(f) for f in sorted(files)], ignore_index=True)
+
+    names = normalize_firm_name(index['firm_name'])
+    unnamed = UNNAMED_PREFIX + index['source_file'] + '|' + index['track_code'].astype(str)
+    index['entity_key'] = index['entity_type'] + '|' + names.fillna(unnamed)
+    index['entity_id'] = pd.factorize(index['entity_key'], sort=True)[0].astype(np.int32)
+
+    index = index.sort_values(['entity_id', 'first_action'], kind='stable').reset_index(drop=True)
+    index['sequence'] = index.groupby('entity_id').cumcount().astype(np.int16)
+
+    registrations = index.loc[index['app_type'] == 'New'].groupby('entity_id')['first_action'].min()
+    index['first_registered'] = index['entity_id'].map(registrations)
+    index['days_from_registration'] = (
+        (index['first_action'] - index['first_registered']).dt.total_seconds() / 86400
+    ).astype(np.float32)
+    index['days_since_previous'] = (
+        index.groupby('entity_id')['first_action'].diff().dt.total_seconds() / 86400
+    ).astype(np.float32)
+
+    index['entity_type'] = index['entity_type'].astype('category')
+    index['app_type'] = pd.Categorical(index['app_type'], categories=APP_TYPES)
+    index['source_file'] = index['source_file'].astype('category')
+    return index
+
+
+def load_lineage_index(files, cache_path=LINEAGE_CACHE):
+    """Return the lineage index, rebuilding it when the workbooks or name-matching rules change.
+
+    The cache is keyed on the sorted workbook list with each file's mtime
+    and size, so an added, removed or replaced workbook rebuilds it.
+    """
+    workbooks = [(f, os.path.getmtime(f), os.path.getsize(f)) for f in sorted(files)]
+    signature = spec_signature('banijya_lineage', NAME_NOISE, UNNAMED_PREFIX, workbooks)
+    if os.path.exists(cache_path) and stored_signature(cache_path) == signature:
+        return pd.read_parquet(cache_path)
+
+    index = build_lineage_index(files)
+    write_cache(index, cache_path, signature)
+    return index
+
+
+def entity_applications(index, entity_id):
+    """All applications of one business, in time order (binary search on the sorted index)."""
+    ids = index['entity_id'].to_numpy()
+    start, end = np.searchsorted(ids, [entity_id, entity_id + 1])
+    return index.iloc[start:end]
+
+
+def applications_for_registration_year(index, year, app_type='Navikaran'):
+    """Applications of one type filed by businesses first registered in the given year."""
+    mask = (index['app_type'] == app_type) & (index['first_registered'].dt.year == year)
+    return index.loc[mask]
+
+
+def lifecycle_lead_times(index, from_type='New', to_type='Navikaran'):
+    """Days from each business's first from_type application to its next to_type application."""
+    starts = index.loc[index['app_type'] == from_type].groupby('entity_id')['first_action'].min()
+    targets = index.loc[index['app_type'] == to_type, ['entity_id', 'first_action']]
+    targets = targets.assign(start=targets['entity_id'].map(starts)).dropna(subset=['start'])
+    targets = targets.loc[targets['first_action'] >= targets['start']]
+
+    follow_up = targets.groupby('entity_id')['first_action'].min()
+    lead_days = (follow_up - starts.loc[follow_up.index]).dt.total_seconds() / 86400
+    return lead_days.rename('lead_days')
+
+
+if __name__ == "__main__":
+    files = [f for f in os.listdir('.') if f.endswith('.xlsx')]
+
+    print("Building banijya lineage index...")
+    index = load_lineage_index(files)
+
+    print(f"  Applications: {len(index):,}")
+    print(f"  Businesses:   {index['entity_id'].nunique():,}")
+    multi = index.groupby('entity_id').size()
+    print(f"  Businesses with more than one application: {(multi > 1).sum():,}")
+    print()
+
+    print("Applications by type and registration year:")
+    print(pd.crosstab(index['first_registered'].dt.year.astype('Int64'), index['app_type']))
+    print()
+
+    for to_type in ['Navikaran', 'Samsodhan', 'Khareji']:
+        lead_days = lifecycle_lead_times(index, 'New', to_type)
+        if len(lead_days) > 0:
+            print(f"New → {to_type}: {len(lead_days):,} businesses, "
+                  f"median {lead_days.median():.1f} days, mean {lead_days.mean():.1f} days")
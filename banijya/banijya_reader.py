@@ -0,0 +1,228 @@
+import os
+import sys
+import pandas as pd
+import numpy as np
+from openpyxl import load_workbook
+
+# The bin schemes are shared with the top-level workflow scripts
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from time_bins import WORKFLOW_BINS
+
+bin_labels = WORKFLOW_BINS.labels
+
+# Only these columns are needed to build the application table
+STREAM_COLUMNS = ['TrackCode', 'ActionDate', 'Working_Order', 'Working_Status']
+
+# Every Working_Status value seen in the Department of Commerce exports
+WORKING_STATUSES = ['Request', 'Forward', 'SendBack', 'AcceptNotPaid', 'Accept', 'Reject']
+
+# Declared schema of the banijya exports: column -> dtype after loading
+BANIJYA_SCHEMA = {
+    'TrackCode': 'int64',
+    'ActionDate': 'datetime64[ns]',
+    'Working_Order': 'int8',
+    'Working_Status': pd.CategoricalDtype(WORKING_STATUSES),
+}
+
+
+def check_header(filename, header):
+    """Fail fast when a workbook header lacks any schema column."""
+    missing = [col for col in BANIJYA_SCHEMA if col not in header]
+    if missing:
+        extra = [col for col in header if col not in BANIJYA_SCHEMA]
+        raise ValueError(f"{filename} does not match the banijya schema:\n"
+                         f"  missing columns: {missing}\n"
+                         f"  unmatched columns in file: {extra}")
+
+
+def load_frame(filename, extra_columns=()):
+    """Load only the schema columns of a workbook with fixed compact dtypes.
+
+    extra_columns (e.g. 'Firm_Name') are loaded as strings alongside the
+    schema columns. Raises ValueError listing every column that does not fit
+    the schema (missing columns, unknown statuses, orders outside int8, bad dates).
+    """
+    header = [str(h).strip() for h in pd.read_excel(filename, nrows=0).columns]
+    check_header(filename, header)
+    missing_extra = [col for col in extra_columns if col not in header]
+    if missing_extra:
+        raise ValueError(f"{filename}: missing requested columns {missing_extra}")
+
+    dtypes = {'TrackCode': 'Int64', 'Working_Order': 'Int64', 'Working_Status': 'str'}
+    dtypes.update({col: 'str' for col in extra_columns})
+    df = pd.read_excel(filename, usecols=list(BANIJYA_SCHEMA) + list(extra_columns), dtype=dtypes)
+
+    problems = []
+    nulls = df.isna().sum()
+    for col in BANIJYA_SCHEMA:
+        if nulls[col] > 0:
+            problems.append(f"  {col}: {nulls[col]:,} empty values")
+
+    action_date = pd.to_datetime(df['ActionDate'], errors='coerce')
+    bad_dates = action_date.isna().sum() - nulls['ActionDate']
+    if bad_dates > 0:
+        problems.append(f"  ActionDate: {bad_dates:,} values are not dates")
+
+    order_info = np.iinfo(np.int8)
+    out_of_range = ((df['Working_Order'] < order_info.min) | (df['Working_Order'] > order_info.max)).sum()
+    if out_of_range > 0:
+        problems.append(f"  Working_Order: {out_of_range:,} values outside int8 range")
+
+    unknown = sorted(set(df['Working_Status'].dropna().unique()) - set(WORKING_STATUSES))
+    if unknown:
+        problems.append(f"  Working_Status: unexpected values {unknown} (expected {WORKING_STATUSES})")
+
+    if problems:
+        raise ValueError(f"{filename} does not match the banijya schema:\n" + "\n".join(problems))
+
+    df['ActionDate'] = action_date
+    return df.astype(BANIJYA_SCHEMA)
+
+
+def parse_filename(filename):
+    """Return (entity_type, app_type) from a banijya workbook name."""
+    parts = filename.replace('.xlsx', '').split('_')
+    entity_type = parts[0]
+    app_type = parts[1] if len(parts) > 1 else 'Unknown'
+    return entity_type, app_type
+
+
+def iter_records(filename, columns=STREAM_COLUMNS):
+    """Yield projected rows of the first sheet without loading the workbook.
+
+    The workbook is opened in read-only mode so openpyxl streams the sheet
+    XML instead of building every cell in memory.
+    """
+    wb = load_workbook(filename, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        header = [str(h).strip() if h is not None else '' for h in header]
+        check_header(filename, header)
+        positions = [header.index(col) for col in columns]
+
+        for row in rows:
+            values = tuple(row[i] if i < len(row) else None for i in positions)
+            if all(v is None for v in values):
+                continue
+            yield values
+    finally:
+        wb.close()
+
+
+def _to_datetime(value):
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if hasattr(value, 'year') and hasattr(value, 'hour'):
+        return value
+    return pd.Timestamp(value).to_pydatetime()
+
+
+def _new_state(action_date, order, status):
+    # [start, last_date, last_order, final_status, max_order, num_steps, transition_days]
+    return [action_date, action_date, order, status, order, 1, {}]
+
+
+def _fold(state, action_date, order, status):
+    """Fold one chronologically ordered record into an application state."""
+    from_order = state[2]
+    if from_order != order:
+        if order > from_order:
+            trans_key = f"O{int(from_order)}→O{int(order)}"
+        else:
+            trans_key = f"O{int(from_order)}←O{int(order)}"
+        transition_time = (action_date - state[1]).total_seconds() / 86400
+        transitions = state[6]
+        transitions[trans_key] = transitions.get(trans_key, 0) + transition_time
+
+    state[1] = action_date
+    state[2] = order
+    state[3] = status
+    if order is not None and (state[4] is None or order > state[4]):
+        state[4] = order
+    state[5] += 1
+
+
+def _finalize(track_code, state, entity_type, app_type):
+    """Turn a folded state into the same record analyze_file() produces."""
+    start_time, end_time, _, final_status, max_order, num_steps, transition_days = state
+    total_days = (end_time - start_time).total_seconds() / 86400
+
+    if total_days > 0:
+        transitions = {k: (v / total_days) * 100 for k, v in transition_days.items()}
+    else:
+        transitions = {k: 0 for k in transition_days}
+
+    return {
+        'track_code': track_code,
+        'final_status': final_status,
+        'total_days': total_days,
+        'max_order': int(max_order) if max_order is not None else 0,
+        'num_steps': num_steps,
+        'transitions': transitions,
+        'entity_type': entity_type,
+        'app_type': app_type
+    }
+
+
+def stream_applications(filename):
+    """Build the application table of analyze_file() by streaming the workbook.
+
+    Rows are folded into a small per-TrackCode state as they are read, so
+    memory grows with the number of applications rather than the number of
+    rows. Applications whose rows arrive out of ActionDate order are replayed
+    from a second pass over just those TrackCodes, so results match the
+    sort-then-scan logic of analyze_file().
+    """
+    print(f"  Streaming {filename}...")
+
+    entity_type, app_type = parse_filename(filename)
+
+    states = {}
+    needs_replay = set()
+    num_records = 0
+    known_statuses = set(WORKING_STATUSES)
+
+    for track_code, action_date, order, status in iter_records(filename):
+        num_records += 1
+        if status not in known_statuses:
+            raise ValueError(f"{filename} does not match the banijya schema:\n"
+                             f"  Working_Status: unexpected value {status!r} for TrackCode {track_code}")
+        action_date = _to_datetime(action_date)
+
+        state = states.get(track_code)
+        if state is None:
+            states[track_code] = _new_state(action_date, order, status)
+        elif track_code in needs_replay:
+            continue
+        elif action_date < state[1]:
+            needs_replay.add(track_code)
+        else:
+            _fold(state, action_date, order, status)
+
+    print(f"    Records: {num_records:,}, Applications: {len(states):,}")
+
+    if needs_replay:
+        events = {track_code: [] for track_code in needs_replay}
+        for track_code, action_date, order, status in iter_records(filename):
+            if track_code in events:
+                events[track_code].append((_to_datetime(action_date), order, status))
+
+        for track_code, records in events.items():
+            records.sort(key=lambda r: r[0])
+            state = _new_state(*records[0])
+            for record in records[1:]:
+                _fold(state, *record)
+            states[track_code] = state
+
+        print(f"    Replayed {len(needs_replay):,} out-of-order applications")
+
+    applications = [_finalize(track_code, state, entity_type, app_type)
+                    for track_code, state in states.items()]
+
+    print(f"    Processed {len(applications):,} applications")
+    return applications
@@ -0,0 +1,188 @@
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import seaborn as sns
+import numpy as np
+from collections import Counter
+from multiprocessing import Pool
+from banijya_reader import bin_labels
+
+# Each worker process is replaced after this many charts, which returns any
+# memory matplotlib kept around (font caches, figure managers) to the OS and
+# keeps peak RSS flat however many combinations there are.
+MAX_TASKS_PER_WORKER = 10
+
+
+def apply_style():
+    """Chart style shared by the banijya scripts."""
+    sns.set_style("whitegrid")
+    plt.rcParams['figure.dpi'] = 300
+    plt.rcParams['savefig.dpi'] = 300
+    plt.rcParams['font.size'] = 9
+
+
+# ==================== AGGREGATES ====================
+
+def time_chart_task(entity_type, app_type, category_info, app_df, filename):
+    """Precompute everything plot_time_distribution needs from the application rows."""
+    bin_counts = app_df['bin'].value_counts().reindex(bin_labels, fill_value=0)
+    return {
+        'kind': 'time',
+        'filename': filename,
+        'entity_type': entity_type,
+        'app_type': app_type,
+        'category_name': category_info['name'],
+        'color': category_info['color'],
+        'bin_counts': [int(c) for c in bin_counts.values],
+        'total': len(app_df),
+        'median': app_df['total_days'].median(),
+        'mean': app_df['total_days'].mean(),
+        'p95': app_df['total_days'].quantile(0.95),
+    }
+
+
+def authority_chart_task(entity_type, app_type, category_info, max_levels, filename):
+    """Precompute everything plot_authority_distribution needs from the max orders."""
+    level_counts = Counter(max_levels)
+    all_levels = sorted(level_counts.keys())
+    mode_level, mode_count = level_counts.most_common(1)[0]
+    return {
+        'kind': 'authority',
+        'filename': filename,
+        'entity_type': entity_type,
+        'app_type': app_type,
+        'category_name': category_info['name'],
+        'color': category_info['color'],
+        'levels': all_levels,
+        'counts': [level_counts[level] for level in all_levels],
+        'total': len(max_levels),
+        'median': np.median(max_levels),
+        'mean': np.mean(max_levels),
+        'mode_level': mode_level,
+        'mode_count': mode_count,
+    }
+
+
+# ==================== CHARTS ====================
+
+def plot_time_distribution(task):
+    """Plot time distribution for a specific combination."""
+    fig, ax = plt.subplots(figsize=(14, 6))
+
+    bin_counts = task['bin_counts']
+
+    x_pos = np.arange(len(bin_labels))
+    bars = ax.bar(x_pos, bin_counts, color=task['color'],
+                  edgecolor='black', alpha=0.7, linewidth=1.5)
+
+    total_apps = task['total']
+    for i, (bar, count) in enumerate(zip(bars, bin_counts)):
+        if count > 0:
+            percentage = (count / total_apps) * 100
+            label = f'{int(count)}\n({percentage:.1f}%)'
+            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(bin_counts)*0.01,
+                    label, ha='center', va='bottom', fontsize=8, fontweight='bold')
+
+    ax.set_xlabel('Time Period', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Number of Applications', fontsize=12, fontweight='bold')
+
+    title_text = f'{task["entity_type"]} - {task["app_type"]}\n{task["category_name"]} Applications - Time Distribution'
+    ax.set_title(title_text, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xticks(x_pos)
+    ax.set_xticklabels(bin_labels, rotation=45, ha='right', fontsize=10)
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+
+    stats_text = (f'Total: {total_apps:,} applications\n'
+                  f'Median: {task["median"]:.1f} days\n'
+                  f'Mean: {task["mean"]:.1f} days\n'
+                  f'95th percentile: {task["p95"]:.1f} days')
+    ax.text(0.98, 0.97, stats_text, transform=ax.transAxes,
+            fontsize=10, verticalalignment='top', horizontalalignment='right',
+            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5, edgecolor='black', linewidth=1.5))
+
+    fig.tight_layout()
+    return fig
+
+
+def plot_authority_distribution(task):
+    """Plot authority level distribution."""
+    all_levels = task['levels']
+    counts = task['counts']
+    total = task['total']
+    percentages = [(count / total) * 100 for count in counts]
+
+    fig, ax = plt.subplots(figsize=(14, 6))
+
+    x_pos = np.arange(len(all_levels))
+    bars = ax.bar(x_pos, counts, color=task['color'],
+                  edgecolor='black', alpha=0.7, linewidth=1.5)
+
+    for i, (bar, count, pct) in enumerate(zip(bars, counts, percentages)):
+        if count > 0:
+            label = f'{count}\n({pct:.1f}%)'
+            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(counts)*0.01,
+                    label, ha='center', va='bottom', fontsize=8, fontweight='bold')
+
+    mode_level = task['mode_level']
+    mode_count = task['mode_count']
+
+    ax.set_xlabel('Maximum Working Order Reached', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Number of Applications', fontsize=12, fontweight='bold')
+
+    title_text = f'{task["entity_type"]} - {task["app_type"]}\n{task["category_name"]} - Authority Level Distribution'
+    ax.set_title(title_text, fontsize=14, fontweight='bold', pad=20)
+
+    ax.set_xticks(x_pos)
+    ax.set_xticklabels([f'O{level}' for level in all_levels], fontsize=10, rotation=45, ha='right')
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+
+    stats_text = (f'Total Applications: {total:,}\n'
+                  f'Mean Order: {task["mean"]:.1f}\n'
+                  f'Median Order: {task["median"]:.1f}\n'
+                  f'Most Common: O{mode_level} ({mode_count} apps, {mode_count/total*100:.1f}%)')
+
+    ax.text(0.98, 0.97, stats_text, transform=ax.transAxes,
+            fontsize=10, verticalalignment='top', horizontalalignment='right',
+            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5,
+                      edgecolor='black', linewidth=1.5))
+
+    # Cumulative percentage
+    ax2 = ax.twinx()
+    cumulative_pct = np.cumsum(percentages)
+    ax2.plot(x_pos, cumulative_pct, color='red', marker='o', linewidth=2,
+             markersize=6, label='Cumulative %', linestyle='--')
+    ax2.set_ylabel('Cumulative Percentage (%)', fontsize=12, fontweight='bold', color='red')
+    ax2.tick_params(axis='y', labelcolor='red')
+    ax2.set_ylim(0, 105)
+    ax2.grid(False)
+
+    fig.tight_layout()
+    return fig
+
+
+PLOTTERS = {
+    'time': plot_time_distribution,
+    'authority': plot_authority_distribution,
+}
+
+
+# ==================== BATCH RENDERING ====================
+
+def render_task(task):
+    """Draw one chart, save it and free the figure. Returns the file name."""
+    fig = PLOTTERS[task['kind']](task)
+    fig.savefig(task['filename'], dpi=300, bbox_inches='tight')
+    plt.close(fig)
+    return task['filename']
+
+
+def render_all(tasks, processes=None, max_tasks_per_worker=MAX_TASKS_PER_WORKER):
+    """Render chart tasks in recycled worker processes.
+
+    Only the small aggregate dicts cross the process boundary; figures are
+    built and destroyed inside the workers, so the calling process never
+    grows with the number of charts.
+    """
+    with Pool(processes=processes, initializer=apply_style,
+              maxtasksperchild=max_tasks_per_worker) as pool:
+        return list(pool.imap_unordered(render_task, tasks, chunksize=1))
@@ -5,6 +5,8 @@ import seaborn as sns
 from collections import defaultdict
 import os
 import warnings
+from banijya_reader import load_frame, stream_applications, bin_labels, WORKFLOW_BINS
+from time_bins import cut
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -18,13 +20,12 @@ print("BANIJYA WORKFLOW - TRANSITION BREAKDOWN ANALYSIS")
 print("="*80)
 print()
 
-# Define time bins
-bins = [0, 1, 2, 3, 4, 5, 6, 7, 14, 21, 28, 35, 60, 90, 180, 365, np.inf]
-bin_labels = ['1d', '2d', '3d', '4d', '5d', '6d', '7d', '2wk', '3wk', '4wk', '5wk', '2mo', '3mo', '6mo', '1yr', '1yr+']
-
 # Get all Excel files
 files = [f for f in os.listdir('.') if f.endswith('.xlsx')]
 
+# Workbooks larger than this are streamed row by row instead of loaded whole
+STREAMING_THRESHOLD_BYTES = 50 * 1024 * 1024
+
 # Color schemes
 forward_colors = plt.cm.Blues(np.linspace(0.4, 0.9, 20))
 review_colors = plt.cm.Oranges(np.linspace(0.4, 0.8, 20))
@@ -62,7 +63,7 @@ def analyze_file(filename):
     """Analyze a single file and return application-level data."""
     print(f"  Loading {filename}...")
     
-    df = pd.read_excel(filename)
+    df = load_frame(filename)
     
     parts = filename.replace('.xlsx', '').split('_')
     entity_type = parts[0]
@@ -108,18 +109,10 @@ def analyze_file(filename):
             else:
                 transitions[trans_key] = trans_pct
         
-        # Assign to bin
-        bin_idx = np.digitize([total_days], bins)[0] - 1
-        if bin_idx < 0:
-            bin_idx = 0
-        if bin_idx >= len(bin_labels):
-            bin_idx = len(bin_labels) - 1
-        
         applications.append({
             'track_code': track_code,
             'final_status': final_status,
             'total_days': total_days,
-            'bin': bin_labels[bin_idx],
             'transitions': transitions,
             'entity_type': entity_type,
             'app_type': app_type
@@ -274,7 +267,10 @@ print()
 all_applications = []
 
 for filename in sorted(files):
-    apps = analyze_file(filename)
+    if os.path.getsize(filename) > STREAMING_THRESHOLD_BYTES:
+        apps = stream_applications(filename)
+    else:
+        apps = analyze_file(filename)
     all_applications.extend(apps)
 
 print()
@@ -282,6 +278,7 @@ print(f"Total applications processed: {len(all_applications):,}")
 print()
 
 df_all = pd.DataFrame(all_applications)
+df_all['bin'] = cut(df_all['total_days'], WORKFLOW_BINS)
 
 entity_types = df_all['entity_type'].unique()
 app_types = df_all['app_type'].unique()
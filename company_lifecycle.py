@@ -0,0 +1,164 @@
+import os
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+from dataset_cache import spec_signature, cache_is_fresh, write_cache
+from company_registration_data import COMPANY_REGISTRATION_CSV, load_company_registration
+from deregistration_data import DEREGISTRATION_CSV, load_deregistration
+from discounted_deregistration_data import DISCOUNTED_PHASE_FILES, load_discounted_phase
+from discounted_phase_linkage import link_discounted_phases
+from share_process import SHARE_CSV, load_share_data
+from snapshots import get_as_of
+
+LIFECYCLE_CACHE = 'company_lifecycle.parquet'
+
+# One dataset contributing company events:
+#   csvs      -> exports it is read from (skipped when one is absent; the index
+#                is rebuilt when any of them changes)
+#   event     -> 'registration', 'amendment' or 'deregistration'
+#   filed     -> date the application was filed
+#   decided   -> date it took effect, used for completed records
+#   status    -> status column; records whose status is in completed took effect
+LifecycleSource = namedtuple('LifecycleSource', ['name', 'csvs', 'event', 'filed', 'decided', 'status',
+                                                 'completed'])
+
+LIFECYCLE_SOURCES = [
+    LifecycleSource('company_registration', [COMPANY_REGISTRATION_CSV], 'registration',
+                    'submission_date', 'registration_date', 'status', ['APPROVED']),
+    # Post-registration share changes
+    LifecycleSource('share', [SHARE_CSV], 'amendment',
+                    'submission_date', 'updated_date', 'post_event_process_status', ['VERIFIED']),
+    LifecycleSource('deregistration', [DEREGISTRATION_CSV], 'deregistration',
+                    'submitted_date', 'approved_date', 'application_status', ['APPROVED']),
+    # Phases linked per application: filed with phase 1, final at phase 3 approval
+    LifecycleSource('discounted_deregistration',
+                    [DISCOUNTED_PHASE_FILES[phase][0] for phase in sorted(DISCOUNTED_PHASE_FILES)],
+                    'deregistration', 'p1_submission_date', 'p3_approved_date', 'stall_stage', ['Completed']),
+]
+
+LIFECYCLE_EVENTS = ['registration', 'amendment', 'deregistration']
+
+# One row per event, sorted by company_id then date; date is when the event
+# took effect (filed_date while it is pending), filed_date when it was filed
+EVENT_COLUMNS = ['company_id', 'date', 'filed_date', 'event', 'source', 'completed', 'application_number']
+
+
+def load_source_frame(source):
+    """The columns of one source the index needs, through the dataset loaders' caches."""
+    columns = ['company_id', 'application_number', source.filed, source.decided, source.status]
+    if source.name == 'company_registration':
+        return load_company_registration(columns=columns)
+    if source.name == 'share':
+        return load_share_data(columns=columns)
+    if source.name == 'deregistration':
+        return load_deregistration(columns=columns)
+    if source.name == 'discounted_deregistration':
+        return link_discounted_phases(load_discounted_phase(1), load_discounted_phase(2),
+                                      load_discounted_phase(3), as_of=get_as_of('discounted_phase1'))
+    raise ValueError(f"Unknown lifecycle source '{source.name}'")
+
+
+def source_events(df, source):
+    """EVENT_COLUMNS rows of one source: effective date when completed, filing date otherwise.
+
+    Records without a company_id or any date (e.g. unfiled drafts) are left out.
+    """
+    completed = df[source.status].isin(source.completed).to_numpy(dtype=bool, na_value=False)
+    date = df[source.decided].where(completed & df[source.decided].notna(), df[source.filed])
+    events = pd.DataFrame({
+        'company_id': df['company_id'].astype('Int64'),
+        'date': date.astype('datetime64[ns]'),
+        'filed_date': df[source.filed].astype('datetime64[ns]'),
+        'event': source.event,
+        'source': source.name,
+        'completed': completed & df[source.decided].notna().to_numpy(),
+        'application_number': df['application_number'].astype('string'),
+    })
+    return events[events['company_id'].notna() & events['date'].notna()]
+
+
+def build_lifecycle_index(sources):
+    """Concatenate the sources' events, sorted by (company_id, date), with compact dtypes."""
+    events = pd.concat([source_events(load_source_frame(source), source) for source in sources],
+                       ignore_index=True)
+    events['company_id'] = events['company_id'].astype(np.int64)
+    events['event'] = pd.Categorical(events['event'], categories=LIFECYCLE_EVENTS)
+    events['source'] = pd.Categorical(events['source'], categories=[source.name for source in sources])
+    events = events.sort_values(['company_id', 'date'], kind='stable', ignore_index=True)
+    return events[EVENT_COLUMNS]
+
+
+def load_lifecycle_index(sources=LIFECYCLE_SOURCES, refresh=False):
+    """Company events across every available source, built once and cached as parquet.
+
+    Sources whose export is missing are left out; the index is rebuilt
+    when an export changes, appears or disappears.
+    """
+    available = [source for source in sources if all(os.path.exists(csv) for csv in source.csvs)]
+    signature = spec_signature('company_lifecycle', [tuple(source) for source in available],
+                               LIFECYCLE_EVENTS, EVENT_COLUMNS)
+    if not refresh and available and all(cache_is_fresh(csv, LIFECYCLE_CACHE, signature)
+                                         for source in available for csv in source.csvs):
+        return pd.read_parquet(LIFECYCLE_CACHE)
+
+    events = build_lifecycle_index(available)
+    write_cache(events, LIFECYCLE_CACHE, signature)
+    return events
+
+
+def company_events(events, company_id):
+    """All events of one company, found by binary search on the sorted company_id column."""
+    ids = events['company_id'].to_numpy()
+    left = np.searchsorted(ids, company_id, side='left')
+    right = np.searchsorted(ids, company_id, side='right')
+    return events.iloc[left:right]
+
+
+def company_range(events, low, high):
+    """Events of the companies with low <= company_id <= high (binary search, no scan)."""
+    ids = events['company_id'].to_numpy()
+    return events.iloc[np.searchsorted(ids, low, side='left'):np.searchsorted(ids, high, side='right')]
+
+
+def company_lifetimes(events):
+    """One row per company in events: first completed registration and deregistration,
+    amendments, lifetime and first deregistration filing.
+
+    Companies with only pending events are kept (with missing dates).
+    lifetime_days runs from registration to deregistration where both are known.
+    """
+    companies = pd.Index(events['company_id'].unique(), name='company_id')
+    done = events[events['completed']]
+    firsts = done.groupby(['company_id', 'event'], observed=False)['date'].min().unstack('event')
+    firsts = firsts.reindex(index=companies, columns=LIFECYCLE_EVENTS)
+    counts = done.groupby(['company_id', 'event'], observed=False).size().unstack('event')
+    counts = counts.reindex(index=companies, columns=LIFECYCLE_EVENTS)
+
+    lifetimes = pd.DataFrame({
+        'registered': firsts['registration'],
+        'deregistered': firsts['deregistration'],
+        'amendments': counts['amendment'].fillna(0).astype(np.int64),
+    })
+    lifetimes['lifetime_days'] = (lifetimes['deregistered'] - lifetimes['registered']).dt.total_seconds() / 86400
+    filed = events[events['event'] == 'deregistration'].groupby('company_id')['filed_date'].min()
+    lifetimes['deregistration_filed'] = filed.reindex(companies)
+    return lifetimes
+
+
+if __name__ == "__main__":
+    events = load_lifecycle_index(refresh=True)
+    print("="*80)
+    print("COMPANY LIFECYCLE INDEX")
+    print("="*80)
+    print(f"Events: {len(events):,} for {events['company_id'].nunique():,} companies")
+    print(f"Memory: {events.memory_usage(deep=True).sum() / 1024**2:.1f} MB")
+    print(events.groupby(['source', 'event', 'completed'], observed=True).size().to_string())
+
+    lifetimes = company_lifetimes(events)
+    print(f"\nCompanies: {len(lifetimes):,}")
+    print(f"Companies registered: {lifetimes['registered'].notna().sum():,}")
+    print(f"Companies deregistered: {lifetimes['deregistered'].notna().sum():,}")
+    print(f"Deregistration filed: {lifetimes['deregistration_filed'].notna().sum():,}")
+    print(f"With a known lifetime: {lifetimes['lifetime_days'].notna().sum():,}")
+    if lifetimes['lifetime_days'].notna().any():
+        print(f"Median lifetime: {lifetimes['lifetime_days'].median() / 365.25:.1f} years")
@@ -1,8 +1,9 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
+from company_registration_data import load_company_registration
+from time_bins import PERIOD_BINS, cut
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -11,17 +12,9 @@ sns.set_style("whitegrid")
 print("Creating clean company registration time period charts...")
 
 # Load data
-df = pd.read_csv('companyregistrationnewsystem.csv', low_memory=False)
-
-# Convert dates
-df['created_date'] = pd.to_datetime(df['created_date'], errors='coerce')
-df['approved_date'] = pd.to_datetime(df['approved_date'], errors='coerce')
-df['submission_date'] = pd.to_datetime(df['submission_date'], errors='coerce')
-
-# Calculate time periods
-df['created_to_submission_days'] = (df['submission_date'] - df['created_date']).dt.total_seconds() / 86400
-df['submission_to_approved_days'] = (df['approved_date'] - df['submission_date']).dt.total_seconds() / 86400
-df['created_to_approved_days'] = (df['approved_date'] - df['created_date']).dt.total_seconds() / 86400
+# Load data (dates and time periods precomputed)
+df = load_company_registration(columns=['created_to_submission_days', 'submission_to_approved_days',
+                                        'created_to_approved_days'])
 
 # Define time periods
 time_periods = {
@@ -30,10 +23,8 @@ time_periods = {
     'Created → Approved': 'created_to_approved_days'
 }
 
-# Define time bins
-bins = [-np.inf, 0, 1, 3, 7, 14, 30, 60, 90, 180, 365, np.inf]
-labels = ['Same day', '1 day', '2-3 days', '4-7 days', '1-2 weeks',
-          '2-4 weeks', '1-2 months', '2-3 months', '3-6 months', '6-12 months', '1+ year']
+# Time bins (shared period scheme)
+labels = PERIOD_BINS.labels
 
 # Create 3 separate figures, each with annotation "1 of 3", "2 of 3", "3 of 3"
 for idx, (period_name, col) in enumerate(time_periods.items()):
@@ -48,7 +39,7 @@ for idx, (period_name, col) in enumerate(time_periods.items()):
     valid_data = df[col].dropna()
     if len(valid_data) > 0:
         # Create bins
-        df[f'{col}_bin'] = pd.cut(df[col], bins=bins, labels=labels)
+        df[f'{col}_bin'] = cut(df[col], PERIOD_BINS)
         dist = df[f'{col}_bin'].value_counts().sort_index()
         total = len(valid_data)
 
@@ -107,7 +98,7 @@ color_map = {
 for period_name, col in time_periods.items():
     valid_data = df[col].dropna()
     if len(valid_data) > 0:
-        df[f'{col}_bin'] = pd.cut(df[col], bins=bins, labels=labels)
+        df[f'{col}_bin'] = cut(df[col], PERIOD_BINS)
         dist = df[f'{col}_bin'].value_counts().sort_index()
         total = len(valid_data)
 
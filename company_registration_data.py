@@ -0,0 +1,42 @@
+from dataset_cache import load_cached_csv
+from feature_store import DURATION_FEATURES, add_durations
+
+COMPANY_REGISTRATION_CSV = 'companyregistrationnewsystem.csv'
+COMPANY_REGISTRATION_CACHE = 'companyregistrationnewsystem.parquet'
+
+# Date columns parsed once at load time
+COMPANY_DATE_COLUMNS = ['created_date', 'updated_date', 'approved_date', 'registration_date', 'submission_date']
+
+# Every other column the company-registration scripts use, with a fixed dtype
+COMPANY_DTYPES = {
+    'application_number': 'str',
+    'company_id': 'Int64',
+    'company_name_english': 'str',
+    'status': 'category',
+    'company_type_id': 'Int16',
+}
+
+
+def add_company_durations(df):
+    """Add the company_registration duration features (float32 days)."""
+    return add_durations(df, 'company_registration')
+
+
+def load_company_registration(columns=None, refresh=False):
+    """Company registration records with parsed dates and duration features.
+
+    The CSV is parsed once and cached as parquet next to it; later calls
+    read the cache until the CSV changes. Pass refresh=True to force a reload.
+    """
+    return load_cached_csv(COMPANY_REGISTRATION_CSV, COMPANY_REGISTRATION_CACHE,
+                           COMPANY_DTYPES, COMPANY_DATE_COLUMNS, columns=columns, refresh=refresh,
+                           prepare=add_company_durations,
+                           prepare_spec=DURATION_FEATURES['company_registration'])
+
+
+if __name__ == "__main__":
+    print("Building company registration cache...")
+    df = load_company_registration(refresh=True)
+    print(f"  Records: {len(df):,}")
+    print(df.dtypes)
+    print(f"  Memory: {df.memory_usage(deep=True).sum() / 1024**2:.1f} MB")
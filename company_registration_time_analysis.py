@@ -4,6 +4,10 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import timedelta
 import warnings
+from company_registration_data import load_company_registration
+from time_bins import PERIOD_BINS, cut
+from histograms import series_histograms, draw_histogram
+from monthly_rollups import update_rollup, monthly_counts, monthly_mean, monthly_bin_counts, recent_vs_overall
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -15,28 +19,22 @@ print("LOADING COMPANY REGISTRATION DATA")
 print("="*80)
 
 # Load data
-df = pd.read_csv('companyregistrationnewsystem.csv', low_memory=False)
+df = load_company_registration()
 
 print(f"\nDataset shape: {df.shape}")
 print(f"Columns: {df.columns.tolist()}\n")
 
-# Convert date columns to datetime
+# Date columns are parsed by the loader
 date_columns = ['created_date', 'updated_date', 'approved_date', 'registration_date', 'submission_date']
 for col in date_columns:
     if col in df.columns:
-        df[col] = pd.to_datetime(df[col], errors='coerce')
         print(f"{col} - Non-null values: {df[col].notna().sum():,}")
 
 print("\n" + "="*80)
 print("CALCULATING TIME PERIODS")
 print("="*80)
 
-# Calculate time differences (in days)
-df['created_to_submission_days'] = (df['submission_date'] - df['created_date']).dt.total_seconds() / 86400
-df['created_to_approved_days'] = (df['approved_date'] - df['created_date']).dt.total_seconds() / 86400
-df['submission_to_approved_days'] = (df['approved_date'] - df['submission_date']).dt.total_seconds() / 86400
-df['approved_to_registration_days'] = (df['registration_date'] - df['approved_date']).dt.total_seconds() / 86400
-df['created_to_registration_days'] = (df['registration_date'] - df['created_date']).dt.total_seconds() / 86400
+# Time differences (in days) come precomputed from the loader
 
 # Define time periods to analyze
 time_periods = {
@@ -60,10 +58,8 @@ for period_name, col in time_periods.items():
               f"{valid_data.median():>10.1f} {valid_data.std():>10.1f} "
               f"{valid_data.min():>10.1f} {valid_data.max():>10.1f}")
 
-# Define bins for distribution analysis
-bins = [-np.inf, 0, 1, 3, 7, 14, 30, 60, 90, 180, 365, np.inf]
-labels = ['Same day', '1 day', '2-3 days', '4-7 days', '1-2 weeks',
-          '2-4 weeks', '1-2 months', '2-3 months', '3-6 months', '6-12 months', '1+ year']
+# Time bins (shared period scheme)
+labels = PERIOD_BINS.labels
 
 print("\n" + "="*80)
 print("TIME PERIOD DISTRIBUTION ANALYSIS")
@@ -74,7 +70,7 @@ distribution_data = {}
 for period_name, col in time_periods.items():
     valid_data = df[col].dropna()
     if len(valid_data) > 0:
-        df[f'{col}_bin'] = pd.cut(df[col], bins=bins, labels=labels)
+        df[f'{col}_bin'] = cut(df[col], PERIOD_BINS)
         dist = df[f'{col}_bin'].value_counts().sort_index()
         distribution_data[period_name] = dist
 
@@ -109,18 +105,20 @@ plot_configs = [
     ('Created → Registration (Total)', 'created_to_registration_days', 2, 0, 'red')
 ]
 
+# Bin counts and statistics per period, computed once for all subplots
+hists = series_histograms(df, [col for _, col, _, _, _ in plot_configs], bins=50)
+
 for title, col, row, col_idx, color in plot_configs:
     ax = fig.add_subplot(gs[row, col_idx])
 
-    valid_data = df[col].dropna()
-    if len(valid_data) > 0:
-        # Create histogram
-        counts, bin_edges, patches = ax.hist(valid_data, bins=50, edgecolor='black',
-                                             alpha=0.7, color=color)
+    if col in hists:
+        hist = hists[col]
+        # Draw the precomputed histogram
+        draw_histogram(ax, hist, edgecolor='black', alpha=0.7, color=color)
 
         # Add statistics lines
-        mean_val = valid_data.mean()
-        median_val = valid_data.median()
+        mean_val = hist.mean
+        median_val = hist.median
         ax.axvline(mean_val, color='red', linestyle='--', linewidth=2.5,
                   label=f'Mean: {mean_val:.1f} days', zorder=5)
         ax.axvline(median_val, color='darkblue', linestyle='--', linewidth=2.5,
@@ -128,15 +126,15 @@ for title, col, row, col_idx, color in plot_configs:
 
         # Add percentile annotations
         percentiles = [50, 75, 90, 95]
-        y_max = counts.max()
+        y_max = hist.counts.max()
         for i, pct in enumerate(percentiles):
-            val = np.percentile(valid_data, pct)
+            val = hist.percentiles[pct]
             ax.axvline(val, color='gray', linestyle=':', linewidth=1.5, alpha=0.5)
             ax.text(val, y_max * (0.95 - i*0.08), f'{pct}th: {val:.1f}d',
                    rotation=0, fontsize=8,
                    bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.7))
 
-        ax.set_title(f'{title}\n(n={len(valid_data):,})', fontweight='bold', fontsize=13)
+        ax.set_title(f'{title}\n(n={hist.n:,})', fontweight='bold', fontsize=13)
         ax.set_xlabel('Days', fontsize=10, fontweight='bold')
         ax.set_ylabel('Number of Applications', fontsize=10, fontweight='bold')
         ax.legend(loc='upper right', fontsize=9)
@@ -146,9 +144,9 @@ for title, col, row, col_idx, color in plot_configs:
         stats_text = f'Statistics:\n' \
                     f'Mean: {mean_val:.1f} days\n' \
                     f'Median: {median_val:.1f} days\n' \
-                    f'Std Dev: {valid_data.std():.1f} days\n' \
-                    f'Min: {valid_data.min():.1f} days\n' \
-                    f'Max: {valid_data.max():.1f} days'
+                    f'Std Dev: {hist.std:.1f} days\n' \
+                    f'Min: {hist.min:.1f} days\n' \
+                    f'Max: {hist.max:.1f} days'
         ax.text(0.97, 0.60, stats_text, transform=ax.transAxes, fontsize=8,
                verticalalignment='top', horizontalalignment='right',
                bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
@@ -160,16 +158,16 @@ ax.axis('off')
 # Create summary table
 summary_data = []
 for period_name, col in time_periods.items():
-    valid_data = df[col].dropna()
-    if len(valid_data) > 0:
+    if col in hists:
+        hist = hists[col]
         summary_data.append([
             period_name,
-            f"{len(valid_data):,}",
-            f"{valid_data.mean():.1f}",
-            f"{valid_data.median():.1f}",
-            f"{valid_data.std():.1f}",
-            f"{valid_data.min():.1f}",
-            f"{valid_data.max():.1f}"
+            f"{hist.n:,}",
+            f"{hist.mean:.1f}",
+            f"{hist.median:.1f}",
+            f"{hist.std:.1f}",
+            f"{hist.min:.1f}",
+            f"{hist.max:.1f}"
         ])
 
 table = ax.table(cellText=summary_data,
@@ -383,16 +381,16 @@ if 'company_type_id' in df.columns:
 print("\nAnalyzing monthly trends...")
 
 if df['created_date'].notna().sum() > 0:
-    df['created_year_month'] = df['created_date'].dt.to_period('M')
-    df['approved_year_month'] = df['approved_date'].dt.to_period('M')
+    # Monthly aggregates are materialized once and only new months are added
+    rollup = update_rollup(df, 'company_registration')
 
     fig, axes = plt.subplots(2, 2, figsize=(24, 14))
     fig.suptitle('Company Registration - Monthly Trends', fontsize=18, fontweight='bold', y=0.995)
 
     # 1. Number of registrations per month
     ax1 = axes[0, 0]
-    monthly_counts = df.groupby('created_year_month').size()
-    monthly_counts_recent = monthly_counts.tail(24)  # Last 24 months
+    monthly_volume = monthly_counts(rollup)
+    monthly_counts_recent = monthly_volume.tail(24)  # Last 24 months
 
     if len(monthly_counts_recent) > 0:
         monthly_counts_recent.index = monthly_counts_recent.index.to_timestamp()
@@ -415,7 +413,7 @@ if df['created_date'].notna().sum() > 0:
 
     # 2. Average processing time per month
     ax2 = axes[0, 1]
-    monthly_processing = df.groupby('created_year_month')['created_to_approved_days'].mean()
+    monthly_processing = monthly_mean(rollup, 'created_to_approved_days')
     monthly_processing_recent = monthly_processing.tail(24)
 
     if len(monthly_processing_recent) > 0:
@@ -430,25 +428,23 @@ if df['created_date'].notna().sum() > 0:
 
     # 3. Approval time distribution over time (heatmap style)
     ax3 = axes[1, 0]
-    df_recent = df[df['created_year_month'].notna()].copy()
-    df_recent = df_recent[df_recent['created_year_month'] >= df_recent['created_year_month'].max() - 23]
-
-    if len(df_recent) > 0:
-        pivot_data = df_recent.groupby(['created_year_month', 'created_to_approved_days_bin']).size().unstack(fill_value=0)
-        if not pivot_data.empty:
-            pivot_pct = pivot_data.div(pivot_data.sum(axis=1), axis=0) * 100
-
-            # Only show recent months
-            pivot_pct = pivot_pct.tail(12)
-            pivot_pct.index = pivot_pct.index.astype(str)
-
-            sns.heatmap(pivot_pct.T, annot=True, fmt='.0f', cmap='YlOrRd',
-                       cbar_kws={'label': 'Percentage'}, ax=ax3)
-            ax3.set_title('Time Period Distribution by Month (Last 12 Months)',
-                         fontweight='bold', fontsize=13)
-            ax3.set_xlabel('Month', fontsize=10, fontweight='bold')
-            ax3.set_ylabel('Time Period', fontsize=10, fontweight='bold')
-            ax3.tick_params(axis='x', rotation=45)
+    pivot_data = monthly_bin_counts(rollup, 'created_to_approved_days')
+    pivot_data = pivot_data[pivot_data.sum(axis=1) > 0]
+
+    if not pivot_data.empty:
+        pivot_pct = pivot_data.div(pivot_data.sum(axis=1), axis=0) * 100
+
+        # Only show recent months
+        pivot_pct = pivot_pct.tail(12)
+        pivot_pct.index = pivot_pct.index.astype(str)
+
+        sns.heatmap(pivot_pct.T, annot=True, fmt='.0f', cmap='YlOrRd',
+                   cbar_kws={'label': 'Percentage'}, ax=ax3)
+        ax3.set_title('Time Period Distribution by Month (Last 12 Months)',
+                     fontweight='bold', fontsize=13)
+        ax3.set_xlabel('Month', fontsize=10, fontweight='bold')
+        ax3.set_ylabel('Time Period', fontsize=10, fontweight='bold')
+        ax3.tick_params(axis='x', rotation=45)
 
     # 4. Summary statistics table
     ax4 = axes[1, 1]
@@ -457,8 +453,7 @@ if df['created_date'].notna().sum() > 0:
     # Calculate monthly statistics for recent period
     recent_stats = []
     for period_name, col in list(time_periods.items())[:3]:  # Top 3 periods
-        recent_avg = df[col].tail(1000).mean()  # Last 1000 records
-        overall_avg = df[col].mean()
+        recent_avg, overall_avg = recent_vs_overall(rollup, col, months=3)
         recent_stats.append([
             period_name,
             f"{overall_avg:.1f}",
@@ -467,7 +462,7 @@ if df['created_date'].notna().sum() > 0:
         ])
 
     table = ax4.table(cellText=recent_stats,
-                     colLabels=['Period', 'Overall Avg', 'Recent Avg\n(Last 1000)', 'Change'],
+                     colLabels=['Period', 'Overall Avg', 'Recent Avg\n(Last 3 Months)', 'Change'],
                      cellLoc='center',
                      loc='center',
                      bbox=[0, 0.2, 1, 0.6])
@@ -1,9 +1,11 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import timedelta
 import warnings
+from company_registration_data import load_company_registration
+from time_bins import PERIOD_BINS, cut
+from histograms import series_histograms, draw_histogram
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -15,28 +17,22 @@ print("LOADING COMPANY REGISTRATION DATA")
 print("="*80)
 
 # Load data
-df = pd.read_csv('companyregistrationnewsystem.csv', low_memory=False)
+df = load_company_registration()
 
 print(f"\nDataset shape: {df.shape}")
 print(f"Columns: {df.columns.tolist()}\n")
 
-# Convert date columns to datetime
+# Date columns are parsed by the loader
 date_columns = ['created_date', 'updated_date', 'approved_date', 'registration_date', 'submission_date']
 for col in date_columns:
     if col in df.columns:
-        df[col] = pd.to_datetime(df[col], errors='coerce')
         print(f"{col} - Non-null values: {df[col].notna().sum():,}")
 
 print("\n" + "="*80)
 print("CALCULATING TIME PERIODS")
 print("="*80)
 
-# Calculate time differences (in days)
-df['created_to_submission_days'] = (df['submission_date'] - df['created_date']).dt.total_seconds() / 86400
-df['created_to_approved_days'] = (df['approved_date'] - df['created_date']).dt.total_seconds() / 86400
-df['submission_to_approved_days'] = (df['approved_date'] - df['submission_date']).dt.total_seconds() / 86400
-df['approved_to_registration_days'] = (df['registration_date'] - df['approved_date']).dt.total_seconds() / 86400
-df['created_to_registration_days'] = (df['registration_date'] - df['created_date']).dt.total_seconds() / 86400
+# Time differences (in days) come precomputed from the loader
 
 # Define time periods to analyze
 time_periods = {
@@ -60,10 +56,8 @@ for period_name, col in time_periods.items():
               f"{valid_data.median():>10.1f} {valid_data.std():>10.1f} "
               f"{valid_data.min():>10.1f} {valid_data.max():>10.1f}")
 
-# Define bins for distribution analysis
-bins = [-np.inf, 0, 1, 3, 7, 14, 30, 60, 90, 180, 365, np.inf]
-labels = ['Same day', '1 day', '2-3 days', '4-7 days', '1-2 weeks',
-          '2-4 weeks', '1-2 months', '2-3 months', '3-6 months', '6-12 months', '1+ year']
+# Time bins (shared period scheme)
+labels = PERIOD_BINS.labels
 
 print("\n" + "="*80)
 print("TIME PERIOD DISTRIBUTION ANALYSIS")
@@ -74,7 +68,7 @@ distribution_data = {}
 for period_name, col in time_periods.items():
     valid_data = df[col].dropna()
     if len(valid_data) > 0:
-        df[f'{col}_bin'] = pd.cut(df[col], bins=bins, labels=labels)
+        df[f'{col}_bin'] = cut(df[col], PERIOD_BINS)
         dist = df[f'{col}_bin'].value_counts().sort_index()
         distribution_data[period_name] = dist
 
@@ -105,6 +99,50 @@ plot_configs = [
     ('Created → Registration (Total)', 'created_to_registration_days', 'red')
 ]
 
+# Bin counts and statistics per period, computed once and shared by all three figures
+hists = series_histograms(df, [col for _, col, _ in plot_configs], bins=50)
+
+
+def plot_period_histogram(ax, title, hist, color):
+    """Draw one period's precomputed histogram with its statistics annotations."""
+    draw_histogram(ax, hist, edgecolor='black', alpha=0.7, color=color)
+
+    # Add statistics lines
+    mean_val = hist.mean
+    median_val = hist.median
+    ax.axvline(mean_val, color='red', linestyle='--', linewidth=2.5,
+              label=f'Mean: {mean_val:.1f} days', zorder=5)
+    ax.axvline(median_val, color='darkblue', linestyle='--', linewidth=2.5,
+              label=f'Median: {median_val:.1f} days', zorder=5)
+
+    # Add percentile annotations
+    percentiles = [50, 75, 90, 95]
+    y_max = hist.counts.max()
+    for i, pct in enumerate(percentiles):
+        val = hist.percentiles[pct]
+        ax.axvline(val, color='gray', linestyle=':', linewidth=1.5, alpha=0.5)
+        ax.text(val, y_max * (0.95 - i*0.08), f'{pct}th: {val:.1f}d',
+               rotation=0, fontsize=8,
+               bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.7))
+
+    ax.set_title(f'{title}\n(n={hist.n:,})', fontweight='bold', fontsize=13)
+    ax.set_xlabel('Days', fontsize=10, fontweight='bold')
+    ax.set_ylabel('Number of Applications', fontsize=10, fontweight='bold')
+    ax.legend(loc='upper right', fontsize=9)
+    ax.grid(True, alpha=0.3)
+
+    # Add statistics box
+    stats_text = f'Statistics:\n' \
+                f'Mean: {mean_val:.1f} days\n' \
+                f'Median: {median_val:.1f} days\n' \
+                f'Std Dev: {hist.std:.1f} days\n' \
+                f'Min: {hist.min:.1f} days\n' \
+                f'Max: {hist.max:.1f} days'
+    ax.text(0.97, 0.60, stats_text, transform=ax.transAxes, fontsize=8,
+           verticalalignment='top', horizontalalignment='right',
+           bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
+
+
 # Figure 1 of 3: First two plots
 fig, axes = plt.subplots(1, 2, figsize=(20, 8))
 fig.suptitle('Company Registration - Time Period Distribution Analysis (1 of 3)',
@@ -112,48 +150,8 @@ fig.suptitle('Company Registration - Time Period Distribution Analysis (1 of 3)'
 
 for idx in range(2):
     title, col, color = plot_configs[idx]
-    ax = axes[idx]
-    
-    valid_data = df[col].dropna()
-    if len(valid_data) > 0:
-        # Create histogram
-        counts, bin_edges, patches = ax.hist(valid_data, bins=50, edgecolor='black',
-                                             alpha=0.7, color=color)
-
-        # Add statistics lines
-        mean_val = valid_data.mean()
-        median_val = valid_data.median()
-        ax.axvline(mean_val, color='red', linestyle='--', linewidth=2.5,
-                  label=f'Mean: {mean_val:.1f} days', zorder=5)
-        ax.axvline(median_val, color='darkblue', linestyle='--', linewidth=2.5,
-                  label=f'Median: {median_val:.1f} days', zorder=5)
-
-        # Add percentile annotations
-        percentiles = [50, 75, 90, 95]
-        y_max = counts.max()
-        for i, pct in enumerate(percentiles):
-            val = np.percentile(valid_data, pct)
-            ax.axvline(val, color='gray', linestyle=':', linewidth=1.5, alpha=0.5)
-            ax.text(val, y_max * (0.95 - i*0.08), f'{pct}th: {val:.1f}d',
-                   rotation=0, fontsize=8,
-                   bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.7))
-
-        ax.set_title(f'{title}\n(n={len(valid_data):,})', fontweight='bold', fontsize=13)
-        ax.set_xlabel('Days', fontsize=10, fontweight='bold')
-        ax.set_ylabel('Number of Applications', fontsize=10, fontweight='bold')
-        ax.legend(loc='upper right', fontsize=9)
-        ax.grid(True, alpha=0.3)
-
-        # Add statistics box
-        stats_text = f'Statistics:\n' \
-                    f'Mean: {mean_val:.1f} days\n' \
-                    f'Median: {median_val:.1f} days\n' \
-                    f'Std Dev: {valid_data.std():.1f} days\n' \
-                    f'Min: {valid_data.min():.1f} days\n' \
-                    f'Max: {valid_data.max():.1f} days'
-        ax.text(0.97, 0.60, stats_text, transform=ax.transAxes, fontsize=8,
-               verticalalignment='top', horizontalalignment='right',
-               bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
+    if col in hists:
+        plot_period_histogram(axes[idx], title, hists[col], color)
 
 plt.tight_layout()
 plt.savefig('company_registration_time_distribution_1of3.png', dpi=300, bbox_inches='tight')
@@ -170,48 +168,8 @@ fig.suptitle('Company Registration - Time Period Distribution Analysis (2 of 3)'
 
 for idx in range(2, 4):
     title, col, color = plot_configs[idx]
-    ax = axes[idx-2]
-    
-    valid_data = df[col].dropna()
-    if len(valid_data) > 0:
-        # Create histogram
-        counts, bin_edges, patches = ax.hist(valid_data, bins=50, edgecolor='black',
-                                             alpha=0.7, color=color)
-
-        # Add statistics lines
-        mean_val = valid_data.mean()
-        median_val = valid_data.median()
-        ax.axvline(mean_val, color='red', linestyle='--', linewidth=2.5,
-                  label=f'Mean: {mean_val:.1f} days', zorder=5)
-        ax.axvline(median_val, color='darkblue', linestyle='--', linewidth=2.5,
-                  label=f'Median: {median_val:.1f} days', zorder=5)
-
-        # Add percentile annotations
-        percentiles = [50, 75, 90, 95]
-        y_max = counts.max()
-        for i, pct in enumerate(percentiles):
-            val = np.percentile(valid_data, pct)
-            ax.axvline(val, color='gray', linestyle=':', linewidth=1.5, alpha=0.5)
-            ax.text(val, y_max * (0.95 - i*0.08), f'{pct}th: {val:.1f}d',
-                   rotation=0, fontsize=8,
-                   bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.7))
-
-        ax.set_title(f'{title}\n(n={len(valid_data):,})', fontweight='bold', fontsize=13)
-        ax.set_xlabel('Days', fontsize=10, fontweight='bold')
-        ax.set_ylabel('Number of Applications', fontsize=10, fontweight='bold')
-        ax.legend(loc='upper right', fontsize=9)
-        ax.grid(True, alpha=0.3)
-
-        # Add statistics box
-        stats_text = f'Statistics:\n' \
-                    f'Mean: {mean_val:.1f} days\n' \
-                    f'Median: {median_val:.1f} days\n' \
-                    f'Std Dev: {valid_data.std():.1f} days\n' \
-                    f'Min: {valid_data.min():.1f} days\n' \
-                    f'Max: {valid_data.max():.1f} days'
-        ax.text(0.97, 0.60, stats_text, transform=ax.transAxes, fontsize=8,
-               verticalalignment='top', horizontalalignment='right',
-               bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
+    if col in hists:
+        plot_period_histogram(axes[idx-2], title, hists[col], color)
 
 plt.tight_layout()
 plt.savefig('company_registration_time_distribution_2of3.png', dpi=300, bbox_inches='tight')
@@ -230,47 +188,8 @@ fig.suptitle('Company Registration - Time Period Distribution Analysis (3 of 3)'
 # Plot last histogram
 ax = fig.add_subplot(gs[0, 0])
 title, col, color = plot_configs[4]
-
-valid_data = df[col].dropna()
-if len(valid_data) > 0:
-    # Create histogram
-    counts, bin_edges, patches = ax.hist(valid_data, bins=50, edgecolor='black',
-                                         alpha=0.7, color=color)
-
-    # Add statistics lines
-    mean_val = valid_data.mean()
-    median_val = valid_data.median()
-    ax.axvline(mean_val, color='red', linestyle='--', linewidth=2.5,
-              label=f'Mean: {mean_val:.1f} days', zorder=5)
-    ax.axvline(median_val, color='darkblue', linestyle='--', linewidth=2.5,
-              label=f'Median: {median_val:.1f} days', zorder=5)
-
-    # Add percentile annotations
-    percentiles = [50, 75, 90, 95]
-    y_max = counts.max()
-    for i, pct in enumerate(percentiles):
-        val = np.percentile(valid_data, pct)
-        ax.axvline(val, color='gray', linestyle=':', linewidth=1.5, alpha=0.5)
-        ax.text(val, y_max * (0.95 - i*0.08), f'{pct}th: {val:.1f}d',
-               rotation=0, fontsize=8,
-               bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.7))
-
-    ax.set_title(f'{title}\n(n={len(valid_data):,})', fontweight='bold', fontsize=13)
-    ax.set_xlabel('Days', fontsize=10, fontweight='bold')
-    ax.set_ylabel('Number of Applications', fontsize=10, fontweight='bold')
-    ax.legend(loc='upper right', fontsize=9)
-    ax.grid(True, alpha=0.3)
-
-    # Add statistics box
-    stats_text = f'Statistics:\n' \
-                f'Mean: {mean_val:.1f} days\n' \
-                f'Median: {median_val:.1f} days\n' \
-                f'Std Dev: {valid_data.std():.1f} days\n' \
-                f'Min: {valid_data.min():.1f} days\n' \
-                f'Max: {valid_data.max():.1f} days'
-    ax.text(0.97, 0.60, stats_text, transform=ax.transAxes, fontsize=8,
-           verticalalignment='top', horizontalalignment='right',
-           bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
+if col in hists:
+    plot_period_histogram(ax, title, hists[col], color)
 
 # Summary table
 ax = fig.add_subplot(gs[0, 1])
@@ -279,16 +198,16 @@ ax.axis('off')
 # Create summary table
 summary_data = []
 for period_name, col in time_periods.items():
-    valid_data = df[col].dropna()
-    if len(valid_data) > 0:
+    if col in hists:
+        hist = hists[col]
         summary_data.append([
             period_name,
-            f"{len(valid_data):,}",
-            f"{valid_data.mean():.1f}",
-            f"{valid_data.median():.1f}",
-            f"{valid_data.std():.1f}",
-            f"{valid_data.min():.1f}",
-            f"{valid_data.max():.1f}"
+            f"{hist.n:,}",
+            f"{hist.mean:.1f}",
+            f"{hist.median:.1f}",
+            f"{hist.std:.1f}",
+            f"{hist.min:.1f}",
+            f"{hist.max:.1f}"
         ])
 
 table = ax.table(cellText=summary_data,
@@ -0,0 +1,93 @@
+import os
+import hashlib
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Parquet metadata key recording how a cache file was built
+SIGNATURE_KEY = b'cache_signature'
+
+
+def spec_signature(*parts):
+    """Short hash of a dataset spec; a cache built from another spec is rebuilt."""
+    return hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+
+
+def stored_metadata(cache_path, key):
+    """A metadata value a parquet cache was written with (None if it has none)."""
+    metadata = pq.read_schema(cache_path).metadata or {}
+    value = metadata.get(key.encode('utf-8') if isinstance(key, str) else key)
+    return value.decode('utf-8') if value is not None else None
+
+
+def stored_signature(cache_path):
+    """Spec signature a parquet cache was written with (None if it has none)."""
+    return stored_metadata(cache_path, SIGNATURE_KEY)
+
+
+def cache_is_fresh(csv_path, cache_path, signature):
+    """True if the cache exists, is newer than the CSV and was built from the same spec."""
+    if not os.path.exists(cache_path):
+        return False
+    if os.path.exists(csv_path) and os.path.getmtime(cache_path) < os.path.getmtime(csv_path):
+        return False
+    return stored_signature(cache_path) == signature
+
+
+def write_cache(df, cache_path, signature, extra=None):
+    """Write a prepared frame to parquet, tagged with its spec signature.
+
+    extra is a dict of further str metadata to store (see stored_metadata).
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SIGNATURE_KEY] = signature.encode('utf-8')
+    for key, value in (extra or {}).items():
+        metadata[key.encode('utf-8')] = str(value).encode('utf-8')
+    pq.write_table(table.replace_schema_metadata(metadata), cache_path)
+
+
+def read_csv_export(csv_path, dtypes, date_columns):
+    """Read the dtypes/date_columns columns of a CSV export, skipping any it lacks.
+
+    Dates are parsed once with errors='coerce'.
+    """
+    wanted = set(dtypes) | set(date_columns)
+    df = pd.read_csv(csv_path, usecols=lambda col: col in wanted, low_memory=False,
+                     dtype={col: dtype for col, dtype in dtypes.items()})
+
+    for col in date_columns:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    return df
+
+
+def load_cached_csv(csv_path, cache_path, dtypes, date_columns, columns=None, refresh=False,
+                    prepare=None, prepare_spec=None):
+    """Load a CSV export once with fixed dtypes and serve it from a parquet cache.
+
+    Only the columns named in dtypes/date_columns are read from the CSV
+    (see read_csv_export). prepare(df) may add derived columns before caching;
+    prepare_spec describes what it derives so the cache is rebuilt when that
+    changes. Pass columns to read just part of the cached frame.
+    """
+    prepare_name = getattr(prepare, '__qualname__', None)
+    signature = spec_signature(sorted((k, str(v)) for k, v in dtypes.items()),
+                               list(date_columns), prepare_name, prepare_spec)
+
+    if not refresh and cache_is_fresh(csv_path, cache_path, signature):
+        if columns is not None:
+            available = pq.read_schema(cache_path).names
+            columns = [col for col in columns if col in available]
+        return pd.read_parquet(cache_path, columns=columns)
+
+    df = read_csv_export(csv_path, dtypes, date_columns)
+
+    if prepare is not None:
+        df = prepare(df)
+
+    write_cache(df, cache_path, signature)
+
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    return df
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+
+# One date-consistency rule. A record is flagged when:
+#   kind='before'  -> left and right are both present and left < right
+#   kind='same'    -> left and right are both present and left == right
+#   kind='missing' -> left is missing (right is unused)
+# statuses restricts the rule to records whose status is in the list.
+DateRule = namedtuple('DateRule', ['name', 'kind', 'left', 'right', 'statuses', 'description'])
+
+DATE_RULES = {
+    'name_registration': [
+        DateRule('created_missing', 'missing', 'created_date', None, None,
+                 'No created_date'),
+        DateRule('approved_missing', 'missing', 'approved_date', None, ['APPROVED', 'REJECTED'],
+                 'Approved/rejected without approved_date'),
+        DateRule('approved_before_created', 'before', 'approved_date', 'created_date', None,
+                 'Approved before created'),
+        DateRule('updated_before_created', 'before', 'updated_date', 'created_date', None,
+                 'Updated before created'),
+        DateRule('submission_before_created', 'before', 'submission_date', 'created_date', None,
+                 'Submitted before created'),
+        DateRule('expire_before_created', 'before', 'expire_date', 'created_date', None,
+                 'Expires before created'),
+        DateRule('approved_before_updated', 'before', 'approved_date', 'updated_date', None,
+                 'Updated after approval'),
+        DateRule('updated_before_approved', 'before', 'updated_date', 'approved_date', None,
+                 'Last update before approval'),
+        DateRule('approved_same_as_updated', 'same', 'approved_date', 'updated_date', None,
+                 'Approved at the last update'),
+        DateRule('created_same_as_updated', 'same', 'created_date', 'updated_date', None,
+                 'Never updated after creation'),
+    ],
+    'company_registration': [
+        DateRule('created_missing', 'missing', 'created_date', None, None,
+                 'No created_date'),
+        DateRule('approved_missing', 'missing', 'approved_date', None, ['APPROVED'],
+                 'Approved without approved_date'),
+        DateRule('submission_before_created', 'before', 'submission_date', 'created_date', None,
+                 'Submitted before created'),
+        DateRule('approved_before_created', 'before', 'approved_date', 'created_date', None,
+                 'Approved before created'),
+        DateRule('approved_before_submission', 'before', 'approved_date', 'submission_date', None,
+                 'Approved before submitted'),
+        DateRule('registration_before_created', 'before', 'registration_date', 'created_date', None,
+                 'Registration date before created (historical)'),
+        DateRule('registration_before_approved', 'before', 'registration_date', 'approved_date', None,
+                 'Registration date before approval'),
+    ],
+}
+
+# Sentinel of a missing date in the int64 nanosecond view
+NAT_NS = np.iinfo(np.int64).min
+
+
+def _date_ns(df, col, cache):
+    """int64 nanosecond view of a date column (NaT -> NAT_NS), converted once per pass."""
+    if col not in cache:
+        if col in df.columns:
+            cache[col] = df[col].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        else:
+            cache[col] = np.full(len(df), NAT_NS, dtype=np.int64)
+    return cache[col]
+
+
+def evaluate_rules(df, rules):
+    """Evaluate every rule in one pass; returns a uint32 bitmask per record (bit i = rules[i])."""
+    if len(rules) > 32:
+        raise ValueError(f"At most 32 rules fit in the bitmask, got {len(rules)}")
+
+    cache = {}
+    mask = np.zeros(len(df), dtype=np.uint32)
+    for bit, rule in enumerate(rules):
+        left = _date_ns(df, rule.left, cache)
+        if rule.kind == 'missing':
+            flagged = left == NAT_NS
+        else:
+            right = _date_ns(df, rule.right, cache)
+            present = (left != NAT_NS) & (right != NAT_NS)
+            if rule.kind == 'before':
+                flagged = present & (left < right)
+            elif rule.kind == 'same':
+                flagged = present & (left == right)
+            else:
+                raise ValueError(f"Unknown rule kind '{rule.kind}' in rule '{rule.name}'")
+        if rule.statuses is not None:
+            flagged &= df['status'].isin(rule.statuses).to_numpy(dtype=bool, na_value=False)
+        mask |= flagged.astype(np.uint32) << np.uint32(bit)
+    return mask
+
+
+def date_rule_mask(df, dataset):
+    """Bitmask of a registration dataset against its DATE_RULES."""
+    return evaluate_rules(df, DATE_RULES[dataset])
+
+
+def rule_flags(mask, rules, name):
+    """Boolean array: records flagged by the named rule."""
+    bit = [rule.name for rule in rules].index(name)
+    return ((mask >> np.uint32(bit)) & np.uint32(1)) == 1
+
+
+def rule_summary(mask, rules, base=None):
+    """Flag count and percentage per rule, optionally within a boolean subset of records."""
+    if base is not None:
+        mask = mask[np.asarray(base, dtype=bool)]
+    total = len(mask)
+    bits = (mask[:, None] >> np.arange(len(rules), dtype=np.uint32)) & np.uint32(1)
+    counts = bits.sum(axis=0) if total > 0 else np.zeros(len(rules), dtype=np.int64)
+    return pd.DataFrame({
+        'rule': [rule.name for rule in rules],
+        'description': [rule.description for rule in rules],
+        'records': counts.astype(np.int64),
+        'percentage': counts / total * 100 if total > 0 else np.zeros(len(rules)),
+    })
+
+
+if __name__ == "__main__":
+    from name_registration_data import load_name_registration
+    from company_registration_data import load_company_registration
+
+    for dataset, loader in [('name_registration', load_name_registration),
+                            ('company_registration', load_company_registration)]:
+        df = loader()
+        mask = date_rule_mask(df, dataset)
+        print("="*80)
+        print(f"DATE RULES: {dataset} ({len(df):,} records, {(mask != 0).sum():,} flagged)")
+        print("="*80)
+        print(rule_summary(mask, DATE_RULES[dataset]).to_string(index=False, float_format='%.1f'))
+        print()
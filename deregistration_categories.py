@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+from feature_store import NS_PER_DAY
+from snapshots import is_snapshot
+from backlog import backlog
+
+# One condition on a deregistration record, evaluated once per pass:
+#   kind='eq'    -> column == value
+#   kind='isin'  -> column is one of value (a list)
+#   kind='notna' -> column is present (value unused)
+#   kind='any'   -> any of the earlier conditions named in value holds (column unused)
+#   kind='none'  -> none of the earlier conditions named in value holds (column unused)
+Condition = namedtuple('Condition', ['name', 'kind', 'column', 'value'])
+
+# A named category: the records meeting every listed condition. duration
+# names the per-row duration (see deregistration_durations) it is measured by.
+Category = namedtuple('Category', ['name', 'conditions', 'duration'])
+
+DEREGISTRATION_CONDITIONS = [
+    Condition('liquidation', 'eq', 'de_registration_type', 'LIQUIDATION'),
+    Condition('forced', 'eq', 'de_registration_type', 'FORCED'),
+    Condition('approved', 'eq', 'application_status', 'APPROVED'),
+    Condition('submitted', 'notna', 'submitted_date', None),
+    Condition('approval_dated', 'notna', 'approved_date', None),
+    Condition('verification_in_process', 'eq', 'payment_verification_status', 'IN_PROCESS'),
+    Condition('payment_pending', 'eq', 'payment_status', 'PENDING'),
+    Condition('payment_outstanding', 'any', None, ['verification_in_process', 'payment_pending']),
+    # Still open as the backlog counts it: not closed by a dated approval or rejection
+    Condition('closed', 'isin', 'application_status', ['APPROVED', 'REJECTED']),
+    Condition('not_closed', 'none', None, ['closed']),
+    Condition('approval_undated', 'none', None, ['approval_dated']),
+    Condition('undecided', 'any', None, ['not_closed', 'approval_undated']),
+]
+
+# Completed and pending overlap: an approved record whose payment is still
+# outstanding is in both
+DEREGISTRATION_CATEGORIES = [
+    Category('Liquidation - Completed', ['liquidation', 'approved', 'submitted', 'approval_dated'],
+             'submitted_to_approved_days'),
+    Category('Forced - Completed', ['forced', 'approved', 'submitted', 'approval_dated'],
+             'submitted_to_approved_days'),
+    Category('Liquidation - Pending', ['liquidation', 'approved', 'submitted', 'payment_outstanding'],
+             'pending_days'),
+    Category('Forced - Pending', ['forced', 'approved', 'submitted', 'payment_outstanding'],
+             'pending_days'),
+]
+
+# At an earlier as-of date (a snapshot) payments cannot be rewound, so
+# pending means submitted and still undecided at as_of
+SNAPSHOT_DEREGISTRATION_CATEGORIES = DEREGISTRATION_CATEGORIES[:2] + [
+    Category('Liquidation - Pending', ['liquidation', 'submitted', 'undecided'], 'pending_days'),
+    Category('Forced - Pending', ['forced', 'submitted', 'undecided'], 'pending_days'),
+]
+
+
+def categories_at(as_of):
+    """The deregistration categories for an as-of date: the snapshot ones before the export date."""
+    if is_snapshot('deregistration', as_of):
+        return SNAPSHOT_DEREGISTRATION_CATEGORIES
+    return DEREGISTRATION_CATEGORIES
+
+
+def evaluate_conditions(df, conditions=DEREGISTRATION_CONDITIONS):
+    """Evaluate every condition in one pass; returns a uint32 bitmask per record (bit i = conditions[i])."""
+    if len(conditions) > 32:
+        raise ValueError(f"At most 32 conditions fit in the bitmask, got {len(conditions)}")
+
+    bits = {}
+    mask = np.zeros(len(df), dtype=np.uint32)
+    for bit, condition in enumerate(conditions):
+        if condition.kind in ('any', 'none'):
+            met = np.zeros(len(df), dtype=bool)
+            for name in condition.value:
+                met |= (mask & bits[name]) != 0
+            if condition.kind == 'none':
+                met = ~met
+        elif condition.column not in df.columns:
+            met = np.zeros(len(df), dtype=bool)
+        elif condition.kind == 'eq':
+            met = (df[condition.column] == condition.value).to_numpy(dtype=bool, na_value=False)
+        elif condition.kind == 'isin':
+            met = df[condition.column].isin(condition.value).to_numpy(dtype=bool, na_value=False)
+        elif condition.kind == 'notna':
+            met = df[condition.column].notna().to_numpy()
+        else:
+            raise ValueError(f"Unknown condition kind '{condition.kind}' in condition '{condition.name}'")
+        bits[condition.name] = np.uint32(1 << bit)
+        mask |= met.astype(np.uint32) << np.uint32(bit)
+    return mask
+
+
+def membership_matrix(df, categories=DEREGISTRATION_CATEGORIES, conditions=DEREGISTRATION_CONDITIONS):
+    """Boolean records x categories matrix; column j is True where a record belongs to categories[j]."""
+    mask = evaluate_conditions(df, conditions)
+    bit_of = {condition.name: bit for bit, condition in enumerate(conditions)}
+    required = np.array([sum(1 << bit_of[name] for name in category.conditions)
+                         for category in categories], dtype=np.uint32)
+    return (mask[:, None] & required) == required
+
+
+def split_by(membership, categories, values):
+    """Split every category by the values of one column, using only the membership matrix.
+
+    values is factorized once; returns (matrix, names) where names are
+    'category | value' in category-major order. Records with a missing value
+    belong to no split.
+    """
+    codes, uniques = pd.factorize(pd.Series(values), sort=True)
+    per_value = codes[:, None] == np.arange(len(uniques))
+    matrix = (membership[:, :, None] & per_value[:, None, :]).reshape(len(codes), len(categories) * len(uniques))
+    names = [f'{category.name} | {value}' for category in categories for value in uniques]
+    return matrix, names
+
+
+def deregistration_durations(df, as_of):
+    """Every duration a category can be measured by, computed once per record (days).
+
+    submitted_to_approved_days: submitted_date to approved_date
+    pending_days:               submitted_date to as_of
+    """
+    submitted = df['submitted_date'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+    approved = df['approved_date'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+    missing_submitted = df['submitted_date'].isna().to_numpy()
+
+    to_approved = (approved - submitted) / NS_PER_DAY
+    to_approved[missing_submitted | df['approved_date'].isna().to_numpy()] = np.nan
+    pending = (pd.Timestamp(as_of).value - submitted) / NS_PER_DAY
+    pending[missing_submitted] = np.nan
+    return pd.DataFrame({'submitted_to_approved_days': to_approved, 'pending_days': pending},
+                        index=df.index)
+
+
+def backlog_reconciliation(df, membership, categories, as_of, conditions=DEREGISTRATION_CONDITIONS):
+    """Members of every pending category next to backlog()'s open count at as_of for its type.
+
+    Run on a snapshot at as_of, the two should agree; returns a frame with
+    members, backlog and difference per pending category.
+    """
+    counts = backlog(df, 'deregistration', as_of=as_of, group='de_registration_type')
+    open_at = counts.iloc[-1] if len(counts) else pd.Series(dtype='int64')
+    types = {condition.name: condition.value for condition in conditions
+             if condition.kind == 'eq' and condition.column == 'de_registration_type'}
+
+    rows = {}
+    for j, category in enumerate(categories):
+        type_names = [name for name in category.conditions if name in types]
+        if category.duration != 'pending_days' or len(type_names) != 1:
+            continue
+        rows[category.name] = {'members': int(membership[:, j].sum()),
+                               'backlog': int(open_at.get(types[type_names[0]], 0))}
+    table = pd.DataFrame.from_dict(rows, orient='index', columns=['members', 'backlog'])
+    table['difference'] = table['members'] - table['backlog']
+    return table
+
+
+def category_durations(membership, categories, durations):
+    """{category name: durations of its members}, each measured by the category's duration."""
+    return {category.name: durations[category.duration][membership[:, j]]
+            for j, category in enumerate(categories)}
+
+
+if __name__ == "__main__":
+    from deregistration_data import load_deregistration
+
+    df = load_deregistration()
+    membership = membership_matrix(df)
+    print(f"Records: {len(df):,}")
+    for category, members in zip(DEREGISTRATION_CATEGORIES, membership.sum(axis=0)):
+        print(f"  {category.name:<30} {members:>8,}")
+    print(f"  In more than one category: {(membership.sum(axis=1) > 1).sum():,}")
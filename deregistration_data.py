@@ -0,0 +1,62 @@
+from dataset_cache import load_cached_csv
+from feature_store import DURATION_FEATURES, add_durations
+from fiscal_partitions import load_partitioned
+from remark_fields import REMARK_FIELDS, add_remark_fields
+
+DEREGISTRATION_CSV = 'deregidtration(Liquidation-Cancelation of registration).csv'
+DEREGISTRATION_CACHE = 'deregistration.parquet'
+# Directory of per-fiscal-year parquet files (see fiscal_partitions.py)
+DEREGISTRATION_PARTITIONS = 'deregistration_partitions'
+
+# Date columns parsed once at load time
+DEREGISTRATION_DATE_COLUMNS = ['created_date', 'updated_date', 'submitted_date', 'approved_date']
+
+# Every other column the deregistration scripts use, with a fixed dtype
+DEREGISTRATION_DTYPES = {
+    'id': 'Int64',
+    'application_number': 'str',
+    'application_status': 'category',
+    'de_registration_type': 'category',
+    'payment_status': 'category',
+    'payment_verification_status': 'category',
+    'company_id': 'Int64',
+    'fiscal_year': 'Int64',
+    'current_phase_process': 'category',
+    # Devanagari free text, parsed into remark_* columns (remark_fields.py)
+    'approval_remarks': 'str',
+}
+
+# What prepare_deregistration derives, so a cache built before a change is rebuilt
+DEREGISTRATION_PREPARE_SPEC = (REMARK_FIELDS, DURATION_FEATURES['deregistration'])
+
+
+def prepare_deregistration(df):
+    """Add the remark_* fields and the deregistration duration features."""
+    return add_durations(add_remark_fields(df), 'deregistration')
+
+
+def load_deregistration(columns=None, refresh=False, fiscal_years=None):
+    """Deregistration (liquidation/forced) records with parsed dates.
+
+    The CSV is parsed once and cached as parquet next to it; later calls
+    read the cache until the CSV changes. The remark_* fields parsed from
+    approval_remarks and the duration features are kept in the cache. With fiscal_years (e.g. ['82/83'])
+    only those years' partitions are read. Pass refresh=True to force a reload.
+    """
+    if fiscal_years is not None:
+        return load_partitioned(DEREGISTRATION_CSV, DEREGISTRATION_PARTITIONS, DEREGISTRATION_DTYPES,
+                                DEREGISTRATION_DATE_COLUMNS, fiscal_years=fiscal_years,
+                                columns=columns, refresh=refresh,
+                                prepare=prepare_deregistration,
+                                prepare_spec=DEREGISTRATION_PREPARE_SPEC)
+    return load_cached_csv(DEREGISTRATION_CSV, DEREGISTRATION_CACHE, DEREGISTRATION_DTYPES,
+                           DEREGISTRATION_DATE_COLUMNS, columns=columns, refresh=refresh,
+                           prepare=prepare_deregistration,
+                           prepare_spec=DEREGISTRATION_PREPARE_SPEC)
+
+
+if __name__ == "__main__":
+    print("Building deregistration cache...")
+    df = load_deregistration(refresh=True)
+    print(f"  Records: {len(df):,}")
+    print(f"  Memory: {df.memory_usage(deep=True).sum() / 1024**2:.1f} MB")
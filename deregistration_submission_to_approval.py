@@ -1,8 +1,14 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
+from time_bins import PERIOD_BINS, distribution
+from snapshots import get_as_of, load_snapshot
+from deregistration_data import load_deregistration
+from fiscal_partitions import get_fiscal_years
+from payment_latency import PAYMENT_STATE_RULE, load_payment_records, latency_summary
+from deregistration_categories import (DEREGISTRATION_CATEGORIES, categories_at, membership_matrix, split_by,
+                                       deregistration_durations, category_durations, backlog_reconciliation)
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -11,66 +17,38 @@ sns.set_style("whitegrid")
 print("Creating deregistration time period distribution charts...")
 print("Chart 1: Submitted → Approved/In-Process (by Type and Status)")
 
-# Load data
-df = pd.read_csv('deregidtration(Liquidation-Cancelation of registration).csv', low_memory=False)
+# Load data (dates parsed once and cached); with $FISCAL_YEARS set, e.g.
+# FISCAL_YEARS=82/83, only those fiscal years' partitions are read
+df = load_deregistration(fiscal_years=get_fiscal_years())
 
-# Convert dates
-df['created_date'] = pd.to_datetime(df['created_date'], errors='coerce')
-df['submitted_date'] = pd.to_datetime(df['submitted_date'], errors='coerce')
-df['approved_date'] = pd.to_datetime(df['approved_date'], errors='coerce')
-df['updated_date'] = pd.to_datetime(df['updated_date'], errors='coerce')
+# Evaluation date for pending calculations (export date unless $AS_OF is set);
+# an earlier date reconstructs the records as they stood then
+today = get_as_of('deregistration')
+df = load_snapshot(df, 'deregistration', today)
 
-# Today's date for pending calculations
-today = pd.Timestamp('2026-01-25')
-
-# Define time bins
-bins = [-np.inf, 0, 1, 3, 7, 14, 30, 60, 90, 180, 365, np.inf]
-labels = ['Same day', '1 day', '2-3 days', '4-7 days', '1-2 weeks',
-          '2-4 weeks', '1-2 months', '2-3 months', '3-6 months', '6-12 months', '1+ year']
+# Time bins (shared period scheme)
+labels = PERIOD_BINS.labels
 
 # Check for rejected records
 rejected_count = len(df[df['application_status'] == 'REJECTED'])
 print(f"\nRejected records found: {rejected_count}")
 
-# Filter for LIQUIDATION and FORCED types with APPROVED status
-df_liquidation_approved = df[(df['de_registration_type'] == 'LIQUIDATION') &
-                             (df['application_status'] == 'APPROVED') &
-                             (df['submitted_date'].notna()) &
-                             (df['approved_date'].notna())].copy()
-df_forced_approved = df[(df['de_registration_type'] == 'FORCED') &
-                        (df['application_status'] == 'APPROVED') &
-                        (df['submitted_date'].notna()) &
-                        (df['approved_date'].notna())].copy()
-
-# Filter for LIQUIDATION and FORCED with pending/in-process status
-# (payment_verification_status = IN_PROCESS or payment_status = PENDING but still APPROVED)
-df_liquidation_pending = df[(df['de_registration_type'] == 'LIQUIDATION') &
-                            (df['application_status'] == 'APPROVED') &
-                            (df['submitted_date'].notna()) &
-                            ((df['payment_verification_status'] == 'IN_PROCESS') |
-                             (df['payment_status'] == 'PENDING'))].copy()
-df_forced_pending = df[(df['de_registration_type'] == 'FORCED') &
-                       (df['application_status'] == 'APPROVED') &
-                       (df['submitted_date'].notna()) &
-                       ((df['payment_verification_status'] == 'IN_PROCESS') |
-                        (df['payment_status'] == 'PENDING'))].copy()
-
-# Calculate time periods
-# For approved: submitted to approved
-df_liquidation_approved['time_days'] = (df_liquidation_approved['approved_date'] - df_liquidation_approved['submitted_date']).dt.total_seconds() / 86400
-df_forced_approved['time_days'] = (df_forced_approved['approved_date'] - df_forced_approved['submitted_date']).dt.total_seconds() / 86400
-
-# For pending: submitted to today
-df_liquidation_pending['time_days'] = (today - df_liquidation_pending['submitted_date']).dt.total_seconds() / 86400
-df_forced_pending['time_days'] = (today - df_forced_pending['submitted_date']).dt.total_seconds() / 86400
-
-# Create categories dictionary
-categories = {
-    'Liquidation - Completed': df_liquidation_approved,
-    'Forced - Completed': df_forced_approved,
-    'Liquidation - Pending': df_liquidation_pending,
-    'Forced - Pending': df_forced_pending
-}
+# Categories (Liquidation/Forced x Completed/Pending) are declared in
+# deregistration_categories.py and evaluated in one pass into a membership
+# matrix; completed and pending overlap. Durations are computed once per row:
+# completed records are measured submitted -> approved, pending ones
+# submitted -> today. Before the export date pending means submitted and
+# still undecided at today, and must match the backlog on that day.
+deregistration_categories = categories_at(today)
+membership = membership_matrix(df, deregistration_categories)
+durations = deregistration_durations(df, today)
+categories = category_durations(membership, deregistration_categories, durations)
+if deregistration_categories is not DEREGISTRATION_CATEGORIES:
+    reconciliation = backlog_reconciliation(df, membership, deregistration_categories, today)
+    print(f"\nPending categories vs backlog on {today:%Y-%m-%d}:")
+    print(reconciliation.to_string())
+    if reconciliation['difference'].any():
+        print("  WARNING: pending categories do not reconcile with the backlog")
 
 # Colors for each category
 color_map = {
@@ -80,36 +58,14 @@ color_map = {
     'Forced - Pending': '#f39c12'          # Orange
 }
 
-# Function to calculate distribution
-def calculate_distribution(df_cat, bins, labels):
-    if len(df_cat) == 0:
-        return [0] * len(labels), [0] * len(labels)
-
-    df_cat['time_bin'] = pd.cut(df_cat['time_days'], bins=bins, labels=labels)
-    dist = df_cat['time_bin'].value_counts().sort_index()
-    total = len(df_cat)
-
-    counts = []
-    percentages = []
-    for label in labels:
-        if label in dist.index:
-            count = dist[label]
-            counts.append(count)
-            percentages.append((count / total) * 100)
-        else:
-            counts.append(0)
-            percentages.append(0)
-
-    return counts, percentages
-
 # Calculate distributions for all categories
 all_data = {}
-for cat_name, df_cat in categories.items():
-    counts, percentages = calculate_distribution(df_cat, bins, labels)
+for cat_name, time_days in categories.items():
+    counts, percentages = distribution(time_days, PERIOD_BINS)
     all_data[cat_name] = {
         'counts': counts,
         'percentages': percentages,
-        'total': len(df_cat)
+        'total': len(time_days)
     }
 
 print(f"\nData Summary:")
@@ -223,22 +179,43 @@ print("SUMMARY STATISTICS")
 print("="*80)
 
 for cat_name in ['Liquidation - Completed', 'Forced - Completed', 'Liquidation - Pending', 'Forced - Pending']:
-    df_cat = categories[cat_name]
-    if len(df_cat) > 0:
-        time_days = df_cat['time_days']
-
+    time_days = categories[cat_name]
+    if len(time_days) > 0:
         print(f"\n{cat_name.upper()}:")
-        print(f"  Total records: {len(df_cat):,}")
+        print(f"  Total records: {len(time_days):,}")
         print(f"  Mean time: {time_days.mean():.1f} days")
         print(f"  Median time: {time_days.median():.1f} days")
         print(f"  Min time: {time_days.min():.1f} days")
         print(f"  Max time: {time_days.max():.1f} days")
         print(f"  Std deviation: {time_days.std():.1f} days")
 
+# Category sizes by current phase, split from the membership matrix
+if 'current_phase_process' in df.columns:
+    print("\n" + "="*80)
+    print("CATEGORIES BY CURRENT PHASE")
+    print("="*80)
+    phase_membership, phase_names = split_by(membership, deregistration_categories,
+                                             df['current_phase_process'])
+    for name, members in zip(phase_names, phase_membership.sum(axis=0)):
+        if members > 0:
+            print(f"  {name:<60} {members:>8,}")
+
+# Payment waits next to the discounted deregistration phases; the records are
+# cached per as-of date, so the exports are not rescanned
+print("\n" + "="*80)
+print("PAYMENT LATENCY: LIQUIDATION vs FORCED vs DISCOUNTED (days)")
+if deregistration_categories is DEREGISTRATION_CATEGORIES:
+    print(f"({PAYMENT_STATE_RULE}, as in the pending categories above)")
+else:
+    print(f"({PAYMENT_STATE_RULE}; payments of applications undecided at {today:%Y-%m-%d} are 'Not started')")
+print("="*80)
+payments = load_payment_records(today)
+print(latency_summary(payments, get_fiscal_years()).to_string(float_format='%.1f'))
+
 print("\n" + "="*80)
 print("DEREGISTRATION SUBMISSION TO APPROVAL CHARTS COMPLETE!")
 print("="*80)
-print("""
+print(f"""
 Generated Files:
   1. deregistration_submission_to_approval_comparison.png (combined chart)
   2. deregistration_submission_to_approval_1_of_4.png (Liquidation - Completed)
@@ -248,7 +225,7 @@ Generated Files:
 
 Analysis:
   - Completed: submission_date to approved_date
-  - Pending: submission_date to Jan 25, 2026 (today)
+  - Pending: submission_date to {today:%b %d, %Y} (today)
   - Comparing Liquidation (voluntary) vs Forced (compulsory) processes
   - Comparing Completed vs Pending status
 """)
@@ -0,0 +1,85 @@
+from dataset_cache import load_cached_csv
+from feature_store import DURATION_FEATURES, add_durations
+from fiscal_partitions import load_partitioned
+from remark_fields import REMARK_FIELDS, add_remark_fields
+
+# (CSV export, parquet cache) per phase of the discounted deregistration process
+DISCOUNTED_PHASE_FILES = {
+    1: ('discountedderegistration.csv', 'discountedderegistration.parquet'),
+    2: ('discounteddiregistrationpahse2.csv', 'discounteddiregistrationpahse2.parquet'),
+    3: ('discounteddiregistrationpahse3.csv', 'discounteddiregistrationpahse3.parquet'),
+}
+
+# Directory of per-fiscal-year parquet files per phase (see fiscal_partitions.py)
+DISCOUNTED_PHASE_PARTITIONS = {
+    1: 'discountedderegistration_partitions',
+    2: 'discounteddiregistrationpahse2_partitions',
+    3: 'discounteddiregistrationpahse3_partitions',
+}
+
+# Column of each later phase holding the id of its record in the previous phase
+PHASE_LINK_KEYS = {
+    2: 'discounted_de_registration',
+    3: 'de_registration_phase_two',
+}
+
+# Date columns parsed once at load time
+DISCOUNTED_DATE_COLUMNS = ['created_date', 'updated_date', 'submission_date', 'approved_date']
+
+# Every other column the discounted deregistration scripts use, with a fixed dtype
+DISCOUNTED_DTYPES = {
+    'id': 'Int64',
+    'application_number': 'str',
+    'application_status': 'category',
+    'company_id': 'Int64',
+    'payment_status': 'category',
+    'payment_verification_status': 'category',
+    'discounted_de_registration': 'Int64',
+    'de_registration_phase_two': 'Int64',
+    # Phase 1 only: fine, discount granted and revenue, in rupees
+    'fine_amount': 'float64',
+    'discount': 'float64',
+    'revenue_amount': 'float64',
+    # Devanagari free text; the amounts and section they state are parsed
+    # into remark_* columns at load time (remark_fields.py)
+    'amount_selection_remarks': 'str',
+    'remarks': 'str',
+    'approval_remarks': 'str',
+}
+
+# What prepare_discounted derives, so a cache built before a change is rebuilt
+DISCOUNTED_PREPARE_SPEC = (REMARK_FIELDS, DURATION_FEATURES['discounted_deregistration'])
+
+
+def prepare_discounted(df):
+    """Add the remark_* fields and the discounted deregistration duration features."""
+    return add_durations(add_remark_fields(df), 'discounted_deregistration')
+
+
+def load_discounted_phase(phase, columns=None, refresh=False, fiscal_years=None):
+    """Records of one discounted deregistration phase (1-3) with parsed dates.
+
+    The CSV is parsed once and cached as parquet next to it; later calls
+    read the cache until the CSV changes. The remark_* fields parsed from
+    the remarks and the duration features are kept in the cache. With fiscal_years (e.g. ['82/83'])
+    only those years' partitions are read; a phase's fiscal year is that of
+    its own application number. Pass refresh=True to force a reload.
+    """
+    csv_path, cache_path = DISCOUNTED_PHASE_FILES[phase]
+    if fiscal_years is not None:
+        return load_partitioned(csv_path, DISCOUNTED_PHASE_PARTITIONS[phase], DISCOUNTED_DTYPES,
+                                DISCOUNTED_DATE_COLUMNS, fiscal_years=fiscal_years,
+                                columns=columns, refresh=refresh,
+                                prepare=prepare_discounted,
+                                prepare_spec=DISCOUNTED_PREPARE_SPEC)
+    return load_cached_csv(csv_path, cache_path, DISCOUNTED_DTYPES, DISCOUNTED_DATE_COLUMNS,
+                           columns=columns, refresh=refresh,
+                           prepare=prepare_discounted, prepare_spec=DISCOUNTED_PREPARE_SPEC)
+
+
+if __name__ == "__main__":
+    for phase in DISCOUNTED_PHASE_FILES:
+        print(f"Building phase {phase} cache...")
+        df = load_discounted_phase(phase, refresh=True)
+        print(f"  Records: {len(df):,}")
+        print(f"  Memory: {df.memory_usage(deep=True).sum() / 1024**2:.1f} MB")
@@ -1,8 +1,14 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
+from time_bins import PERIOD_BINS, grouped_distribution
+from discounted_deregistration_data import load_discounted_phase
+from snapshots import get_as_of, load_snapshot
+from fiscal_partitions import get_fiscal_years
+from discounted_phase_linkage import link_discounted_phases, stall_report, phase_duration_summary
+from discounted_finance import (add_finance_columns, amount_totals, amount_crosstab, payment_time_by_amount,
+                                remark_reconciliation)
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -10,45 +16,34 @@ sns.set_style("whitegrid")
 
 print("Creating discounted deregistration three-phase time distribution charts...")
 
-# Today's date for pending calculations
-today = pd.Timestamp('2026-01-25')
+# Evaluation date for pending calculations (export date unless $AS_OF is set)
+today = get_as_of('discounted_phase1')
 
-# Define time bins
-bins = [-np.inf, 0, 1, 3, 7, 14, 30, 60, 90, 180, 365, np.inf]
-labels = ['Same day', '1 day', '2-3 days', '4-7 days', '1-2 weeks',
-          '2-4 weeks', '1-2 months', '2-3 months', '3-6 months', '6-12 months', '1+ year']
+# Fiscal years to analyse ($FISCAL_YEARS, e.g. 82/83; default all); each
+# phase reads only those years' partitions
+fiscal_years = get_fiscal_years()
 
-# Function to calculate distribution
-def calculate_distribution(df_cat, bins, labels):
-    if len(df_cat) == 0:
-        return [0] * len(labels), [0] * len(labels)
+# Time bins (shared period scheme)
+labels = PERIOD_BINS.labels
 
-    df_cat['time_bin'] = pd.cut(df_cat['time_days'], bins=bins, labels=labels)
-    dist = df_cat['time_bin'].value_counts().sort_index()
-    total = len(df_cat)
 
-    counts = []
-    percentages = []
-    for label in labels:
-        if label in dist.index:
-            count = dist[label]
-            counts.append(count)
-            percentages.append((count / total) * 100)
-        else:
-            counts.append(0)
-            percentages.append(0)
+def approved_pending_distribution(approved, pending):
+    """Period counts and percentages of a phase's approved and pending records, in one grouped pass."""
+    times = np.concatenate([approved['time_days'].to_numpy(), pending['time_days'].to_numpy()])
+    states = np.repeat(['Approved', 'Pending'], [len(approved), len(pending)])
+    counts, pct = grouped_distribution(times, states, PERIOD_BINS)
+    counts = counts.reindex(['Approved', 'Pending'], fill_value=0)
+    pct = pct.reindex(['Approved', 'Pending'], fill_value=0.0)
+    return (counts.loc['Approved'].tolist(), pct.loc['Approved'].tolist(),
+            counts.loc['Pending'].tolist(), pct.loc['Pending'].tolist())
 
-    return counts, percentages
 
 # ============================================================================
 # PHASE 1: Initial Discount Application (Bargaining & Discount Calculation)
 # ============================================================================
 print("\nProcessing Phase 1: Initial Discount Application...")
 
-df1 = pd.read_csv('discountedderegistration.csv', low_memory=False)
-df1['created_date'] = pd.to_datetime(df1['created_date'], errors='coerce')
-df1['submission_date'] = pd.to_datetime(df1['submission_date'], errors='coerce')
-df1['approved_date'] = pd.to_datetime(df1['approved_date'], errors='coerce')
+df1 = load_snapshot(load_discounted_phase(1, fiscal_years=fiscal_years), 'discounted_phase1', today)
 
 # Approved records in Phase 1
 df1_approved = df1[(df1['application_status'] == 'APPROVED') &
@@ -61,8 +56,8 @@ df1_pending = df1[(df1['submission_date'].notna()) &
                   ((df1['application_status'] != 'APPROVED') | (df1['approved_date'].isna()))].copy()
 df1_pending['time_days'] = (today - df1_pending['submission_date']).dt.total_seconds() / 86400
 
-counts1_approved, pct1_approved = calculate_distribution(df1_approved, bins, labels)
-counts1_pending, pct1_pending = calculate_distribution(df1_pending, bins, labels)
+counts1_approved, pct1_approved, counts1_pending, pct1_pending = \
+    approved_pending_distribution(df1_approved, df1_pending)
 
 print(f"  Phase 1 Approved: {len(df1_approved):,} records")
 print(f"  Phase 1 Pending: {len(df1_pending):,} records")
@@ -72,10 +67,7 @@ print(f"  Phase 1 Pending: {len(df1_pending):,} records")
 # ============================================================================
 print("\nProcessing Phase 2: Payment Processing...")
 
-df2 = pd.read_csv('discounteddiregistrationpahse2.csv', low_memory=False)
-df2['created_date'] = pd.to_datetime(df2['created_date'], errors='coerce')
-df2['submission_date'] = pd.to_datetime(df2['submission_date'], errors='coerce')
-df2['approved_date'] = pd.to_datetime(df2['approved_date'], errors='coerce')
+df2 = load_snapshot(load_discounted_phase(2, fiscal_years=fiscal_years), 'discounted_phase2', today)
 
 # Approved records in Phase 2
 df2_approved = df2[(df2['application_status'] == 'APPROVED') &
@@ -88,8 +80,8 @@ df2_pending = df2[(df2['submission_date'].notna()) &
                   ((df2['application_status'] != 'APPROVED') | (df2['approved_date'].isna()))].copy()
 df2_pending['time_days'] = (today - df2_pending['submission_date']).dt.total_seconds() / 86400
 
-counts2_approved, pct2_approved = calculate_distribution(df2_approved, bins, labels)
-counts2_pending, pct2_pending = calculate_distribution(df2_pending, bins, labels)
+counts2_approved, pct2_approved, counts2_pending, pct2_pending = \
+    approved_pending_distribution(df2_approved, df2_pending)
 
 print(f"  Phase 2 Approved: {len(df2_approved):,} records")
 print(f"  Phase 2 Pending: {len(df2_pending):,} records")
@@ -99,10 +91,7 @@ print(f"  Phase 2 Pending: {len(df2_pending):,} records")
 # ============================================================================
 print("\nProcessing Phase 3: Final Verification & Closure...")
 
-df3 = pd.read_csv('discounteddiregistrationpahse3.csv', low_memory=False)
-df3['created_date'] = pd.to_datetime(df3['created_date'], errors='coerce')
-df3['submission_date'] = pd.to_datetime(df3['submission_date'], errors='coerce')
-df3['approved_date'] = pd.to_datetime(df3['approved_date'], errors='coerce')
+df3 = load_snapshot(load_discounted_phase(3, fiscal_years=fiscal_years), 'discounted_phase3', today)
 
 # Approved records in Phase 3
 df3_approved = df3[(df3['application_status'] == 'APPROVED') &
@@ -115,8 +104,8 @@ df3_pending = df3[(df3['submission_date'].notna()) &
                   ((df3['application_status'] != 'APPROVED') | (df3['approved_date'].isna()))].copy()
 df3_pending['time_days'] = (today - df3_pending['submission_date']).dt.total_seconds() / 86400
 
-counts3_approved, pct3_approved = calculate_distribution(df3_approved, bins, labels)
-counts3_pending, pct3_pending = calculate_distribution(df3_pending, bins, labels)
+counts3_approved, pct3_approved, counts3_pending, pct3_pending = \
+    approved_pending_distribution(df3_approved, df3_pending)
 
 print(f"  Phase 3 Approved: {len(df3_approved):,} records")
 print(f"  Phase 3 Pending: {len(df3_pending):,} records")
@@ -241,14 +230,80 @@ print(f"  Approved: {len(df3_approved):,} | Mean: {df3_approved['time_days'].mea
 if len(df3_pending) > 0:
     print(f"  Pending:  {len(df3_pending):,} | Mean: {df3_pending['time_days'].mean():.1f} days | Median: {df3_pending['time_days'].median():.1f} days")
 
+# ============================================================================
+# End-to-end: phases linked per application
+# ============================================================================
+print("\n" + "="*80)
+print("END-TO-END PHASE LINKAGE")
+print("="*80)
+
+linked = link_discounted_phases(df1, df2, df3, as_of=today)
+print(f"\nApplications (Phase 1 records): {len(linked):,}")
+print(f"  Reached Phase 2: {linked['p2_id'].notna().sum():,}")
+print(f"  Reached Phase 3: {linked['p3_id'].notna().sum():,}")
+
+print("\nPhase durations and waits between phases (days):")
+print(phase_duration_summary(linked).to_string(float_format='%.1f'))
+
+print("\nWhere applications stall (days in current stage):")
+print(stall_report(linked).to_string(float_format='%.1f'))
+
+linked.to_csv('discounted_deregistration_phase_lead_times.csv', index=False)
+print("\n✓ Saved: discounted_deregistration_phase_lead_times.csv")
+
+# ============================================================================
+# Fines, discounts and revenue (same linked applications, no reload)
+# ============================================================================
+print("\n" + "="*80)
+print("FINES, DISCOUNTS AND REVENUE")
+print("="*80)
+
+fin = add_finance_columns(linked)
+print(f"\nTotal fine:     Rs {fin['fine_amount'].sum():,.0f}")
+print(f"Total discount: Rs {fin['discount'].sum():,.0f}")
+print(f"Total payable:  Rs {fin['payable_amount'].sum():,.0f}")
+print(f"Total revenue:  Rs {fin['revenue_amount'].sum():,.0f}")
+
+print("\nBy current stage:")
+stage_amounts = amount_totals(fin, 'stall_stage')
+print(stage_amounts.to_string(float_format='%.2f'))
+
+print("\nBy submission month:")
+print(amount_totals(fin, 'month').to_string(float_format='%.2f'))
+
+print("\nApplications by payment status (phase 1) and payable amount:")
+print(amount_crosstab(fin, 'p1_payment_status').to_string())
+
+print("\nApplications by payment status (phase 2) and payable amount:")
+print(amount_crosstab(fin, 'p2_payment_status').to_string())
+
+print("\nPayment waits by payable amount (days):")
+payment_times, correlations = payment_time_by_amount(fin)
+print(payment_times.to_string(float_format='%.1f'))
+for col, correlation in correlations.items():
+    print(f"  Rank correlation of payable amount with {col}: {correlation:.2f}")
+
+# Amounts parsed from the Devanagari amount-selection remarks at load time
+print("\nPayable amount stated in the remarks vs fine - discount:")
+outcomes, remark_capital = remark_reconciliation(fin)
+for outcome, count in outcomes.items():
+    print(f"  {outcome:<12} {count:>6,}")
+print("\nPaid-up capital stated in the remarks, by payable amount (Rs):")
+print(remark_capital.to_string(float_format='%.0f'))
+
+stage_amounts.to_csv('discounted_deregistration_financial_summary.csv')
+print("\n✓ Saved: discounted_deregistration_financial_summary.csv")
+
 print("\n" + "="*80)
 print("DISCOUNTED DEREGISTRATION CHARTS COMPLETE!")
 print("="*80)
-print("""
+print(f"""
 Generated Files:
   1. discounted_deregistration_phase1_time_distribution.png (Phase 1: Discount Application)
   2. discounted_deregistration_phase2_time_distribution.png (Phase 2: Payment Processing)
   3. discounted_deregistration_phase3_time_distribution.png (Phase 3: Final Closure)
+  4. discounted_deregistration_phase_lead_times.csv (per-application phase durations and stall stage)
+  5. discounted_deregistration_financial_summary.csv (fines, discounts and payable amounts by stage)
 
 Process Overview:
   Phase 1: Companies apply for discount, authorities calculate reduced penalties
@@ -257,5 +312,5 @@ Process Overview:
 
 Timeline:
   - Approved: submission_date to approved_date
-  - Pending: submission_date to Jan 25, 2026 (still in process)
+  - Pending: submission_date to {today:%b %d, %Y} (still in process)
 """)
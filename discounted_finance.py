@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+from time_bins import BinScheme, assign_bins
+
+# Amounts of a phase 1 application, in rupees
+AMOUNT_COLUMNS = ['fine_amount', 'discount', 'revenue_amount']
+# Derived per application:
+#   payable_amount -> fine_amount - discount (what the company still pays in phase 2)
+#   discount_rate  -> discount / fine_amount (NaN when there is no fine)
+FINANCE_COLUMNS = AMOUNT_COLUMNS + ['payable_amount']
+
+# Payable amount bands; (a, b] intervals, as the period bins
+AMOUNT_BINS = BinScheme(
+    'amount', 1,
+    [-np.inf, 0, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000, np.inf],
+    ['Nothing', 'Up to 10K', '10K-50K', '50K-100K', '100K-500K', '500K-1M', '1M-5M', '5M+'],
+    right=True, clip=False)
+
+# Waits (days, from the 'discounted_phases' durations) compared against the amounts:
+# approval of the discount -> payment phase filed, and the payment phase itself
+PAYMENT_TIME_COLUMNS = ['wait_1_to_2_days', 'phase2_days']
+
+
+def add_finance_columns(linked):
+    """Add payable_amount, discount_rate, amount_band and submission month to linked applications.
+
+    linked is the output of discounted_phase_linkage.link_discounted_phases.
+    """
+    fin = linked.copy()
+    fine = fin['fine_amount'].to_numpy(dtype=np.float64, na_value=np.nan)
+    discount = fin['discount'].to_numpy(dtype=np.float64, na_value=np.nan)
+    payable = fine - np.nan_to_num(discount)
+
+    fin['payable_amount'] = payable
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fin['discount_rate'] = np.where(fine > 0, discount / fine, np.nan)
+    fin['amount_band'] = pd.Categorical.from_codes(assign_bins(payable, AMOUNT_BINS),
+                                                   categories=AMOUNT_BINS.labels, ordered=True)
+    fin['month'] = fin['p1_submission_date'].dt.to_period('M')
+    return fin
+
+
+def amount_totals(fin, by):
+    """Applications, total/mean/median amounts and overall discount rate per `by` group (one groupby)."""
+    grouped = fin.groupby(by, observed=True, dropna=False)
+    totals = grouped[FINANCE_COLUMNS].sum()
+    table = pd.DataFrame({'applications': grouped.size()})
+    for col in FINANCE_COLUMNS:
+        table[f'total_{col}'] = totals[col]
+    table['mean_payable'] = grouped['payable_amount'].mean()
+    table['median_payable'] = grouped['payable_amount'].median()
+    table['discount_rate'] = totals['discount'] / totals['fine_amount'].where(totals['fine_amount'] > 0)
+    return table
+
+
+def amount_crosstab(fin, index, values=None, aggfunc='size'):
+    """index x amount band table: application counts, or aggfunc of values ('sum', 'median', ...)."""
+    grouped = fin.groupby([index, 'amount_band'], observed=False, dropna=False)
+    table = grouped.size() if values is None else grouped[values].agg(aggfunc)
+    return table.unstack('amount_band', fill_value=0 if values is None else np.nan)
+
+
+def payment_time_by_amount(fin):
+    """Median payment waits per amount band and their rank correlation with the payable amount."""
+    grouped = fin.groupby('amount_band', observed=False)
+    table = pd.DataFrame({'applications': grouped.size(),
+                          'total_payable': grouped['payable_amount'].sum()})
+    for col in PAYMENT_TIME_COLUMNS:
+        table[f'{col}_count'] = grouped[col].count()
+        table[f'{col}_median'] = grouped[col].median()
+
+    correlations = {col: rank_correlation(fin['payable_amount'], fin[col]) for col in PAYMENT_TIME_COLUMNS}
+    return table, correlations
+
+
+def remark_reconciliation(fin, tolerance=1.0):
+    """Compare the payable amount stated in the remarks with fine_amount - discount.
+
+    Returns application counts per outcome ('Agrees', 'Differs', 'Not stated')
+    and the median paid-up capital stated per amount band.
+    """
+    stated = fin['remark_payable'].to_numpy(dtype=np.float64, na_value=np.nan)
+    agrees = np.abs(stated - fin['payable_amount'].to_numpy(dtype=np.float64)) <= tolerance
+    outcome = np.select([np.isnan(stated), agrees], ['Not stated', 'Agrees'], default='Differs')
+    outcomes = pd.Series(outcome).value_counts().reindex(['Agrees', 'Differs', 'Not stated'], fill_value=0)
+
+    capital = fin.groupby('amount_band', observed=False)['remark_paid_up_capital'].agg(['count', 'median'])
+    return outcomes, capital
+
+
+def rank_correlation(x, y):
+    """Spearman correlation over the pairs where both are present (Pearson on the ranks)."""
+    pairs = pd.DataFrame({'x': x.astype(np.float64), 'y': y.astype(np.float64)}).dropna()
+    if len(pairs) < 2:
+        return np.nan
+    ranks = pairs.rank()
+    return ranks['x'].corr(ranks['y'])
+
+
+if __name__ == "__main__":
+    from discounted_deregistration_data import load_discounted_phase
+    from snapshots import get_as_of
+    from discounted_phase_linkage import link_discounted_phases
+
+    linked = link_discounted_phases(load_discounted_phase(1), load_discounted_phase(2),
+                                    load_discounted_phase(3), as_of=get_as_of('discounted_phase1'))
+    fin = add_finance_columns(linked)
+    print(f"Applications: {len(fin):,}")
+    print(amount_totals(fin, 'stall_stage').to_string(float_format='%.2f'))
+    print()
+    print(amount_crosstab(fin, 'p1_payment_status').to_string())
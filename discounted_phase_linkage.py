@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+from feature_store import DURATION_FEATURES, add_durations, duration_days
+from discounted_deregistration_data import PHASE_LINK_KEYS
+
+# Columns of each phase carried onto the linked application, prefixed p<n>_
+PHASE_COLUMNS = ['id', 'application_status', 'created_date', 'submission_date', 'approved_date',
+                 'payment_status', 'payment_verification_status']
+
+# Phase 1 columns carried onto the linked application unprefixed
+APPLICATION_COLUMNS = ['application_number', 'company_id', 'fine_amount', 'discount', 'revenue_amount',
+                       'remark_paid_up_capital', 'remark_payable', 'remark_section']
+
+# Where an application currently sits, in process order
+STALL_STAGES = ['Phase 1 in process', 'Waiting for phase 2', 'Phase 2 in process',
+                'Waiting for phase 3', 'Phase 3 in process', 'Completed']
+
+
+def phase_columns(df, phase):
+    """One phase's PHASE_COLUMNS prefixed p<n>_, approved_date kept only for approved records."""
+    part = df[[col for col in PHASE_COLUMNS if col in df.columns]].copy()
+    approved = (part['application_status'] == 'APPROVED') & part['approved_date'].notna()
+    part['approved_date'] = part['approved_date'].where(approved)
+    return part.rename(columns=lambda col: f'p{phase}_{col}')
+
+
+def latest_per_parent(df, key):
+    """The most recently created record for each previous-phase id."""
+    df = df[df[key].notna()]
+    return df.sort_values('created_date', kind='stable').drop_duplicates(key, keep='last')
+
+
+def stall_stage(linked, as_of):
+    """Stage each application is in and the days it has spent there by as_of.
+
+    The stage follows the furthest phase an application has reached (a
+    missing approval date in an earlier phase does not hold it back): a
+    phase without an approval is 'in process' since its submission (or
+    creation), an approved phase with no record in the next phase is
+    'waiting' since its approval.
+    """
+    # (stage reached, date the stage started), furthest stage first
+    reached = [
+        (linked['p3_approved_date'].notna(), linked['p3_approved_date']),
+        (linked['p3_id'].notna(), linked['p3_submission_date'].fillna(linked['p3_created_date'])),
+        (linked['p2_approved_date'].notna(), linked['p2_approved_date']),
+        (linked['p2_id'].notna(), linked['p2_submission_date'].fillna(linked['p2_created_date'])),
+        (linked['p1_approved_date'].notna(), linked['p1_approved_date']),
+    ]
+    codes = np.select([condition.to_numpy(dtype=bool) for condition, _ in reached],
+                      np.arange(len(STALL_STAGES) - 1, 0, -1), default=0)
+    stage = pd.Categorical.from_codes(codes, categories=STALL_STAGES, ordered=True)
+    starts = [linked['p1_submission_date'].fillna(linked['p1_created_date'])] + \
+        [start for _, start in reversed(reached)]
+
+    start_ns = np.full(len(linked), np.datetime64('NaT'), dtype='datetime64[ns]')
+    for code, start in enumerate(starts[:-1]):
+        in_stage = codes == code
+        start_ns[in_stage] = start.to_numpy(dtype='datetime64[ns]')[in_stage]
+    start = pd.Series(start_ns, index=linked.index)
+    days = duration_days(pd.Series(pd.Timestamp(as_of), index=linked.index), start)
+    return stage, days
+
+
+def link_discounted_phases(df1, df2, df3, as_of):
+    """Join the three discounted deregistration phases into one row per application.
+
+    Phase 2 and 3 records are attached to their previous phase by
+    PHASE_LINK_KEYS with indexed joins (the latest record per parent when an
+    application was filed twice). Returns one row per phase 1 application with
+    its APPLICATION_COLUMNS, the p1_/p2_/p3_ columns of PHASE_COLUMNS, the 'discounted_phases' durations
+    (float32 days), its stall_stage and days_in_stage as of as_of.
+    """
+    linked = phase_columns(df1, 1)
+    for col in APPLICATION_COLUMNS:
+        if col in df1.columns:
+            linked[col] = df1[col]
+
+    for phase, df in [(2, df2), (3, df3)]:
+        key = PHASE_LINK_KEYS[phase]
+        child = latest_per_parent(df, key)
+        part = phase_columns(child, phase)
+        part.index = pd.Index(child[key], name=None)
+        linked = linked.join(part, on=f'p{phase - 1}_id')
+
+    linked = add_durations(linked, 'discounted_phases')
+    linked['stall_stage'], linked['days_in_stage'] = stall_stage(linked, as_of)
+    return linked.reset_index(drop=True)
+
+
+def stall_report(linked):
+    """Applications per stall stage with the days they have spent there."""
+    grouped = linked.groupby('stall_stage', observed=False)['days_in_stage']
+    report = pd.DataFrame({
+        'applications': grouped.size(),
+        'median_days': grouped.median(),
+        'mean_days': grouped.mean(),
+        'max_days': grouped.max(),
+    })
+    report['percentage'] = report['applications'] / max(len(linked), 1) * 100
+    return report
+
+
+def phase_duration_summary(linked):
+    """Count, mean, median and 90th percentile of every phase duration and wait."""
+    columns = [col for col in DURATION_FEATURES['discounted_phases'] if col in linked.columns]
+    durations = linked[columns]
+    return pd.DataFrame({
+        'count': durations.count(),
+        'mean': durations.mean(),
+        'median': durations.median(),
+        'p90': durations.quantile(0.90),
+    })
+
+
+if __name__ == "__main__":
+    from discounted_deregistration_data import load_discounted_phase
+    from snapshots import get_as_of
+
+    linked = link_discounted_phases(load_discounted_phase(1), load_discounted_phase(2),
+                                    load_discounted_phase(3), as_of=get_as_of('discounted_phase1'))
+    print(f"Applications: {len(linked):,}")
+    print(phase_duration_summary(linked).to_string(float_format='%.1f'))
+    print()
+    print(stall_report(linked).to_string(float_format='%.1f'))
@@ -0,0 +1,66 @@
+import numpy as np
+
+# Derived durations (days) per dataset: column -> (end date, start date).
+# Adding a new pair here is all it takes; the dataset loaders compute every
+# declared column once and keep it in their parquet cache.
+DURATION_FEATURES = {
+    'name_registration': {
+        'created_to_updated_days': ('updated_date', 'created_date'),
+        'updated_to_approved_days': ('approved_date', 'updated_date'),
+        'created_to_approved_days': ('approved_date', 'created_date'),
+        'created_to_submission_days': ('submission_date', 'created_date'),
+        'submission_to_approved_days': ('approved_date', 'submission_date'),
+    },
+    'company_registration': {
+        'created_to_submission_days': ('submission_date', 'created_date'),
+        'created_to_approved_days': ('approved_date', 'created_date'),
+        'submission_to_approved_days': ('approved_date', 'submission_date'),
+        'approved_to_registration_days': ('registration_date', 'approved_date'),
+        'created_to_registration_days': ('registration_date', 'created_date'),
+    },
+    'deregistration': {
+        'submitted_to_approved_days': ('approved_date', 'submitted_date'),
+    },
+    'discounted_deregistration': {
+        'submission_to_approved_days': ('approved_date', 'submission_date'),
+    },
+    # The share export has no approval date; updated_date is the last status change
+    'share': {
+        'submission_to_updated_days': ('updated_date', 'submission_date'),
+    },
+    # Company registrations linked to their name reservation (registration_linkage.py)
+    'name_to_company': {
+        'name_approved_to_created_days': ('created_date', 'name_approved_date'),
+        'name_created_to_registration_days': ('registration_date', 'name_created_date'),
+    },
+    # Discounted deregistration applications joined across phases (discounted_phase_linkage.py);
+    # p<n>_approved_date is only set once phase n was approved
+    'discounted_phases': {
+        'phase1_days': ('p1_approved_date', 'p1_submission_date'),
+        'wait_1_to_2_days': ('p2_submission_date', 'p1_approved_date'),
+        'phase2_days': ('p2_approved_date', 'p2_submission_date'),
+        'wait_2_to_3_days': ('p3_submission_date', 'p2_approved_date'),
+        'phase3_days': ('p3_approved_date', 'p3_submission_date'),
+        'total_lead_days': ('p3_approved_date', 'p1_submission_date'),
+    },
+}
+
+NS_PER_DAY = 86400 * 10**9
+
+
+def duration_days(end, start):
+    """Vectorized (end - start) in days as float32; NaN where either date is missing."""
+    end_ns = end.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    start_ns = start.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    missing = end.isna().to_numpy() | start.isna().to_numpy()
+    days = (end_ns - start_ns) / NS_PER_DAY
+    days[missing] = np.nan
+    return days.astype(np.float32)
+
+
+def add_durations(df, dataset):
+    """Add every declared duration column of a dataset that its dates allow."""
+    for col, (end, start) in DURATION_FEATURES[dataset].items():
+        if end in df.columns and start in df.columns:
+            df[col] = duration_days(df[end], df[start])
+    return df
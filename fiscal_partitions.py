@@ -0,0 +1,229 @@
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from dataset_cache import read_csv_export, spec_signature, stored_signature, cache_is_fresh, write_cache
+
+# Application numbers start with the Nepali fiscal year they were filed in,
+# e.g. '81/82-13-100031425'. (The exports' own fiscal_year column is an id.)
+FISCAL_YEAR_PATTERN = r'^(\d{2}/\d{2})-'
+FISCAL_YEAR_COLUMN = 'fiscal_year_label'
+UNKNOWN_FISCAL_YEAR = 'unknown'
+
+# Environment variable limiting the analyses to some fiscal years,
+# e.g. FISCAL_YEARS=82/83 python deregistration_submission_to_approval.py
+FISCAL_YEARS_ENV = 'FISCAL_YEARS'
+
+# Per partitioned dataset: rows per export and fiscal year, with each
+# export's modification time (a newer export wins a record both contain)
+MANIFEST_FILE = '_manifest.parquet'
+
+# Column recording which export a partitioned record came from
+SOURCE_COLUMN = 'source_export'
+
+
+def get_fiscal_years():
+    """Fiscal years listed in $FISCAL_YEARS (comma separated), or None for all years."""
+    value = os.environ.get(FISCAL_YEARS_ENV)
+    if not value:
+        return None
+    return [year.strip() for year in value.split(',') if year.strip()]
+
+
+def fiscal_year_of(application_numbers):
+    """Fiscal year ('81/82') of every application number; UNKNOWN_FISCAL_YEAR when it has none."""
+    years = pd.Series(application_numbers).astype('string').str.extract(FISCAL_YEAR_PATTERN, expand=False)
+    return years.fillna(UNKNOWN_FISCAL_YEAR).astype(str)
+
+
+def partition_path(root, fiscal_year):
+    """Parquet file holding one fiscal year of a partitioned dataset."""
+    return os.path.join(root, f"fy_{fiscal_year.replace('/', '-')}.parquet")
+
+
+def partition_years(root):
+    """Fiscal years with a partition under root, oldest first ('unknown' last)."""
+    if not os.path.isdir(root):
+        return []
+    names = [name for name in os.listdir(root) if name.startswith('fy_') and name.endswith('.parquet')]
+    return sorted(name[len('fy_'):-len('.parquet')].replace('-', '/') for name in names)
+
+
+def partition_signature(dtypes, date_columns, prepare=None, prepare_spec=None):
+    """Signature of the spec every partition of a dataset is written with."""
+    return spec_signature('fiscal_partitions', sorted((k, str(v)) for k, v in dtypes.items()),
+                          list(date_columns), FISCAL_YEAR_PATTERN, SOURCE_COLUMN,
+                          getattr(prepare, '__qualname__', None), prepare_spec)
+
+
+def content_signature(df, signature):
+    """The spec signature plus a hash of the partition's rows."""
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return f'{signature}:{hashlib.md5(hashes.tobytes()).hexdigest()}'
+
+
+def write_partition(part, root, fiscal_year, signature):
+    """Write one fiscal year's records (deleting the file when there are none).
+
+    Returns whether the partition changed; one whose rows and spec are
+    unchanged is left untouched.
+    """
+    path = partition_path(root, fiscal_year)
+    if len(part) == 0:
+        if not os.path.exists(path):
+            return False
+        os.remove(path)
+        return True
+    part = part.reset_index(drop=True)
+    part_signature = content_signature(part, signature)
+    if os.path.exists(path) and stored_signature(path) == part_signature:
+        return False
+    write_cache(part, path, part_signature)
+    return True
+
+
+def read_manifest(root, signature=None):
+    """Rows per (source export, fiscal year) ingested under root, with the export's mtime.
+
+    Empty when there is none, or when signature is given and the manifest
+    was written with another spec.
+    """
+    path = os.path.join(root, MANIFEST_FILE)
+    if not os.path.exists(path) or (signature is not None and stored_signature(path) != signature):
+        return pd.DataFrame({'source': pd.Series(dtype=str), 'fiscal_year': pd.Series(dtype=str),
+                             'rows': pd.Series(dtype='int64'), 'exported': pd.Series(dtype='datetime64[ns]')})
+    return pd.read_parquet(path)
+
+
+def merge_partition(current, new, csv_path, exported, exported_at):
+    """One fiscal year's records after ingesting new rows from csv_path.
+
+    The export's earlier rows are replaced, rows of exports no longer in
+    the manifest are dropped, and a record (application_number) in both
+    comes from the export modified last. Rows are ordered by export mtime.
+    """
+    if current is None:
+        return new
+    current = current[(current[SOURCE_COLUMN] != csv_path) & current[SOURCE_COLUMN].isin(exported_at)]
+    newer = (current[SOURCE_COLUMN].map(exported_at) > exported).to_numpy()
+    in_new = current['application_number'].isin(new['application_number']).to_numpy()
+    new = new[~new['application_number'].isin(current.loc[newer, 'application_number'])]
+    parts = [part for part in [current[newer | ~in_new], new] if len(part)]
+    if not parts:
+        return new
+    # Exports oldest first, each in its own row order, whatever order they were ingested in
+    merged = pd.concat(parts, ignore_index=True)
+    order = np.argsort(merged[SOURCE_COLUMN].map(exported_at).to_numpy(dtype='datetime64[ns]'), kind='stable')
+    return merged.iloc[order]
+
+
+def ingest_export(csv_path, root, dtypes, date_columns, prepare=None, prepare_spec=None):
+    """Read one CSV export and merge its records into the fiscal-year partitions under root.
+
+    Use it to add a new (or partial) fiscal year's export next to the main
+    one. Records are merged on application_number, the export modified
+    last winning; an export's previous rows are replaced, and partitions
+    left without records are deleted. prepare and prepare_spec are as in
+    load_cached_csv. Returns the years rewritten.
+    """
+    signature = partition_signature(dtypes, date_columns, prepare, prepare_spec)
+    df = read_csv_export(csv_path, dtypes, date_columns)
+    if prepare is not None:
+        df = prepare(df)
+    df[FISCAL_YEAR_COLUMN] = fiscal_year_of(df['application_number']).to_numpy()
+    df[SOURCE_COLUMN] = csv_path
+    exported = pd.Timestamp(os.path.getmtime(csv_path), unit='s')
+
+    manifest = read_manifest(root, signature)
+    exported_at = manifest.groupby('source')['exported'].max().to_dict()
+    exported_at[csv_path] = exported
+
+    # Years the export covers now or covered before, and files no export covers
+    years = set(df[FISCAL_YEAR_COLUMN]) | set(manifest.loc[manifest['source'] == csv_path, 'fiscal_year'])
+    years |= set(partition_years(root)) - set(manifest['fiscal_year'])
+
+    os.makedirs(root, exist_ok=True)
+    written = []
+    counts = manifest[~manifest['fiscal_year'].isin(years)]
+    for fiscal_year in sorted(years):
+        path = partition_path(root, fiscal_year)
+        current = None
+        if os.path.exists(path) and (stored_signature(path) or '').split(':')[0] == signature:
+            current = pd.read_parquet(path)
+        part = merge_partition(current, df[df[FISCAL_YEAR_COLUMN] == fiscal_year], csv_path, exported,
+                               exported_at)
+        if write_partition(part, root, fiscal_year, signature):
+            written.append(fiscal_year)
+        rows = part[SOURCE_COLUMN].value_counts()
+        year_counts = pd.DataFrame({'source': rows.index.astype(str), 'fiscal_year': fiscal_year,
+                                    'rows': rows.to_numpy(dtype='int64'),
+                                    'exported': rows.index.map(exported_at).astype('datetime64[ns]')})
+        counts = pd.concat([frame for frame in [counts, year_counts] if len(frame)], ignore_index=True)
+
+    write_cache(counts.sort_values(['fiscal_year', 'source'], ignore_index=True),
+                os.path.join(root, MANIFEST_FILE), signature)
+    return written
+
+
+def read_partitions(root, fiscal_years=None, columns=None):
+    """Records of the given fiscal years (all when None), reading only their partition files."""
+    years = partition_years(root)
+    if not years:
+        return pd.DataFrame(columns=columns)
+    if fiscal_years is not None:
+        wanted = set(fiscal_years)
+        selected = [year for year in years if year in wanted]
+    else:
+        selected = years
+    if columns is not None:
+        available = pq.read_schema(partition_path(root, years[0])).names
+        columns = [col for col in columns if col in available]
+    if not selected:
+        return pd.read_parquet(partition_path(root, years[0]), columns=columns).iloc[0:0]
+    frames = [pd.read_parquet(partition_path(root, year), columns=columns) for year in selected]
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_partitioned(csv_path, root, dtypes, date_columns, fiscal_years=None, columns=None,
+                     refresh=False, prepare=None, prepare_spec=None):
+    """Records of the given fiscal years from a dataset partitioned by fiscal year.
+
+    The partitions are written from csv_path when they are missing, older
+    than the CSV or built with another spec (unchanged years are not
+    rewritten). Category columns are restored after the partitions are joined.
+    """
+    signature = partition_signature(dtypes, date_columns, prepare, prepare_spec)
+    manifest_path = os.path.join(root, MANIFEST_FILE)
+    if refresh or not cache_is_fresh(csv_path, manifest_path, signature) or \
+            csv_path not in set(read_manifest(root)['source']):
+        ingest_export(csv_path, root, dtypes, date_columns, prepare, prepare_spec)
+
+    df = read_partitions(root, fiscal_years, columns)
+    for col, dtype in dtypes.items():
+        if dtype == 'category' and col in df.columns:
+            df[col] = df[col].astype('category')
+    for col in [FISCAL_YEAR_COLUMN, SOURCE_COLUMN]:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+if __name__ == "__main__":
+    from deregistration_data import (DEREGISTRATION_CSV, DEREGISTRATION_PARTITIONS, DEREGISTRATION_DTYPES,
+                                     DEREGISTRATION_DATE_COLUMNS, DEREGISTRATION_PREPARE_SPEC,
+                                     prepare_deregistration)
+    from discounted_deregistration_data import (DISCOUNTED_PHASE_FILES, DISCOUNTED_PHASE_PARTITIONS,
+                                                DISCOUNTED_DTYPES, DISCOUNTED_DATE_COLUMNS,
+                                                DISCOUNTED_PREPARE_SPEC, prepare_discounted)
+
+    datasets = [(DEREGISTRATION_CSV, DEREGISTRATION_PARTITIONS, DEREGISTRATION_DTYPES,
+                 DEREGISTRATION_DATE_COLUMNS, prepare_deregistration, DEREGISTRATION_PREPARE_SPEC)]
+    datasets += [(DISCOUNTED_PHASE_FILES[phase][0], DISCOUNTED_PHASE_PARTITIONS[phase], DISCOUNTED_DTYPES,
+                  DISCOUNTED_DATE_COLUMNS, prepare_discounted, DISCOUNTED_PREPARE_SPEC)
+                 for phase in DISCOUNTED_PHASE_PARTITIONS]
+    for csv_path, root, dtypes, date_columns, prepare, prepare_spec in datasets:
+        written = ingest_export(csv_path, root, dtypes, date_columns, prepare, prepare_spec)
+        print(f"{root}: rewrote {', '.join(written) or 'no partitions'}")
+        print(read_manifest(root).to_string(index=False))
+        print()
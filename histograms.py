@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+
+# Percentiles annotated on the distribution figures
+HIST_PERCENTILES = [50, 75, 90, 95, 99]
+
+# Everything a distribution subplot draws, computed once per series so the
+# figures never touch the raw rows.
+#   counts, edges -> np.histogram of the non-null values
+#   percentiles   -> {pct: value} for HIST_PERCENTILES
+Histogram = namedtuple('Histogram', ['counts', 'edges', 'n', 'mean', 'median', 'std',
+                                     'min', 'max', 'percentiles'])
+
+
+def compute_histogram(values, bins=50):
+    """Histogram and summary statistics of one series (NaN dropped), or None when empty."""
+    valid = pd.Series(values).dropna()
+    if len(valid) == 0:
+        return None
+    data = valid.to_numpy()
+    counts, edges = np.histogram(data, bins=bins)
+    return Histogram(counts, edges, len(valid), valid.mean(), valid.median(), valid.std(),
+                     valid.min(), valid.max(),
+                     dict(zip(HIST_PERCENTILES, np.percentile(data, HIST_PERCENTILES))))
+
+
+def series_histograms(df, columns, bins=50):
+    """{column: Histogram} for every column of df with data, computed once up front."""
+    hists = {}
+    for col in columns:
+        if col in df.columns and col not in hists:
+            hist = compute_histogram(df[col], bins)
+            if hist is not None:
+                hists[col] = hist
+    return hists
+
+
+def draw_histogram(ax, hist, **kwargs):
+    """Draw precomputed counts as touching bars (what ax.hist draws); returns the bars."""
+    return ax.bar(hist.edges[:-1], hist.counts, width=np.diff(hist.edges), align='edge', **kwargs)
+
+
+if __name__ == "__main__":
+    from company_registration_data import load_company_registration
+    from feature_store import DURATION_FEATURES
+
+    df = load_company_registration()
+    hists = series_histograms(df, DURATION_FEATURES['company_registration'])
+    for col, hist in hists.items():
+        print(f"{col:<35} n={hist.n:>10,} bins={len(hist.counts):>3} "
+              f"peak={hist.counts.max():>8,} median={hist.median:>8.1f}")
@@ -1,49 +1,58 @@
 import pandas as pd
 import numpy as np
+from name_registration_data import load_name_registration
+from date_rules import DATE_RULES, date_rule_mask, rule_flags, rule_summary
 
 # Load the data
-df_name = pd.read_csv('nameregisvation.csv', low_memory=False)
+df_name = load_name_registration()
 
-# Convert date columns to datetime
-df_name['created_date'] = pd.to_datetime(df_name['created_date'], errors='coerce')
-df_name['updated_date'] = pd.to_datetime(df_name['updated_date'], errors='coerce')
-df_name['approved_date'] = pd.to_datetime(df_name['approved_date'], errors='coerce')
+# Evaluate every date rule once; patterns below are read from the bitmask
+name_rules = DATE_RULES['name_registration']
+rule_mask = date_rule_mask(df_name, 'name_registration')
 
 print("="*80)
 print("DATE RELATIONSHIP ANALYSIS")
 print("="*80)
 
 # Filter only records with all three dates
-complete_records = df_name[
-    df_name['created_date'].notna() &
-    df_name['updated_date'].notna() &
-    df_name['approved_date'].notna()
-].copy()
+complete = (df_name['created_date'].notna() &
+            df_name['updated_date'].notna() &
+            df_name['approved_date'].notna()).to_numpy()
+complete_records = df_name[complete].copy()
+complete_mask = rule_mask[complete]
+flagged = {rule.name: rule_flags(complete_mask, name_rules, rule.name) for rule in name_rules}
 
 print(f"\nRecords with all three dates: {len(complete_records):,}")
 
+# Every rule over the full dataset, from the same bitmask
+print("\n" + "-"*80)
+print("DATE RULE SUMMARY (ALL RECORDS)")
+print("-"*80)
+print(f"Records flagged by at least one rule: {(rule_mask != 0).sum():,} of {len(df_name):,}")
+print(rule_summary(rule_mask, name_rules).to_string(index=False, float_format='%.1f'))
+
 # Check date ordering patterns
 print("\n" + "-"*80)
 print("DATE ORDERING PATTERNS")
 print("-"*80)
 
 # Pattern 1: approved_date is BEFORE updated_date
-pattern1 = complete_records[complete_records['approved_date'] < complete_records['updated_date']]
+pattern1 = complete_records[flagged['approved_before_updated']]
 print(f"\n1. Approved BEFORE Updated: {len(pattern1):,} ({len(pattern1)/len(complete_records)*100:.1f}%)")
 print("   → Applications are approved, then updated later")
 
 # Pattern 2: approved_date is AFTER updated_date
-pattern2 = complete_records[complete_records['approved_date'] > complete_records['updated_date']]
+pattern2 = complete_records[flagged['updated_before_approved']]
 print(f"\n2. Approved AFTER Updated: {len(pattern2):,} ({len(pattern2)/len(complete_records)*100:.1f}%)")
 print("   → Applications are updated, then approved")
 
 # Pattern 3: approved_date equals updated_date
-pattern3 = complete_records[complete_records['approved_date'] == complete_records['updated_date']]
+pattern3 = complete_records[flagged['approved_same_as_updated']]
 print(f"\n3. Approved SAME AS Updated: {len(pattern3):,} ({len(pattern3)/len(complete_records)*100:.1f}%)")
 print("   → Approval happens at the same time as last update")
 
 # Pattern 4: created_date equals updated_date
-pattern4 = complete_records[complete_records['created_date'] == complete_records['updated_date']]
+pattern4 = complete_records[flagged['created_same_as_updated']]
 print(f"\n4. Created SAME AS Updated: {len(pattern4):,} ({len(pattern4)/len(complete_records)*100:.1f}%)")
 print("   → Never updated after creation")
 
@@ -52,28 +61,17 @@ print("EXPECTED CHRONOLOGICAL ORDER")
 print("-"*80)
 
 # Check expected order: created <= approved <= updated
-expected_order = complete_records[
-    (complete_records['created_date'] <= complete_records['approved_date']) &
-    (complete_records['approved_date'] <= complete_records['updated_date'])
-]
+in_expected_order = ~flagged['approved_before_created'] & ~flagged['updated_before_approved']
+expected_order = complete_records[in_expected_order]
 print(f"\nCreated → Approved → Updated: {len(expected_order):,} ({len(expected_order)/len(complete_records)*100:.1f}%)")
 
 # Check alternative order: created <= updated <= approved
-alt_order = complete_records[
-    (complete_records['created_date'] <= complete_records['updated_date']) &
-    (complete_records['updated_date'] <= complete_records['approved_date'])
-]
+in_alt_order = ~flagged['updated_before_created'] & ~flagged['approved_before_updated']
+alt_order = complete_records[in_alt_order]
 print(f"Created → Updated → Approved: {len(alt_order):,} ({len(alt_order)/len(complete_records)*100:.1f}%)")
 
 # Other patterns
-other = complete_records[
-    ~(
-        ((complete_records['created_date'] <= complete_records['approved_date']) &
-         (complete_records['approved_date'] <= complete_records['updated_date'])) |
-        ((complete_records['created_date'] <= complete_records['updated_date']) &
-         (complete_records['updated_date'] <= complete_records['approved_date']))
-    )
-]
+other = complete_records[~(in_expected_order | in_alt_order)]
 print(f"Other patterns: {len(other):,} ({len(other)/len(complete_records)*100:.1f}%)")
 
 print("\n" + "-"*80)
@@ -83,24 +81,24 @@ print("-"*80)
 # Show examples of each pattern
 print("\n✓ Pattern: Created → Approved → Updated (Post-approval updates)")
 print("   This means records continue to be modified AFTER approval\n")
-sample1 = pattern1[['application_number', 'company_name_english', 'status',
-                     'created_date', 'approved_date', 'updated_date']].head(5)
-for idx, row in sample1.iterrows():
-    print(f"   {row['application_number']}: {row['company_name_english'][:30]}")
-    print(f"   ├─ Created:  {row['created_date']}")
-    print(f"   ├─ Approved: {row['approved_date']} (after {(row['approved_date'] - row['created_date']).days} days)")
-    print(f"   └─ Updated:  {row['updated_date']} (after approval: {(row['updated_date'] - row['approved_date']).days} days)")
+sample1 = pattern1[['application_number', 'company_name_english',
+                     'created_date', 'approved_date', 'updated_date']].head(5).copy()
+sample1['company_name_english'] = sample1['company_name_english'].str[:30]
+sample1['days_to_approval'] = (sample1['approved_date'] - sample1['created_date']).dt.days
+sample1['days_approval_to_update'] = (sample1['updated_date'] - sample1['approved_date']).dt.days
+if len(sample1) > 0:
+    print(sample1.to_string(index=False))
     print()
 
 print("\n✓ Pattern: Created → Updated → Approved (Traditional workflow)")
 print("   This means records are finalized before approval\n")
-sample2 = alt_order[['application_number', 'company_name_english', 'status',
-                      'created_date', 'updated_date', 'approved_date']].head(5)
-for idx, row in sample2.iterrows():
-    print(f"   {row['application_number']}: {row['company_name_english'][:30]}")
-    print(f"   ├─ Created:  {row['created_date']}")
-    print(f"   ├─ Updated:  {row['updated_date']} (after {(row['updated_date'] - row['created_date']).days} days)")
-    print(f"   └─ Approved: {row['approved_date']} (after update: {(row['approved_date'] - row['updated_date']).days} days)")
+sample2 = alt_order[['application_number', 'company_name_english',
+                      'created_date', 'updated_date', 'approved_date']].head(5).copy()
+sample2['company_name_english'] = sample2['company_name_english'].str[:30]
+sample2['days_to_update'] = (sample2['updated_date'] - sample2['created_date']).dt.days
+sample2['days_update_to_approval'] = (sample2['approved_date'] - sample2['updated_date']).dt.days
+if len(sample2) > 0:
+    print(sample2.to_string(index=False))
     print()
 
 print("\n" + "="*80)
@@ -1,6 +1,6 @@
-import pandas as pd
+from name_registration_data import load_name_registration
 
-df_name = pd.read_csv('nameregisvation.csv')
+df_name = load_name_registration()
 
 if __name__ == "__main__":
 
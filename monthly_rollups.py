@@ -0,0 +1,162 @@
+import os
+import numpy as np
+import pandas as pd
+from dataset_cache import spec_signature, stored_signature, stored_metadata, write_cache
+from feature_store import DURATION_FEATURES
+from time_bins import PERIOD_BINS, assign_bins
+
+# Materialized monthly aggregates, one parquet file per dataset. A row holds,
+# for one month (of date_column), one duration feature and one period bin,
+# the number of records and the sum of their durations. Bin -1 counts the
+# records whose duration is missing, so every feature adds up to the month's
+# full volume.
+ROLLUP_COLUMNS = ['month', 'feature', 'bin', 'count', 'sum_days']
+
+# Metadata key holding the latest updated_date a rollup was built from.
+# Records change after their month (durations fill in when an approval
+# arrives), so a month with a record updated after it is aggregated again.
+WATERMARK_KEY = 'rollup_watermark'
+UPDATED_COLUMN = 'updated_date'
+
+
+def rollup_path(dataset):
+    """Parquet file holding a dataset's monthly rollup."""
+    return f'{dataset}_monthly.parquet'
+
+
+def rollup_signature(dataset, date_column, scheme):
+    """Spec a rollup is built from; a stored rollup with another spec is rebuilt."""
+    return spec_signature(dataset, date_column, sorted(DURATION_FEATURES[dataset]),
+                          scheme.name, scheme.version)
+
+
+def build_rollup(df, dataset, date_column='created_date', scheme=PERIOD_BINS):
+    """Aggregate records into (month, feature, bin) counts and duration sums."""
+    dated = df[df[date_column].notna()]
+    month = dated[date_column].to_numpy().astype('datetime64[M]').astype('datetime64[ns]')
+
+    frames = []
+    for feature in DURATION_FEATURES[dataset]:
+        if feature not in dated.columns:
+            continue
+        days = dated[feature].to_numpy(dtype=np.float64)
+        part = pd.DataFrame({
+            'month': month,
+            'feature': feature,
+            'bin': assign_bins(days, scheme).astype(np.int8),
+            'sum_days': np.nan_to_num(days),
+        })
+        frames.append(part.groupby(['month', 'feature', 'bin'], as_index=False)
+                      .agg(count=('sum_days', 'size'), sum_days=('sum_days', 'sum')))
+
+    if not frames:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[ROLLUP_COLUMNS]
+
+
+def update_rollup(df, dataset, date_column='created_date', scheme=PERIOD_BINS, path=None,
+                  refresh=False):
+    """Bring a dataset's monthly rollup up to date and return it.
+
+    Stored months are kept unless they may have changed: a month is
+    aggregated again from df when one of its records was updated after
+    the rollup's watermark (the latest updated_date it was built from),
+    when its record count differs from the stored one, or when it is the
+    last stored month or newer. A rollup stored with other features or
+    another bin scheme, or a df without updated_date, is rebuilt from
+    scratch, as with refresh=True.
+    """
+    path = path or rollup_path(dataset)
+    signature = rollup_signature(dataset, date_column, scheme)
+
+    stored = None
+    watermark = None
+    if not refresh and UPDATED_COLUMN in df.columns and os.path.exists(path) and \
+            stored_signature(path) == signature:
+        stored = pd.read_parquet(path)
+        watermark = stored_metadata(path, WATERMARK_KEY)
+
+    dated = df[df[date_column].notna()]
+    months = dated[date_column].to_numpy().astype('datetime64[M]').astype('datetime64[ns]')
+
+    if stored is None or stored.empty or watermark is None:
+        rollup = build_rollup(df, dataset, date_column, scheme)
+    else:
+        # Months to aggregate again
+        stored_counts = stored[stored['feature'] == stored['feature'].iloc[0]].groupby('month')['count'].sum()
+        current_counts = pd.Series(1, index=months).groupby(level=0).sum()
+        counts = pd.concat([stored_counts.rename('stored'), current_counts.rename('current')], axis=1)
+        changed = counts.index[counts['stored'].ne(counts['current'])]
+        updated = months[(dated[UPDATED_COLUMN] > pd.Timestamp(watermark)).to_numpy(dtype=bool, na_value=False)]
+        dirty = pd.Index(changed).union(pd.Index(np.unique(updated)))
+        dirty = dirty.union(counts.index[counts.index >= stored['month'].max()])
+
+        kept = stored[~stored['month'].isin(dirty)]
+        fresh = build_rollup(dated[np.isin(months, dirty.to_numpy(dtype='datetime64[ns]'))], dataset,
+                             date_column, scheme)
+        rollup = pd.concat([part for part in [kept, fresh] if len(part)], ignore_index=True)
+        rollup = rollup.sort_values(['month', 'feature', 'bin'], ignore_index=True)[ROLLUP_COLUMNS]
+
+    extra = None
+    if UPDATED_COLUMN in df.columns and df[UPDATED_COLUMN].notna().any():
+        extra = {WATERMARK_KEY: df[UPDATED_COLUMN].max().isoformat()}
+    write_cache(rollup, path, signature, extra)
+    return rollup
+
+
+def _binned(rollup, feature):
+    """Rollup rows of one feature that have a duration."""
+    return rollup[(rollup['feature'] == feature) & (rollup['bin'] >= 0)]
+
+
+def monthly_counts(rollup):
+    """Records per month (PeriodIndex); empty for an empty rollup."""
+    if rollup.empty:
+        return pd.Series(dtype='int64', index=pd.PeriodIndex([], freq='M'))
+    first_feature = rollup['feature'].iloc[0]
+    counts = rollup[rollup['feature'] == first_feature].groupby('month')['count'].sum()
+    counts.index = counts.index.to_period('M')
+    return counts
+
+
+def monthly_mean(rollup, feature):
+    """Mean duration (days) per month for one feature (PeriodIndex)."""
+    sums = _binned(rollup, feature).groupby('month')[['count', 'sum_days']].sum()
+    mean = sums['sum_days'] / sums['count']
+    mean.index = mean.index.to_period('M')
+    return mean
+
+
+def monthly_bin_counts(rollup, feature, scheme=PERIOD_BINS):
+    """Month x bin label record counts for one feature."""
+    pivot = _binned(rollup, feature).pivot_table(index='month', columns='bin', values='count',
+                                                 aggfunc='sum', fill_value=0)
+    pivot = pivot.reindex(columns=range(len(scheme.labels)), fill_value=0)
+    pivot.columns = scheme.labels
+    pivot.index = pivot.index.to_period('M')
+    return pivot
+
+
+def recent_vs_overall(rollup, feature, months=3):
+    """Mean duration over the last `months` months with data, and over all months."""
+    rows = _binned(rollup, feature)
+    if rows.empty:
+        return np.nan, np.nan
+    recent_months = np.sort(rows['month'].unique())[-months:]
+    recent = rows[rows['month'].isin(recent_months)]
+    recent_avg = recent['sum_days'].sum() / recent['count'].sum()
+    overall_avg = rows['sum_days'].sum() / rows['count'].sum()
+    return recent_avg, overall_avg
+
+
+if __name__ == "__main__":
+    from name_registration_data import load_name_registration
+    from company_registration_data import load_company_registration
+
+    for dataset, loader in [('name_registration', load_name_registration),
+                            ('company_registration', load_company_registration)]:
+        print(f"Updating {rollup_path(dataset)}...")
+        rollup = update_rollup(loader(), dataset)
+        counts = monthly_counts(rollup)
+        print(f"  Months: {len(counts)} ({counts.index.min()} to {counts.index.max()})")
+        print(f"  Records: {counts.sum():,}")
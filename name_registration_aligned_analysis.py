@@ -3,6 +3,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
+from name_registration_data import load_name_registration
+from company_registration_data import load_company_registration
+from time_bins import PERIOD_BINS, cut, distribution
+from registration_linkage import link_name_reservations
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -15,8 +19,7 @@ print("="*80)
 
 # Load company registration data to get earliest date
 print("\n1. Loading company registration data...")
-df_company = pd.read_csv('companyregistrationnewsystem.csv', low_memory=False)
-df_company['created_date'] = pd.to_datetime(df_company['created_date'], errors='coerce')
+df_company = load_company_registration()
 
 earliest_company_date = df_company['created_date'].min()
 latest_company_date = df_company['created_date'].max()
@@ -28,12 +31,7 @@ print(f"   - Total records: {len(df_company):,}")
 
 # Load name reservation data
 print("\n2. Loading name registration data...")
-df_name = pd.read_csv('nameregisvation.csv', low_memory=False)
-
-# Convert dates
-df_name['created_date'] = pd.to_datetime(df_name['created_date'], errors='coerce')
-df_name['approved_date'] = pd.to_datetime(df_name['approved_date'], errors='coerce')
-df_name['updated_date'] = pd.to_datetime(df_name['updated_date'], errors='coerce')
+df_name = load_name_registration()
 
 print(f"   Name Registration Full Date Range:")
 print(f"   - Earliest: {df_name['created_date'].min()}")
@@ -59,8 +57,8 @@ for status, count in status_dist.items():
     pct = (count / len(df_name_filtered)) * 100
     print(f"   - {status}: {count:,} ({pct:.1f}%)")
 
-# Calculate processing time
-df_name_filtered['processing_days'] = (df_name_filtered['approved_date'] - df_name_filtered['created_date']).dt.total_seconds() / 86400
+# Processing time (created to approved) from the feature store
+df_name_filtered['processing_days'] = df_name_filtered['created_to_approved_days']
 
 # Separate approved and rejected
 approved = df_name_filtered[(df_name_filtered['status'] == 'APPROVED') &
@@ -81,13 +79,11 @@ print("\n" + "="*80)
 print("TIME PERIOD DISTRIBUTION ANALYSIS (ALIGNED DATE RANGE)")
 print("="*80)
 
-# Define time bins
-bins = [-np.inf, 0, 1, 3, 7, 14, 30, 60, 90, 180, 365, np.inf]
-labels = ['Same day', '1 day', '2-3 days', '4-7 days', '1-2 weeks',
-          '2-4 weeks', '1-2 months', '2-3 months', '3-6 months', '6-12 months', '1+ year']
+# Time bins (shared period scheme)
+labels = PERIOD_BINS.labels
 
-approved['time_bin'] = pd.cut(approved['processing_days'], bins=bins, labels=labels)
-rejected['time_bin'] = pd.cut(rejected['processing_days'], bins=bins, labels=labels)
+approved['time_bin'] = cut(approved['processing_days'], PERIOD_BINS)
+rejected['time_bin'] = cut(rejected['processing_days'], PERIOD_BINS)
 
 # Print distributions
 print("\nAPPROVED - Time Distribution:")
@@ -285,8 +281,7 @@ plt.close()
 # ============================================================================
 
 # Calculate company registration stats for comparison
-df_company['approved_date'] = pd.to_datetime(df_company['approved_date'], errors='coerce')
-df_company['processing_days'] = (df_company['approved_date'] - df_company['created_date']).dt.total_seconds() / 86400
+df_company['processing_days'] = df_company['created_to_approved_days']
 company_valid = df_company['processing_days'].dropna()
 
 fig, axes = plt.subplots(2, 2, figsize=(22, 14))
@@ -464,6 +459,41 @@ summary_df = pd.DataFrame(summary_data)
 summary_df.to_csv('aligned_comparison_summary.csv', index=False)
 print("✓ Saved: aligned_comparison_summary.csv")
 
+# ============================================================================
+# END-TO-END LEAD TIME (NAME RESERVATION -> REGISTERED COMPANY)
+# ============================================================================
+
+print("\n" + "="*80)
+print("END-TO-END LEAD TIME: NAME RESERVATION TO REGISTERED COMPANY")
+print("="*80)
+
+# Each company registration is matched to the reservation of its name (full
+# name dataset, so reservations made before the aligned range still count)
+df_linked = link_name_reservations(df_company, df_name)
+linked = df_linked[df_linked['name_application_number'].notna()]
+lead_days = linked['name_created_to_registration_days'].dropna()
+link_rate = (len(linked) / len(df_linked)) * 100 if len(df_linked) > 0 else 0
+
+print(f"\nCompany registrations linked to a name reservation: {len(linked):,} of {len(df_linked):,} ({link_rate:.1f}%)")
+print(f"  - Company created within the reservation validity: {linked['within_reservation'].sum():,}")
+print(f"  - Mean name approval -> company created: {linked['name_approved_to_created_days'].mean():.1f} days")
+print(f"\nName reservation created -> company registered ({len(lead_days):,} records):")
+print(f"  - Mean: {lead_days.mean():.1f} days")
+print(f"  - Median: {lead_days.median():.1f} days")
+print(f"  - 90th percentile: {lead_days.quantile(0.90):.1f} days")
+
+lead_counts, lead_pcts = distribution(lead_days, PERIOD_BINS)
+print(f"\n{'Time Period':<15} {'Count':>10} {'Percentage':>12}")
+print("-" * 40)
+for label, count, pct in zip(labels, lead_counts, lead_pcts):
+    print(f"{label:<15} {count:>10,} {pct:>11.1f}%")
+
+lead_columns = ['application_number', 'company_name_english', 'name_application_number',
+                'name_created_date', 'name_approved_date', 'created_date', 'registration_date',
+                'within_reservation', 'name_approved_to_created_days', 'name_created_to_registration_days']
+linked[[col for col in lead_columns if col in linked.columns]].to_csv('name_to_company_lead_times.csv', index=False)
+print("\n✓ Saved: name_to_company_lead_times.csv")
+
 print("\n" + "="*80)
 print("KEY INSIGHTS (ALIGNED DATE RANGE)")
 print("="*80)
@@ -510,6 +540,7 @@ FILES GENERATED:
   ✓ name_vs_company_registration_comparison.png
   ✓ name_registration_aligned_distribution.csv
   ✓ aligned_comparison_summary.csv
+  ✓ name_to_company_lead_times.csv
 """)
 
 print("="*80)
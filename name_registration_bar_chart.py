@@ -1,8 +1,10 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
+from name_registration_data import load_name_registration
+from company_registration_data import load_company_registration
+from time_bins import PERIOD_BINS, cut
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -11,20 +13,18 @@ sns.set_style("whitegrid")
 print("Loading data...")
 
 # Load company registration to get date range
-df_company = pd.read_csv('companyregistrationnewsystem.csv', low_memory=False)
-df_company['created_date'] = pd.to_datetime(df_company['created_date'], errors='coerce')
+df_company = load_company_registration(columns=['created_date'])
 earliest_company_date = df_company['created_date'].min()
 
 # Load and filter name registration data
-df_name = pd.read_csv('nameregisvation.csv', low_memory=False)
-df_name['created_date'] = pd.to_datetime(df_name['created_date'], errors='coerce')
-df_name['approved_date'] = pd.to_datetime(df_name['approved_date'], errors='coerce')
+df_name = load_name_registration(columns=['created_date', 'approved_date', 'status',
+                                          'created_to_approved_days'])
 
 # Filter to aligned date range
 df_name_filtered = df_name[df_name['created_date'] >= earliest_company_date].copy()
 
-# Calculate processing time
-df_name_filtered['processing_days'] = (df_name_filtered['approved_date'] - df_name_filtered['created_date']).dt.total_seconds() / 86400
+# Processing time (created to approved) from the feature store
+df_name_filtered['processing_days'] = df_name_filtered['created_to_approved_days']
 
 # Separate approved and rejected
 approved = df_name_filtered[(df_name_filtered['status'] == 'APPROVED') &
@@ -35,13 +35,11 @@ rejected = df_name_filtered[(df_name_filtered['status'] == 'REJECTED') &
 print(f"Approved records: {len(approved):,}")
 print(f"Rejected records: {len(rejected):,}")
 
-# Define time bins
-bins = [-np.inf, 0, 1, 3, 7, 14, 30, 60, 90, 180, 365, np.inf]
-labels = ['Same day', '1 day', '2-3 days', '4-7 days', '1-2 weeks',
-          '2-4 weeks', '1-2 months', '2-3 months', '3-6 months', '6-12 months', '1+ year']
+# Time bins (shared period scheme)
+labels = PERIOD_BINS.labels
 
-approved['time_bin'] = pd.cut(approved['processing_days'], bins=bins, labels=labels)
-rejected['time_bin'] = pd.cut(rejected['processing_days'], bins=bins, labels=labels)
+approved['time_bin'] = cut(approved['processing_days'], PERIOD_BINS)
+rejected['time_bin'] = cut(rejected['processing_days'], PERIOD_BINS)
 
 approved_total = len(approved)
 rejected_total = len(rejected)
@@ -0,0 +1,44 @@
+from dataset_cache import load_cached_csv
+from feature_store import DURATION_FEATURES, add_durations
+
+NAME_REGISTRATION_CSV = 'nameregisvation.csv'
+NAME_REGISTRATION_CACHE = 'nameregisvation.parquet'
+
+# Date columns parsed once at load time
+NAME_DATE_COLUMNS = ['created_date', 'updated_date', 'approved_date', 'submission_date', 'expire_date']
+
+# Every other column the name-registration scripts use, with a fixed dtype
+NAME_DTYPES = {
+    'application_number': 'str',
+    'company_name_english': 'str',
+    'status': 'category',
+    'company_type_id': 'Int16',
+    'is_group_company': 'boolean',
+    'master_company_category': 'category',
+    'latest_remarks': 'str',
+}
+
+
+def add_name_durations(df):
+    """Add the name_registration duration features (float32 days)."""
+    return add_durations(df, 'name_registration')
+
+
+def load_name_registration(columns=None, refresh=False):
+    """Name reservation records with parsed dates, compact dtypes and duration features.
+
+    The CSV is parsed once and cached as parquet next to it; later calls
+    read the cache until the CSV changes. Pass refresh=True to force a reload.
+    """
+    return load_cached_csv(NAME_REGISTRATION_CSV, NAME_REGISTRATION_CACHE,
+                           NAME_DTYPES, NAME_DATE_COLUMNS, columns=columns, refresh=refresh,
+                           prepare=add_name_durations,
+                           prepare_spec=DURATION_FEATURES['name_registration'])
+
+
+if __name__ == "__main__":
+    print("Building name registration cache...")
+    df_name = load_name_registration(refresh=True)
+    print(f"  Records: {len(df_name):,}")
+    print(df_name.dtypes)
+    print(f"  Memory: {df_name.memory_usage(deep=True).sum() / 1024**2:.1f} MB")
@@ -1,8 +1,9 @@
-import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
+from name_registration_data import load_name_registration
+from company_registration_data import load_company_registration
+from histograms import compute_histogram, draw_histogram
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -11,20 +12,18 @@ sns.set_style("whitegrid")
 print("Loading data...")
 
 # Load company registration to get date range
-df_company = pd.read_csv('companyregistrationnewsystem.csv', low_memory=False)
-df_company['created_date'] = pd.to_datetime(df_company['created_date'], errors='coerce')
+df_company = load_company_registration(columns=['created_date'])
 earliest_company_date = df_company['created_date'].min()
 
 # Load and filter name registration data
-df_name = pd.read_csv('nameregisvation.csv', low_memory=False)
-df_name['created_date'] = pd.to_datetime(df_name['created_date'], errors='coerce')
-df_name['approved_date'] = pd.to_datetime(df_name['approved_date'], errors='coerce')
+df_name = load_name_registration(columns=['created_date', 'approved_date', 'status',
+                                          'created_to_approved_days'])
 
 # Filter to aligned date range
 df_name_filtered = df_name[df_name['created_date'] >= earliest_company_date].copy()
 
-# Calculate processing time
-df_name_filtered['processing_days'] = (df_name_filtered['approved_date'] - df_name_filtered['created_date']).dt.total_seconds() / 86400
+# Processing time (created to approved) from the feature store
+df_name_filtered['processing_days'] = df_name_filtered['created_to_approved_days']
 
 # Separate approved and rejected
 approved = df_name_filtered[(df_name_filtered['status'] == 'APPROVED') &
@@ -35,6 +34,13 @@ rejected = df_name_filtered[(df_name_filtered['status'] == 'REJECTED') &
 print(f"Approved records: {len(approved):,}")
 print(f"Rejected records: {len(rejected):,}")
 
+# Bin counts and statistics, computed once per series: 50 bins for the
+# side-by-side figure, 60 for the overlay
+approved_hist = compute_histogram(approved['processing_days'], bins=50)
+rejected_hist = compute_histogram(rejected['processing_days'], bins=50)
+approved_overlay = compute_histogram(approved['processing_days'], bins=60)
+rejected_overlay = compute_histogram(rejected['processing_days'], bins=60)
+
 # ============================================================================
 # VISUALIZATION: Histogram-based Time Period Distribution
 # ============================================================================
@@ -45,12 +51,11 @@ fig.suptitle(f'Name Registration - Time Period Distribution (Aligned Date Range)
 
 # 1. APPROVED Histogram
 ax1 = axes[0]
-counts, bin_edges, patches = ax1.hist(approved['processing_days'], bins=50,
-                                       edgecolor='black', alpha=0.75, color='#2ecc71', linewidth=1.5)
+draw_histogram(ax1, approved_hist, edgecolor='black', alpha=0.75, color='#2ecc71', linewidth=1.5)
 
-# Calculate statistics
-mean_val = approved['processing_days'].mean()
-median_val = approved['processing_days'].median()
+# Precomputed statistics
+mean_val = approved_hist.mean
+median_val = approved_hist.median
 
 # Add mean and median lines
 ax1.axvline(mean_val, color='#e74c3c', linestyle='--', linewidth=3,
@@ -60,11 +65,11 @@ ax1.axvline(median_val, color='#3498db', linestyle='--', linewidth=3,
 
 # Add percentile annotations
 percentiles = [50, 75, 90, 95, 99]
-y_max = counts.max()
+y_max = approved_hist.counts.max()
 colors_percentile = ['#3498db', '#9b59b6', '#f39c12', '#e67e22', '#c0392b']
 
 for i, (pct, color) in enumerate(zip(percentiles, colors_percentile)):
-    val = np.percentile(approved['processing_days'], pct)
+    val = approved_hist.percentiles[pct]
     ax1.axvline(val, color=color, linestyle=':', linewidth=2, alpha=0.6)
 
     # Position labels to avoid overlap
@@ -103,12 +108,11 @@ ax1.text(0.98, 0.58, stats_text, transform=ax1.transAxes, fontsize=10,
 
 # 2. REJECTED Histogram
 ax2 = axes[1]
-counts, bin_edges, patches = ax2.hist(rejected['processing_days'], bins=50,
-                                       edgecolor='black', alpha=0.75, color='#e74c3c', linewidth=1.5)
+draw_histogram(ax2, rejected_hist, edgecolor='black', alpha=0.75, color='#e74c3c', linewidth=1.5)
 
-# Calculate statistics
-mean_val = rejected['processing_days'].mean()
-median_val = rejected['processing_days'].median()
+# Precomputed statistics
+mean_val = rejected_hist.mean
+median_val = rejected_hist.median
 
 # Add mean and median lines
 ax2.axvline(mean_val, color='#c0392b', linestyle='--', linewidth=3,
@@ -117,9 +121,9 @@ ax2.axvline(median_val, color='#3498db', linestyle='--', linewidth=3,
             label=f'Median: {median_val:.1f} days', zorder=5)
 
 # Add percentile annotations
-y_max = counts.max()
+y_max = rejected_hist.counts.max()
 for i, (pct, color) in enumerate(zip(percentiles, colors_percentile)):
-    val = np.percentile(rejected['processing_days'], pct)
+    val = rejected_hist.percentiles[pct]
     ax2.axvline(val, color=color, linestyle=':', linewidth=2, alpha=0.6)
 
     # Position labels to avoid overlap
@@ -175,14 +179,14 @@ plt.close()
 fig, ax = plt.subplots(1, 1, figsize=(20, 12))
 
 # Plot both distributions with transparency
-ax.hist(approved['processing_days'], bins=60, alpha=0.6, color='#2ecc71',
-        edgecolor='black', linewidth=1, label=f'Approved (n={len(approved):,})')
-ax.hist(rejected['processing_days'], bins=60, alpha=0.6, color='#e74c3c',
-        edgecolor='black', linewidth=1, label=f'Rejected (n={len(rejected):,})')
+draw_histogram(ax, approved_overlay, alpha=0.6, color='#2ecc71',
+               edgecolor='black', linewidth=1, label=f'Approved (n={len(approved):,})')
+draw_histogram(ax, rejected_overlay, alpha=0.6, color='#e74c3c',
+               edgecolor='black', linewidth=1, label=f'Rejected (n={len(rejected):,})')
 
 # Add mean lines for both
-approved_mean = approved['processing_days'].mean()
-rejected_mean = rejected['processing_days'].mean()
+approved_mean = approved_hist.mean
+rejected_mean = rejected_hist.mean
 
 ax.axvline(approved_mean, color='#27ae60', linestyle='--', linewidth=3,
           label=f'Approved Mean: {approved_mean:.1f} days')
@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+from dataset_cache import spec_signature, cache_is_fresh, write_cache
+from deregistration_data import load_deregistration
+from discounted_deregistration_data import load_discounted_phase
+from feature_store import duration_days
+from fiscal_partitions import fiscal_year_of
+from snapshots import SNAPSHOT_SPECS, get_as_of, load_snapshot
+
+# One export whose payment fields are compared:
+#   dataset   -> SNAPSHOT_SPECS key (source CSV and point-in-time rules)
+#   phase     -> discounted deregistration phase (None: the liquidation/forced export)
+#   submitted -> submission date column
+#   group     -> column splitting the export (e.g. by deregistration type), or None
+#   label     -> group name used when group is None
+PaymentSource = namedtuple('PaymentSource', ['dataset', 'phase', 'submitted', 'group', 'label'])
+
+PAYMENT_SOURCES = [
+    PaymentSource('deregistration', None, 'submitted_date', 'de_registration_type', None),
+    PaymentSource('discounted_phase1', 1, 'submission_date', None, 'DISCOUNTED_PHASE_1'),
+    PaymentSource('discounted_phase2', 2, 'submission_date', None, 'DISCOUNTED_PHASE_2'),
+    PaymentSource('discounted_phase3', 3, 'submission_date', None, 'DISCOUNTED_PHASE_3'),
+]
+
+# Payment state of a record, from payment_status and payment_verification_status.
+# As in the deregistration categories' payment_pending condition, a PENDING
+# payment is outstanding even when its verification says PAYMENT_VERIFIED;
+# those records get their own state, 'Pending but verified'. Records with
+# neither status are 'Not started' (snapshots clear them until approval).
+PAYMENT_STATES = ['Awaiting payment', 'Pending but verified', 'Awaiting verification', 'Verified',
+                  'Not applicable', 'Not started', 'Other']
+OPEN_PAYMENT_STATES = ['Awaiting payment', 'Pending but verified', 'Awaiting verification']
+PAYMENT_STATE_RULE = 'PENDING payments are open, even when verified'
+
+# The exports have no payment timestamps, so the waits are read from the
+# record dates:
+#   open states -> last update (or approval) to as_of, the time the record
+#                  has been waiting without a change
+#   Verified    -> approval to last update, the update that verified it
+#                  (an upper bound when the record changed again afterwards)
+RECORD_COLUMNS = ['dataset', 'group', 'fiscal_year', 'application_number', 'payment_state', 'is_open',
+                  'submitted_to_approved_days', 'days_in_state']
+
+
+def payment_state(payment_status, verification_status):
+    """Categorical PAYMENT_STATES of every record, from one np.select over the two status columns."""
+    payment = pd.Series(payment_status).astype('string')
+    verified = (pd.Series(verification_status).astype('string') == 'PAYMENT_VERIFIED').to_numpy(
+        dtype=bool, na_value=False)
+    pending, not_applicable, completed = [(payment == status).to_numpy(dtype=bool, na_value=False)
+                                          for status in ['PENDING', 'NOT_APPLICABLE', 'COMPLETED']]
+    not_started = (payment.isna() & pd.Series(verification_status).isna()).to_numpy()
+    conditions = [pending & verified, pending, verified, not_applicable, completed, not_started]
+    codes = np.select(conditions, [PAYMENT_STATES.index(state) for state in
+                                   ['Pending but verified', 'Awaiting payment', 'Verified', 'Not applicable',
+                                    'Awaiting verification', 'Not started']],
+                      default=PAYMENT_STATES.index('Other'))
+    return pd.Categorical.from_codes(codes, categories=PAYMENT_STATES)
+
+
+def payment_records(df, source, as_of):
+    """One row per record of a source with its payment state and waits (days)."""
+    states = payment_state(df['payment_status'], df['payment_verification_status'])
+    is_open = np.isin(np.asarray(states), OPEN_PAYMENT_STATES)
+    verified = np.asarray(states) == 'Verified'
+
+    approved = df['approved_date']
+    start = df['updated_date'].fillna(approved).where(is_open, approved)
+    end = pd.Series(pd.Timestamp(as_of), index=df.index).where(is_open, df['updated_date'])
+    days_in_state = duration_days(end, start)
+    days_in_state[~(is_open | verified)] = np.nan
+
+    if source.group is not None:
+        group = df[source.group].astype('string').fillna('UNKNOWN').to_numpy()
+    else:
+        group = source.label
+    return pd.DataFrame({
+        'dataset': source.dataset,
+        'group': group,
+        'fiscal_year': fiscal_year_of(df['application_number']).to_numpy(),
+        'application_number': df['application_number'].astype('string').to_numpy(),
+        'payment_state': states,
+        'is_open': is_open,
+        'submitted_to_approved_days': duration_days(approved, df[source.submitted]),
+        'days_in_state': days_in_state,
+    })[RECORD_COLUMNS]
+
+
+def load_source(source, as_of):
+    """A source's records as they stood at as_of, through the dataset loaders' caches."""
+    columns = ['application_number', 'application_status', 'payment_status', 'payment_verification_status',
+               'created_date', 'updated_date', 'approved_date', source.submitted]
+    if source.group is not None:
+        columns.append(source.group)
+    if source.phase is None:
+        df = load_deregistration(columns=columns)
+    else:
+        df = load_discounted_phase(source.phase, columns=columns)
+    return load_snapshot(df, source.dataset, as_of)
+
+
+def latency_path(as_of):
+    """Parquet file caching the payment records of every source at one as-of date."""
+    return f'payment_latency_{pd.Timestamp(as_of):%Y%m%d}.parquet'
+
+
+def load_payment_records(as_of=None, sources=PAYMENT_SOURCES, refresh=False):
+    """Payment records of every source at as_of, built once and cached.
+
+    The raw exports are only read when the cache is missing, older than
+    any of them or built from other sources or states. Payment statuses
+    carry no dates, so an earlier as_of keeps their exported values.
+    """
+    as_of = pd.Timestamp(as_of) if as_of is not None else get_as_of('deregistration')
+    path = latency_path(as_of)
+    signature = spec_signature('payment_latency', as_of.isoformat(), [tuple(source) for source in sources],
+                               PAYMENT_STATES, OPEN_PAYMENT_STATES)
+    if not refresh and all(cache_is_fresh(SNAPSHOT_SPECS[source.dataset].csv, path, signature)
+                           for source in sources):
+        return pd.read_parquet(path)
+
+    records = pd.concat([payment_records(load_source(source, as_of), source, as_of) for source in sources],
+                        ignore_index=True)
+    write_cache(records, path, signature)
+    return records
+
+
+def latency_summary(records, fiscal_years=None):
+    """Records, share and days in state per (group, payment state), from one groupby."""
+    if fiscal_years is not None:
+        records = records[records['fiscal_year'].isin(fiscal_years)]
+    grouped = records.groupby(['group', 'payment_state'], observed=True)['days_in_state']
+    summary = pd.DataFrame({
+        'records': grouped.size(),
+        'median_days': grouped.median(),
+        'mean_days': grouped.mean(),
+        'p90_days': grouped.quantile(0.90),
+        'max_days': grouped.max(),
+    })
+    group_sizes = summary.groupby(level='group')['records'].transform('sum')
+    summary.insert(1, 'percentage', summary['records'] / group_sizes * 100)
+    return summary
+
+
+def open_payment_table(records, fiscal_years=None):
+    """Records still waiting on payment or verification per group, with their median wait."""
+    if fiscal_years is not None:
+        records = records[records['fiscal_year'].isin(fiscal_years)]
+    waiting = records[records['is_open']]
+    return waiting.pivot_table(index='group', columns='payment_state', values='days_in_state',
+                               aggfunc=['size', 'median'], observed=True)
+
+
+if __name__ == "__main__":
+    records = load_payment_records(refresh=True)
+    print("="*80)
+    print(f"PAYMENT LATENCY BY GROUP AND STATE (days; {PAYMENT_STATE_RULE})")
+    print("="*80)
+    print(latency_summary(records).to_string(float_format='%.1f'))
+    print()
+    print(open_payment_table(records).to_string(float_format='%.1f'))
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from feature_store import add_durations
+
+# Spelling differences between the name reservation and company registration
+# exports that should not stop two names from matching
+SUFFIX_ALIASES = [
+    (r'\bpvt\b', 'private'),
+    (r'\bltd\b', 'limited'),
+    (r'&', ' and '),
+]
+NAME_NOISE = r'[\s.,()/\-]+'
+
+# Name reservation columns carried onto each linked company registration
+NAME_LINK_COLUMNS = {
+    'application_number': 'name_application_number',
+    'created_date': 'name_created_date',
+    'approved_date': 'name_approved_date',
+    'expire_date': 'name_expire_date',
+}
+
+
+def company_name_key(names):
+    """Normalized company name used to join the two datasets."""
+    key = names.astype('string').str.lower()
+    for pattern, replacement in SUFFIX_ALIASES:
+        key = key.str.replace(pattern, replacement, regex=True)
+    key = key.str.replace(NAME_NOISE, ' ', regex=True).str.strip()
+    return key.mask(key == '')
+
+
+def approved_reservations(df_name):
+    """Approved name reservations keyed by normalized name, sorted by approval date."""
+    approved = df_name[(df_name['status'] == 'APPROVED') & df_name['approved_date'].notna()]
+    names = pd.DataFrame({'name_key': company_name_key(approved['company_name_english'])})
+    for col, linked_col in NAME_LINK_COLUMNS.items():
+        if col in approved.columns:
+            names[linked_col] = approved[col]
+    names['name_approved_date'] = names['name_approved_date'].astype('datetime64[ns]')
+    return names.dropna(subset=['name_key']).sort_values('name_approved_date', kind='stable')
+
+
+def link_name_reservations(df_company, df_name):
+    """Match every company registration to the name reservation it was registered under.
+
+    A registration takes the latest approved reservation of the same
+    normalized name approved on or before the registration was created
+    (pd.merge_asof by name over date-sorted frames). Returns a copy of
+    df_company with the name_* columns of NAME_LINK_COLUMNS, a
+    within_reservation flag and the name_to_company lead times (float32
+    days). Unmatched registrations keep NaN/NaT.
+    """
+    names = approved_reservations(df_name)
+
+    left = pd.DataFrame({
+        'row': np.arange(len(df_company)),
+        'name_key': company_name_key(df_company['company_name_english']).reset_index(drop=True),
+        'created_date': df_company['created_date'].astype('datetime64[ns]').reset_index(drop=True),
+    })
+    left = left.dropna(subset=['name_key', 'created_date']).sort_values('created_date', kind='stable')
+
+    matched = pd.merge_asof(left, names, left_on='created_date', right_on='name_approved_date',
+                            by='name_key', direction='backward')
+    matched = matched.set_index('row').reindex(np.arange(len(df_company)))
+
+    linked = df_company.copy()
+    for linked_col in names.columns.drop('name_key'):
+        linked[linked_col] = matched[linked_col].to_numpy()
+
+    linked['within_reservation'] = (linked['created_date'] <= linked['name_expire_date']).where(
+        linked['name_expire_date'].notna()).astype('boolean')
+    return add_durations(linked, 'name_to_company')
+
+
+if __name__ == "__main__":
+    from name_registration_data import load_name_registration
+    from company_registration_data import load_company_registration
+
+    print("Linking company registrations to name reservations...")
+    df_linked = link_name_reservations(load_company_registration(), load_name_registration())
+    matched = df_linked['name_application_number'].notna()
+    print(f"  Company registrations: {len(df_linked):,}")
+    print(f"  Linked to a reservation: {matched.sum():,} ({matched.mean() * 100:.1f}%)")
+    print(df_linked.loc[matched, ['name_approved_to_created_days',
+                                  'name_created_to_registration_days']].describe())
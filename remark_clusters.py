@@ -0,0 +1,137 @@
+import re
+import zlib
+import unicodedata
+import numpy as np
+import pandas as pd
+
+NO_REMARKS = 'No remarks'
+
+# Punctuation (including the Devanagari danda) separates tokens. Devanagari
+# vowel signs are not \w, so the text is not stripped with \W.
+REMARK_PUNCTUATION = re.compile(r'[\s.,;:!?\'"`()\[\]{}<>/\\|।॥*#_-]+')
+
+# Hashed token features: character trigrams of each space-padded word, so
+# small spelling differences ("alredy", "exist") still share most features
+HASH_DIMENSIONS = 2 ** 12
+NGRAM = 3
+
+# Two remarks belong to the same reason when their feature vectors have at
+# least this cosine similarity. Trigram counts often land exactly on it, so
+# it is compared with a float32 rounding tolerance.
+SIMILARITY_THRESHOLD = 0.7
+SIMILARITY_TOLERANCE = 1e-6
+
+# Leader rows allocated up front; the array doubles when they run out
+LEADER_CAPACITY = 64
+
+
+def normalize_remark(text):
+    """Canonical form of one remark: NFKC, lowercase, punctuation folded to spaces."""
+    if not isinstance(text, str):
+        return ''
+    text = unicodedata.normalize('NFKC', text).lower()
+    return REMARK_PUNCTUATION.sub(' ', text).strip()
+
+
+def remark_features(normalized):
+    """Sparse L2-normalized hashed trigram vector of one normalized remark.
+
+    Returns (indices, values): the sorted feature indices present and their
+    weights, so a remark costs its trigram count rather than HASH_DIMENSIONS.
+    """
+    hashes = [zlib.crc32(padded[i:i + NGRAM].encode('utf-8')) % HASH_DIMENSIONS
+              for padded in (f' {word} ' for word in normalized.split())
+              for i in range(len(padded) - NGRAM + 1)]
+    indices, counts = np.unique(np.asarray(hashes, dtype=np.int64), return_counts=True)
+    values = counts.astype(np.float32)
+    norm = np.linalg.norm(values)
+    return indices, (values / norm if norm > 0 else values)
+
+
+def cluster_features(features, threshold=SIMILARITY_THRESHOLD):
+    """Greedy leader clustering of sparse feature rows, visited in the order given.
+
+    Each row joins its most similar leader (the earliest on a tie) when
+    that is at least `threshold` similar, otherwise it becomes a new leader. Only the leaders are kept dense, in
+    an array grown by doubling. Returns a cluster id per row.
+    """
+    cluster_ids = np.empty(len(features), dtype=np.int32)
+    leaders = np.zeros((LEADER_CAPACITY, HASH_DIMENSIONS), dtype=np.float32)
+    num_leaders = 0
+    for i, (indices, values) in enumerate(features):
+        if num_leaders > 0:
+            similarity = leaders[:num_leaders, indices] @ values
+            # Ties (common with trigram counts) go to the earliest leader
+            best = int(np.argmax(similarity >= similarity.max() - SIMILARITY_TOLERANCE))
+            if similarity[best] >= threshold - SIMILARITY_TOLERANCE:
+                cluster_ids[i] = best
+                continue
+        if num_leaders == len(leaders):
+            leaders = np.concatenate([leaders, np.zeros_like(leaders)])
+        leaders[num_leaders, indices] = values
+        cluster_ids[i] = num_leaders
+        num_leaders += 1
+    return cluster_ids
+
+
+def assign_reasons(remarks, threshold=SIMILARITY_THRESHOLD):
+    """Reason id for every remark, plus the table of reasons.
+
+    Remarks are normalized and clustered once per distinct text, most
+    frequent first, so repeated remarks cost nothing extra. Missing and
+    blank remarks share one reason. Returns (reason_ids, reasons):
+    reason_ids is an int32 array aligned with remarks; reasons is indexed
+    by reason_id with the reason label (its most common wording; labels
+    are unique), the number of distinct wordings and the number of remarks.
+    """
+    remarks = pd.Series(remarks).astype('string').str.strip()
+    raw_codes, raw_texts = pd.factorize(remarks, use_na_sentinel=False)
+    raw_counts = np.bincount(raw_codes, minlength=len(raw_texts))
+
+    # Normalize each distinct raw text once, then collapse identical normal forms
+    normalized = pd.Series([normalize_remark(text) for text in raw_texts])
+    norm_codes, norm_texts = pd.factorize(normalized)
+    norm_counts = np.bincount(norm_codes, weights=raw_counts, minlength=len(norm_texts))
+
+    # Cluster the distinct normal forms, most frequent first so they lead
+    order = np.argsort(-norm_counts, kind='stable')
+    features = [remark_features(norm_texts[i]) for i in order]
+    clusters = np.empty(len(norm_texts), dtype=np.int32)
+    clusters[order] = cluster_features(features, threshold)
+    # Blank remarks are never similar to anything; give them their own reason
+    blank = np.flatnonzero(norm_texts == '')
+    if len(blank) > 0:
+        clusters[blank] = clusters.max() + 1
+
+    # Renumber reasons by size, largest first
+    raw_clusters = clusters[norm_codes]
+    cluster_counts = np.bincount(raw_clusters, weights=raw_counts)
+    rank = np.empty(len(cluster_counts), dtype=np.int32)
+    rank[np.argsort(-cluster_counts, kind='stable')] = np.arange(len(cluster_counts))
+    raw_reasons = rank[raw_clusters]
+
+    variants = pd.DataFrame({'reason_id': raw_reasons, 'text': raw_texts.astype(object),
+                             'count': raw_counts, 'blank': normalized.to_numpy() == ''})
+    variants = variants.sort_values(['reason_id', 'count'], ascending=[True, False], kind='stable')
+    reasons = variants.groupby('reason_id').agg(reason=('text', 'first'), variants=('text', 'size'),
+                                                 count=('count', 'sum'), blank=('blank', 'first'))
+    reasons.loc[reasons['blank'], 'reason'] = NO_REMARKS
+    reasons = reasons.drop(columns='blank')
+    # A real remark can read like the blank label; suffix clashing labels with their id
+    clashing = reasons['reason'].duplicated(keep=False)
+    reasons.loc[clashing, 'reason'] = [f'{label} [{reason_id}]' for reason_id, label
+                                       in reasons.loc[clashing, 'reason'].items()]
+
+    return raw_reasons[raw_codes].astype(np.int32), reasons
+
+
+if __name__ == "__main__":
+    from name_registration_data import load_name_registration
+
+    df_name = load_name_registration(columns=['status', 'latest_remarks'])
+    rejected = df_name[df_name['status'] == 'REJECTED']
+    reason_ids, reasons = assign_reasons(rejected['latest_remarks'])
+    print(f"Rejected records: {len(rejected):,}")
+    print(f"Distinct remark texts: {rejected['latest_remarks'].nunique():,}")
+    print(f"Reasons after clustering: {len(reasons):,}")
+    print(reasons.head(20).to_string())
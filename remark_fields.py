@@ -0,0 +1,122 @@
+import re
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# Free-text remark columns of the deregistration exports, searched in this
+# order; a field takes its value from the first column it is found in
+REMARK_COLUMNS = ['amount_selection_remarks', 'remarks', 'approval_remarks']
+
+DEVANAGARI_DIGITS = str.maketrans('०१२३४५६७८९', '0123456789')
+
+# Building blocks, applied after the digits are converted
+CURRENCY = r'(?:रुपैयाँ|रु\.?|Rs\.?)?\s*'
+AMOUNT = r'(\d[\d,]*(?:\.\d+)?)'
+SECTION = r'(\d+[क-ह]?)'
+
+# One structured field read out of a remark:
+#   kind='amount'  -> rupees (float64)
+#   kind='rate'    -> percentage (float64)
+#   kind='section' -> section reference with ASCII digits, e.g. '136क' (str)
+# The first capture group that matched is the value. Templates look like:
+#   कुल जरिवाना रकम: रु २५०००००.०० चूक्ता पुँजीको ०.५ रु.( २९२००.०० ) % : रु १२५००.००
+#   विशेष दर्ता खारेजी (१३६क) अनुसार, तपाईले रु १२५००.०० भुक्तानी गर्नुपर्नेछ।
+RemarkField = namedtuple('RemarkField', ['name', 'kind', 'pattern'])
+
+REMARK_FIELDS = [
+    RemarkField('remark_total_fine', 'amount', r'कुल\s*जरिवाना\s*रकम\s*:?\s*' + CURRENCY + AMOUNT),
+    RemarkField('remark_capital_rate', 'rate', r'चूक्ता\s*पुँजीको\s*(\d+(?:\.\d+)?)'),
+    RemarkField('remark_paid_up_capital', 'amount',
+                r'चूक्ता\s*पुँजीको\s*[\d.]+\s*' + CURRENCY + r'\(\s*' + AMOUNT + r'\s*\)'),
+    RemarkField('remark_capital_amount', 'amount', r'%\s*:\s*' + CURRENCY + AMOUNT),
+    RemarkField('remark_section', 'section',
+                r'दफा\s*' + SECTION + r'|\(\s*' + SECTION + r'\s*\)\s*(?:अनुसार|बमोजिम)'),
+    RemarkField('remark_payable', 'amount', r'तपाईले\s*' + CURRENCY + AMOUNT + r'\s*भुक्तानी'),
+]
+
+COMPILED_FIELDS = [(field, re.compile(field.pattern)) for field in REMARK_FIELDS]
+
+
+def to_ascii_digits(text):
+    """NFKC-normalized text with Devanagari digits replaced by ASCII ones."""
+    return unicodedata.normalize('NFKC', text).translate(DEVANAGARI_DIGITS)
+
+
+@lru_cache(maxsize=65536)
+def parse_remark(text):
+    """Tuple of REMARK_FIELDS values found in one remark (None where a field is absent).
+
+    Memoized: a template repeated across records and calls is parsed once.
+    """
+    text = to_ascii_digits(text)
+    values = []
+    for field, pattern in COMPILED_FIELDS:
+        match = pattern.search(text)
+        value = next((group for group in match.groups() if group is not None), None) if match else None
+        if value is not None and field.kind in ('amount', 'rate'):
+            value = float(value.replace(',', ''))
+        values.append(value)
+    return tuple(values)
+
+
+def extract_remark_fields(remarks):
+    """REMARK_FIELDS of every remark, parsing each distinct text once.
+
+    Returns a frame aligned with remarks: float64 for amounts and rates,
+    str for sections, missing where a remark has no such field.
+    """
+    remarks = pd.Series(remarks)
+    codes, uniques = pd.factorize(remarks.astype('string'))
+    parsed = [parse_remark(text) for text in uniques]
+
+    fields = {}
+    for j, field in enumerate(REMARK_FIELDS):
+        if field.kind == 'section':
+            distinct = np.array([values[j] for values in parsed] + [None], dtype=object)
+            fields[field.name] = pd.array(distinct[codes], dtype='string')
+        else:
+            distinct = np.array([values[j] for values in parsed] + [None], dtype=np.float64)
+            fields[field.name] = distinct[codes]
+    return pd.DataFrame(fields, index=remarks.index)
+
+
+def add_remark_fields(df):
+    """Add the REMARK_FIELDS columns, taken from the first REMARK_COLUMNS column that has them."""
+    result = None
+    for col in REMARK_COLUMNS:
+        if col in df.columns:
+            fields = extract_remark_fields(df[col])
+            result = fields if result is None else result.fillna(fields)
+    if result is None:
+        return df
+    for field in REMARK_FIELDS:
+        df[field.name] = result[field.name]
+    return df
+
+
+def remark_field_summary(df):
+    """Records with each remark field, and the sum and median of the numeric ones."""
+    rows = {}
+    for field in REMARK_FIELDS:
+        if field.name not in df.columns:
+            continue
+        values = df[field.name]
+        row = {'records': int(values.notna().sum())}
+        if field.kind != 'section':
+            row['total'] = values.sum()
+            row['median'] = values.median()
+        rows[field.name] = row
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+if __name__ == "__main__":
+    from discounted_deregistration_data import load_discounted_phase
+
+    df1 = load_discounted_phase(1, refresh=True)
+    print(f"Phase 1 records: {len(df1):,}")
+    print(f"Distinct remark texts: {df1['amount_selection_remarks'].nunique():,}")
+    print(remark_field_summary(df1).to_string(float_format='%.2f'))
+    print()
+    print(df1['remark_section'].value_counts(dropna=False).to_string())
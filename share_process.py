@@ -0,0 +1,164 @@
+import os
+import numpy as np
+import pandas as pd
+from dataset_cache import load_cached_csv, spec_signature, cache_is_fresh, write_cache
+from feature_store import NS_PER_DAY, DURATION_FEATURES, add_durations
+from snapshots import get_as_of, load_snapshot
+from time_bins import PERIOD_BINS, assign_bins
+
+SHARE_CSV = 'shareData.csv'
+SHARE_CACHE = 'shareData.parquet'
+
+# Date columns parsed once at load time
+SHARE_DATE_COLUMNS = ['created_date', 'updated_date', 'submission_date']
+
+# Every other column the share scripts use, with a fixed dtype
+SHARE_DTYPES = {
+    'application_number': 'str',
+    'company_id': 'Int64',
+    'post_event_process_status': 'category',
+}
+
+# post_event_process_status -> reporting category; statuses not listed are 'Other'
+SHARE_STATUS_CATEGORIES = {
+    'VERIFIED': 'Verified',
+    'REJECTED': 'Rejected',
+    'UNVERIFIED': 'In-Process',
+    'SUBMITTED': 'In-Process',
+    'RE_SUBMITTED': 'In-Process',
+    'VERIFIED_AND_FORWARD': 'In-Process',
+    'DRAFT': 'Draft',
+    'CANCELED': 'Canceled',
+}
+SHARE_CATEGORIES = ['Verified', 'Rejected', 'In-Process', 'Draft', 'Canceled', 'Other']
+
+# Categories still open; their time runs from submission to the as-of date.
+# Decided ones run from submission to their last update (the decision).
+OPEN_CATEGORIES = ['In-Process']
+
+# Aggregated share applications: one row per status, category, submission
+# month and period bin, with the record count and the sum of their days.
+# Bin -1 counts the records without a duration.
+CUBE_COLUMNS = ['status', 'category', 'month', 'bin', 'count', 'sum_days']
+
+
+def add_share_durations(df):
+    """Add the share duration features (float32 days)."""
+    return add_durations(df, 'share')
+
+
+def load_share_data(columns=None, refresh=False):
+    """Share process records with parsed dates and duration features.
+
+    The CSV is parsed once and cached as parquet next to it; later calls
+    read the cache until the CSV changes. Pass refresh=True to force a reload.
+    """
+    return load_cached_csv(SHARE_CSV, SHARE_CACHE, SHARE_DTYPES, SHARE_DATE_COLUMNS,
+                           columns=columns, refresh=refresh, prepare=add_share_durations,
+                           prepare_spec=DURATION_FEATURES['share'])
+
+
+def classify_status(statuses):
+    """Reporting category of every status, mapped once per distinct status value."""
+    codes, uniques = pd.factorize(pd.Series(statuses).astype('string'))
+    category_of = np.array([SHARE_CATEGORIES.index(SHARE_STATUS_CATEGORIES.get(status, 'Other'))
+                            for status in uniques] + [SHARE_CATEGORIES.index('Other')])
+    return pd.Categorical.from_codes(category_of[codes], categories=SHARE_CATEGORIES)
+
+
+def share_time_days(df, categories, as_of):
+    """Days from submission to decision (decided) or to as_of (open), computed once per record."""
+    submitted = df['submission_date'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+    updated = df['updated_date'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+    is_open = np.isin(np.asarray(categories), OPEN_CATEGORIES)
+
+    end = np.where(is_open, pd.Timestamp(as_of).value, updated)
+    days = (end - submitted) / NS_PER_DAY
+    missing = df['submission_date'].isna().to_numpy() | (~is_open & df['updated_date'].isna().to_numpy())
+    days[missing] = np.nan
+    return days
+
+
+def build_share_cube(df, as_of, scheme=PERIOD_BINS):
+    """Aggregate submitted share applications into (status, category, month, bin) cells."""
+    submitted = df[df['submission_date'].notna()]
+    categories = classify_status(submitted['post_event_process_status'])
+    days = share_time_days(submitted, categories, as_of)
+
+    cells = pd.DataFrame({
+        'status': submitted['post_event_process_status'].astype('string').fillna('UNKNOWN').to_numpy(),
+        'category': np.asarray(categories),
+        'month': submitted['submission_date'].to_numpy().astype('datetime64[M]').astype('datetime64[ns]'),
+        'bin': assign_bins(days, scheme).astype(np.int8),
+        'sum_days': np.nan_to_num(days),
+    })
+    cube = cells.groupby(['status', 'category', 'month', 'bin'], as_index=False) \
+        .agg(count=('sum_days', 'size'), sum_days=('sum_days', 'sum'))
+    return cube[CUBE_COLUMNS]
+
+
+def cube_path(as_of):
+    """Parquet file holding the share cube evaluated at one as-of date."""
+    return f'shareData_cube_{pd.Timestamp(as_of):%Y%m%d}.parquet'
+
+
+def load_share_cube(as_of=None, scheme=PERIOD_BINS, refresh=False):
+    """The share cube at as_of (default: get_as_of('share')), built once and cached.
+
+    shareData.csv is only read when the cube is missing, stale or built
+    with another bin scheme.
+    """
+    as_of = pd.Timestamp(as_of) if as_of is not None else get_as_of('share')
+    path = cube_path(as_of)
+    signature = spec_signature('share_cube', as_of.isoformat(), SHARE_STATUS_CATEGORIES,
+                               OPEN_CATEGORIES, scheme.name, scheme.version)
+    if not refresh and cache_is_fresh(SHARE_CSV, path, signature):
+        return pd.read_parquet(path)
+
+    df = load_snapshot(load_share_data(), 'share', as_of)
+    cube = build_share_cube(df, as_of, scheme)
+    write_cache(cube, path, signature)
+    return cube
+
+
+def cube_distribution(cube, category, scheme=PERIOD_BINS):
+    """Counts and percentages per bin for one category, as lists in label order.
+
+    Percentages are relative to all the category's records, including those
+    without a duration (as time_bins.distribution does).
+    """
+    rows = cube[cube['category'] == category]
+    total = int(rows['count'].sum())
+    num_bins = len(scheme.labels)
+    if total == 0:
+        return [0] * num_bins, [0] * num_bins
+    binned = rows[rows['bin'] >= 0]
+    counts = np.bincount(binned['bin'].to_numpy(dtype=np.int64), weights=binned['count'],
+                         minlength=num_bins).astype(np.int64)
+    return counts.tolist(), (counts / total * 100).tolist()
+
+
+def cube_table(cube, index, scheme=PERIOD_BINS):
+    """Record counts with `index` (column name or list) as rows and bin labels as columns."""
+    binned = cube[cube['bin'] >= 0]
+    table = binned.pivot_table(index=index, columns='bin', values='count', aggfunc='sum', fill_value=0)
+    table = table.reindex(columns=range(len(scheme.labels)), fill_value=0)
+    table.columns = scheme.labels
+    return table
+
+
+def cube_mean_days(cube, index):
+    """Mean days per `index` group, over the records with a duration."""
+    sums = cube[cube['bin'] >= 0].groupby(index)[['count', 'sum_days']].sum()
+    return sums['sum_days'] / sums['count']
+
+
+if __name__ == "__main__":
+    if not os.path.exists(SHARE_CSV):
+        print(f"{SHARE_CSV} not found")
+    else:
+        cube = load_share_cube(refresh=True)
+        print(f"Cube cells: {len(cube):,} ({int(cube['count'].sum()):,} submitted applications)")
+        print(cube.groupby('status')['count'].sum().to_string())
+        print()
+        print(cube_table(cube, 'category').to_string())
@@ -1,9 +1,11 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 import warnings
+from time_bins import PERIOD_BINS
+from snapshots import get_as_of
+from share_process import load_share_cube, cube_distribution, cube_table
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -11,45 +13,19 @@ sns.set_style("whitegrid")
 
 print("Creating share process time period distribution charts...")
 
-# Load data
-df = pd.read_csv('shareData.csv', low_memory=False)
+# Evaluation date for in-process calculations (export date unless $AS_OF is set);
+# an earlier date reconstructs the applications as they stood then
+today = get_as_of('share')
 
-# Convert dates
-df['created_date'] = pd.to_datetime(df['created_date'], errors='coerce')
-df['updated_date'] = pd.to_datetime(df['updated_date'], errors='coerce')
-df['submission_date'] = pd.to_datetime(df['submission_date'], errors='coerce')
+# Time bins (shared period scheme)
+labels = PERIOD_BINS.labels
 
-# Today's date for in-process calculations
-today = pd.Timestamp('2026-01-25')
-
-# Define time bins
-bins = [-np.inf, 0, 1, 3, 7, 14, 30, 60, 90, 180, 365, np.inf]
-labels = ['Same day', '1 day', '2-3 days', '4-7 days', '1-2 weeks',
-          '2-4 weeks', '1-2 months', '2-3 months', '3-6 months', '6-12 months', '1+ year']
-
-# Filter records with submission_date
-df_with_submission = df[df['submission_date'].notna()].copy()
-
-# Category 1: VERIFIED (Submission → Verification)
-df_verified = df_with_submission[df_with_submission['post_event_process_status'] == 'VERIFIED'].copy()
-df_verified['time_days'] = (df_verified['updated_date'] - df_verified['submission_date']).dt.total_seconds() / 86400
-
-# Category 2: REJECTED (Submission → Rejection)
-df_rejected = df_with_submission[df_with_submission['post_event_process_status'] == 'REJECTED'].copy()
-df_rejected['time_days'] = (df_rejected['updated_date'] - df_rejected['submission_date']).dt.total_seconds() / 86400
-
-# Category 3: In-Process (Submission → Today)
-# Include: UNVERIFIED, SUBMITTED, RE_SUBMITTED, VERIFIED_AND_FORWARD (exclude DRAFT)
-in_process_statuses = ['UNVERIFIED', 'SUBMITTED', 'RE_SUBMITTED', 'VERIFIED_AND_FORWARD']
-df_in_process = df_with_submission[df_with_submission['post_event_process_status'].isin(in_process_statuses)].copy()
-df_in_process['time_days'] = (today - df_in_process['submission_date']).dt.total_seconds() / 86400
-
-# Create categories dictionary
-categories = {
-    'Verified': df_verified,
-    'Rejected': df_rejected,
-    'In-Process': df_in_process
-}
+# Submitted applications aggregated by status x category x submission month x
+# bin (share_process.py). Statuses map to Verified / Rejected / In-Process
+# (UNVERIFIED, SUBMITTED, RE_SUBMITTED, VERIFIED_AND_FORWARD); DRAFT and
+# CANCELED are left out. The cube is cached per as-of date, so shareData.csv
+# is only reread when it changes.
+cube = load_share_cube(today)
 
 # Colors for each category
 color_map = {
@@ -58,36 +34,14 @@ color_map = {
     'In-Process': '#3498db'     # Blue
 }
 
-# Function to calculate distribution
-def calculate_distribution(df_cat, bins, labels):
-    if len(df_cat) == 0:
-        return [0] * len(labels), [0] * len(labels)
-
-    df_cat['time_bin'] = pd.cut(df_cat['time_days'], bins=bins, labels=labels)
-    dist = df_cat['time_bin'].value_counts().sort_index()
-    total = len(df_cat)
-
-    counts = []
-    percentages = []
-    for label in labels:
-        if label in dist.index:
-            count = dist[label]
-            counts.append(count)
-            percentages.append((count / total) * 100)
-        else:
-            counts.append(0)
-            percentages.append(0)
-
-    return counts, percentages
-
 # Calculate distributions for all categories
 all_data = {}
-for cat_name, df_cat in categories.items():
-    counts, percentages = calculate_distribution(df_cat, bins, labels)
+for cat_name in color_map:
+    counts, percentages = cube_distribution(cube, cat_name)
     all_data[cat_name] = {
         'counts': counts,
         'percentages': percentages,
-        'total': len(df_cat)
+        'total': int(cube.loc[cube['category'] == cat_name, 'count'].sum())
     }
 
 print(f"\nData Summary:")
@@ -147,7 +101,7 @@ plt.close()
 categories_list = [
     ('Verified', 'Submission → Verification'),
     ('Rejected', 'Submission → Rejection'),
-    ('In-Process', 'Submission → In-Process (as of Jan 25, 2026)')
+    ('In-Process', f'Submission → In-Process (as of {today:%b %d, %Y})')
 ]
 
 for idx, (cat_name, cat_title) in enumerate(categories_list):
@@ -189,10 +143,16 @@ for idx, (cat_name, cat_title) in enumerate(categories_list):
     print(f"✓ Saved: {filename}")
     plt.close()
 
+# Breakdown by raw status, read from the same cube
+print("\n" + "="*80)
+print("SUBMITTED APPLICATIONS BY STATUS AND TIME PERIOD")
+print("="*80)
+print(cube_table(cube, 'status').to_string())
+
 print("\n" + "="*80)
 print("SHARE PROCESS TIME DISTRIBUTION CHARTS COMPLETE!")
 print("="*80)
-print("""
+print(f"""
 Generated Files:
   1. share_process_time_comparison.png (combined comparison chart)
   2. share_process_time_distribution_1_of_3.png (Verified)
@@ -202,6 +162,6 @@ Generated Files:
 Summary:
   - VERIFIED records: Submission → Updated (approval date)
   - REJECTED records: Submission → Updated (rejection date)
-  - IN-PROCESS records: Submission → Today (Jan 25, 2026)
+  - IN-PROCESS records: Submission → Today ({today:%b %d, %Y})
   - Excluded statuses: DRAFT, CANCELED
 """)
@@ -0,0 +1,162 @@
+import os
+import glob
+import pandas as pd
+from collections import namedtuple
+from dataset_cache import spec_signature, cache_is_fresh, write_cache
+from fiscal_partitions import FISCAL_YEAR_COLUMN
+
+# Environment variable overriding the evaluation date of every analysis,
+# e.g. AS_OF=2025-06-30 python deregistration_submission_to_approval.py
+AS_OF_ENV = 'AS_OF'
+
+# How a dataset looked at an earlier date:
+#   csv       -> source export (a cached snapshot is rebuilt when it changes)
+#   export    -> date the export was taken; the default as-of date
+#   created   -> records (or events) dated after as_of did not exist yet
+#   dates     -> other date columns; dates after as_of had not happened yet (NaT)
+#   status    -> status column; reset to `undecided` for records whose
+#                `decided` date is after as_of
+#   cleared   -> columns cleared (NA) for those records too; payments only
+#                start once an application is approved
+SnapshotSpec = namedtuple('SnapshotSpec', ['csv', 'export', 'created', 'dates', 'status',
+                                           'decided', 'undecided', 'cleared'])
+
+PAYMENT_COLUMNS = ['payment_status', 'payment_verification_status']
+
+SNAPSHOT_SPECS = {
+    'deregistration': SnapshotSpec(
+        'deregidtration(Liquidation-Cancelation of registration).csv', '2026-01-25',
+        'created_date', ['submitted_date', 'approved_date', 'updated_date'],
+        'application_status', 'approved_date', 'IN_PROCESS', PAYMENT_COLUMNS),
+    'discounted_phase1': SnapshotSpec(
+        'discountedderegistration.csv', '2026-01-25',
+        'created_date', ['submission_date', 'approved_date', 'updated_date'],
+        'application_status', 'approved_date', 'IN_PROCESS', PAYMENT_COLUMNS),
+    'discounted_phase2': SnapshotSpec(
+        'discounteddiregistrationpahse2.csv', '2026-01-25',
+        'created_date', ['submission_date', 'approved_date', 'updated_date'],
+        'application_status', 'approved_date', 'IN_PROCESS', PAYMENT_COLUMNS),
+    'discounted_phase3': SnapshotSpec(
+        'discounteddiregistrationpahse3.csv', '2026-01-25',
+        'created_date', ['submission_date', 'approved_date', 'updated_date'],
+        'application_status', 'approved_date', 'IN_PROCESS', PAYMENT_COLUMNS),
+    # Verified/rejected share applications were decided at their last update
+    'share': SnapshotSpec(
+        'shareData.csv', '2026-01-25',
+        'created_date', ['submission_date', 'updated_date'],
+        'post_event_process_status', 'updated_date', 'SUBMITTED', []),
+    # One row per workflow event; state as of a date is the events up to it
+    'workflow': SnapshotSpec(
+        'Industry_workflow_history.csv', '2026-01-28',
+        'workflow_datetime', [], None, None, None, []),
+}
+
+
+def get_as_of(dataset):
+    """Evaluation date of an analysis: $AS_OF if set, otherwise the dataset's export date."""
+    return pd.Timestamp(os.environ.get(AS_OF_ENV) or SNAPSHOT_SPECS[dataset].export)
+
+
+def is_snapshot(dataset, as_of):
+    """Whether as_of is before the dataset's export, so the records are reconstructed."""
+    return pd.Timestamp(as_of) < pd.Timestamp(SNAPSHOT_SPECS[dataset].export)
+
+
+def point_in_time(df, dataset, as_of):
+    """Reconstruct a dataset as it stood at as_of from its date columns.
+
+    Records created after as_of are dropped, later dates are cleared and a
+    status decided after as_of goes back to the spec's undecided status,
+    with the spec's cleared columns (e.g. payment status) set to NA. Other
+    columns without dates keep their exported value.
+    """
+    spec = SNAPSHOT_SPECS[dataset]
+    as_of = pd.Timestamp(as_of)
+
+    snapshot = df[~(df[spec.created] > as_of)].copy()
+    if spec.status is not None and spec.status in snapshot.columns:
+        decided_later = (snapshot[spec.decided] > as_of).to_numpy(dtype=bool, na_value=False)
+        if decided_later.any():
+            status = snapshot[spec.status]
+            if isinstance(status.dtype, pd.CategoricalDtype) and \
+                    spec.undecided not in status.cat.categories:
+                status = status.cat.add_categories([spec.undecided])
+            status[decided_later] = spec.undecided
+            snapshot[spec.status] = status
+            for col in spec.cleared:
+                if col in snapshot.columns:
+                    snapshot[col] = snapshot[col].mask(decided_later)
+    for col in spec.dates:
+        if col in snapshot.columns:
+            snapshot[col] = snapshot[col].mask(snapshot[col] > as_of)
+    return snapshot
+
+
+def frame_key(df):
+    """Short key of the frame a snapshot is taken from: its sorted columns and fiscal years."""
+    fiscal_years = None
+    if FISCAL_YEAR_COLUMN in df.columns:
+        fiscal_years = sorted(df[FISCAL_YEAR_COLUMN].astype(str).unique())
+    return spec_signature(sorted(df.columns), fiscal_years)[:12]
+
+
+def snapshot_path(dataset, as_of, key):
+    """Parquet file caching the snapshot of one frame (by frame_key) at one as-of date."""
+    return f'{dataset}_asof_{pd.Timestamp(as_of):%Y%m%d}_{key}.parquet'
+
+
+def prune_snapshots(dataset):
+    """Delete a dataset's cached snapshots that are older than its export."""
+    csv_mtime = os.path.getmtime(SNAPSHOT_SPECS[dataset].csv)
+    for path in glob.glob(f'{dataset}_asof_*.parquet'):
+        if os.path.getmtime(path) < csv_mtime:
+            os.remove(path)
+
+
+def load_snapshot(df, dataset, as_of, refresh=False):
+    """point_in_time(df, dataset, as_of), cached as parquet per frame and as-of date.
+
+    The export date itself needs no reconstruction, so df is returned as is.
+    Snapshots are keyed on df's columns, fiscal years and row count, so
+    loading other columns or years of a dataset never returns another
+    frame's snapshot. A cached snapshot is rebuilt when the source export
+    changes, and snapshots of older exports are deleted then.
+    """
+    spec = SNAPSHOT_SPECS[dataset]
+    as_of = pd.Timestamp(as_of)
+    if not is_snapshot(dataset, as_of):
+        return df
+
+    key = frame_key(df)
+    path = snapshot_path(dataset, as_of, key)
+    signature = spec_signature(dataset, as_of.isoformat(), tuple(spec), key, len(df))
+    if not refresh and cache_is_fresh(spec.csv, path, signature):
+        return pd.read_parquet(path)
+
+    snapshot = point_in_time(df, dataset, as_of)
+    prune_snapshots(dataset)
+    write_cache(snapshot, path, signature)
+    return snapshot
+
+
+def month_ends(end, months=12):
+    """Last moment of each of the `months` month ends up to end, oldest first."""
+    dates = pd.date_range(end=pd.Timestamp(end).normalize(), periods=months, freq='ME')
+    return [date + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1) for date in dates]
+
+
+if __name__ == "__main__":
+    dataset = 'deregistration'
+    spec = SNAPSHOT_SPECS[dataset]
+    df = pd.read_csv(spec.csv, low_memory=False)
+    for col in [spec.created] + spec.dates:
+        df[col] = pd.to_datetime(df[col], errors='coerce')
+
+    print("="*80)
+    print(f"MONTH-END BACKLOG: {dataset}")
+    print("="*80)
+    print(f"{'As of':<12} {'Records':>10} {'Undecided':>10} {'Approved':>10}")
+    for as_of in month_ends(get_as_of(dataset)):
+        snapshot = load_snapshot(df, dataset, as_of)
+        undecided = (snapshot[spec.status] == spec.undecided).sum()
+        print(f"{as_of:%Y-%m-%d}   {len(snapshot):>10,} {undecided:>10,} {len(snapshot) - undecided:>10,}")
@@ -2,16 +2,19 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+from name_registration_data import load_name_registration
+from status_profile import profile_by_status
 
 # Load the data
 print("Loading data...")
-df_name = pd.read_csv('nameregisvation.csv', low_memory=False)
+df_name = load_name_registration()
 
-# Convert date columns to datetime
-df_name['created_date'] = pd.to_datetime(df_name['created_date'], errors='coerce')
-df_name['updated_date'] = pd.to_datetime(df_name['updated_date'], errors='coerce')
-df_name['approved_date'] = pd.to_datetime(df_name['approved_date'], errors='coerce')
-df_name['submission_date'] = pd.to_datetime(df_name['submission_date'], errors='coerce')
+# Null rates, duration stats and value counts per status in one grouped pass
+profile = profile_by_status(df_name, 'status',
+                            duration_columns=['created_to_approved_days', 'created_to_submission_days'],
+                            value_columns=['company_type_id'])
+present = profile['present']
+durations = profile['durations']
 
 print("\n" + "="*80)
 print("STATUS FIELD ANALYSIS")
@@ -20,7 +23,7 @@ print("="*80)
 # Get status distribution
 print("\n1. STATUS DISTRIBUTION:")
 print("-"*80)
-status_counts = df_name['status'].value_counts()
+status_counts = profile['counts'].rename('count')
 print(status_counts)
 print(f"\nTotal records: {len(df_name):,}")
 
@@ -37,11 +40,10 @@ print("="*80)
 print("\nWhich statuses have an 'approved_date' populated:")
 print("-"*80)
 
-for status in status_counts.index:
-    status_df = df_name[df_name['status'] == status]
-    has_approved = status_df['approved_date'].notna().sum()
-    percentage = (has_approved / len(status_df)) * 100
-    print(f"  {status:15s}: {has_approved:>8,} / {len(status_df):>8,} ({percentage:>5.1f}%)")
+for status, total in status_counts.items():
+    has_approved = present.loc[status, 'approved_date']
+    percentage = (has_approved / total) * 100
+    print(f"  {status:15s}: {has_approved:>8,} / {total:>8,} ({percentage:>5.1f}%)")
 
 # Check submission_date patterns
 print("\n" + "="*80)
@@ -50,20 +52,17 @@ print("="*80)
 print("\nWhich statuses have a 'submission_date' populated:")
 print("-"*80)
 
-for status in status_counts.index:
-    status_df = df_name[df_name['status'] == status]
-    has_submitted = status_df['submission_date'].notna().sum()
-    percentage = (has_submitted / len(status_df)) * 100
-    print(f"  {status:15s}: {has_submitted:>8,} / {len(status_df):>8,} ({percentage:>5.1f}%)")
+for status, total in status_counts.items():
+    has_submitted = present.loc[status, 'submission_date']
+    percentage = (has_submitted / total) * 100
+    print(f"  {status:15s}: {has_submitted:>8,} / {total:>8,} ({percentage:>5.1f}%)")
 
 # Analyze workflow timing by status
 print("\n" + "="*80)
 print("4. TIMING ANALYSIS BY STATUS")
 print("="*80)
 
-# Calculate days from creation to approval for each status
-df_name['created_to_approved_days'] = (df_name['approved_date'] - df_name['created_date']).dt.total_seconds() / 86400
-df_name['created_to_submission_days'] = (df_name['submission_date'] - df_name['created_date']).dt.total_seconds() / 86400
+# Days from creation to approval/submission come precomputed from the feature store
 
 print("\nTime from Creation to Approval (in days):")
 print("-"*80)
@@ -72,13 +71,12 @@ print("-"*80)
 
 for status in ['APPROVED', 'REJECTED', 'VERIFIED', 'DRAFT']:
     if status in status_counts.index:
-        status_df = df_name[df_name['status'] == status]
-        timing_data = status_df['created_to_approved_days'].dropna()
+        stats = durations.loc[(status, 'created_to_approved_days')]
 
-        if len(timing_data) > 0:
-            print(f"{status:<15} {len(timing_data):>10,} {timing_data.mean():>10.1f} "
-                  f"{timing_data.median():>10.1f} {timing_data.std():>10.1f} "
-                  f"{timing_data.min():>10.1f} {timing_data.max():>10.1f}")
+        if stats['count'] > 0:
+            print(f"{status:<15} {int(stats['count']):>10,} {stats['mean']:>10.1f} "
+                  f"{stats['median']:>10.1f} {stats['std']:>10.1f} "
+                  f"{stats['min']:>10.1f} {stats['max']:>10.1f}")
         else:
             print(f"{status:<15} {0:>10,} {'N/A':>10} {'N/A':>10} {'N/A':>10} {'N/A':>10} {'N/A':>10}")
 
@@ -89,13 +87,12 @@ print("-"*80)
 
 for status in ['APPROVED', 'REJECTED', 'VERIFIED', 'DRAFT']:
     if status in status_counts.index:
-        status_df = df_name[df_name['status'] == status]
-        timing_data = status_df['created_to_submission_days'].dropna()
+        stats = durations.loc[(status, 'created_to_submission_days')]
 
-        if len(timing_data) > 0:
-            print(f"{status:<15} {len(timing_data):>10,} {timing_data.mean():>10.1f} "
-                  f"{timing_data.median():>10.1f} {timing_data.std():>10.1f} "
-                  f"{timing_data.min():>10.1f} {timing_data.max():>10.1f}")
+        if stats['count'] > 0:
+            print(f"{status:<15} {int(stats['count']):>10,} {stats['mean']:>10.1f} "
+                  f"{stats['median']:>10.1f} {stats['std']:>10.1f} "
+                  f"{stats['min']:>10.1f} {stats['max']:>10.1f}")
         else:
             print(f"{status:<15} {0:>10,} {'N/A':>10} {'N/A':>10} {'N/A':>10} {'N/A':>10} {'N/A':>10}")
 
@@ -108,35 +105,35 @@ print("\nUnderstanding the workflow:")
 print("-"*80)
 
 # DRAFT: Has approved_date?
-draft_df = df_name[df_name['status'] == 'DRAFT']
-draft_with_approval = draft_df['approved_date'].notna().sum()
+draft_total = status_counts.get('DRAFT', 0)
+draft_with_approval = present['approved_date'].get('DRAFT', 0)
 print(f"\nDRAFT:")
-print(f"  - Total: {len(draft_df):,}")
+print(f"  - Total: {draft_total:,}")
 print(f"  - With approved_date: {draft_with_approval:,}")
 print(f"  - Interpretation: {'Work in progress, not submitted' if draft_with_approval == 0 else 'Some drafts have been approved before (status not updated)'}")
 
 # VERIFIED: Has approved_date?
-verified_df = df_name[df_name['status'] == 'VERIFIED']
-verified_with_approval = verified_df['approved_date'].notna().sum()
+verified_total = status_counts.get('VERIFIED', 0)
+verified_with_approval = present['approved_date'].get('VERIFIED', 0)
 print(f"\nVERIFIED:")
-print(f"  - Total: {len(verified_df):,}")
+print(f"  - Total: {verified_total:,}")
 print(f"  - With approved_date: {verified_with_approval:,}")
-print(f"  - Interpretation: {'Submitted and verified, pending final approval' if verified_with_approval < len(verified_df) * 0.1 else 'Verification step in workflow'}")
+print(f"  - Interpretation: {'Submitted and verified, pending final approval' if verified_with_approval < verified_total * 0.1 else 'Verification step in workflow'}")
 
 # APPROVED: Should all have approved_date
-approved_df = df_name[df_name['status'] == 'APPROVED']
-approved_with_date = approved_df['approved_date'].notna().sum()
+approved_total = status_counts.get('APPROVED', 0)
+approved_with_date = present['approved_date'].get('APPROVED', 0)
 print(f"\nAPPROVED:")
-print(f"  - Total: {len(approved_df):,}")
+print(f"  - Total: {approved_total:,}")
 print(f"  - With approved_date: {approved_with_date:,}")
-print(f"  - Missing approved_date: {len(approved_df) - approved_with_date:,}")
+print(f"  - Missing approved_date: {approved_total - approved_with_date:,}")
 print(f"  - Interpretation: Final approval granted")
 
 # REJECTED: Has approved_date?
-rejected_df = df_name[df_name['status'] == 'REJECTED']
-rejected_with_approval = rejected_df['approved_date'].notna().sum()
+rejected_total = status_counts.get('REJECTED', 0)
+rejected_with_approval = present['approved_date'].get('REJECTED', 0)
 print(f"\nREJECTED:")
-print(f"  - Total: {len(rejected_df):,}")
+print(f"  - Total: {rejected_total:,}")
 print(f"  - With approved_date: {rejected_with_approval:,}")
 print(f"  - Interpretation: Application denied")
 
@@ -160,9 +157,7 @@ approved_presence = []
 labels_list = []
 for status in ['APPROVED', 'REJECTED', 'VERIFIED', 'DRAFT']:
     if status in status_counts.index:
-        status_df = df_name[df_name['status'] == status]
-        has_approved = status_df['approved_date'].notna().sum()
-        approved_presence.append(has_approved)
+        approved_presence.append(present.loc[status, 'approved_date'])
         labels_list.append(status)
 
 ax2.bar(labels_list, approved_presence, color=['green', 'red', 'orange', 'gray'])
@@ -176,10 +171,10 @@ for i, v in enumerate(approved_presence):
 ax3 = axes[1, 0]
 processing_times = []
 status_labels = []
+approval_days_by_status = dict(list(df_name.groupby('status', observed=True)['created_to_approved_days']))
 for status in ['APPROVED', 'REJECTED', 'VERIFIED']:
     if status in status_counts.index:
-        status_df = df_name[df_name['status'] == status]
-        timing_data = status_df['created_to_approved_days'].dropna()
+        timing_data = approval_days_by_status[status].dropna()
         if len(timing_data) > 0:
             processing_times.append(timing_data)
             status_labels.append(f"{status}\n(n={len(timing_data):,})")
@@ -226,7 +221,7 @@ rejected = df_name[df_name['status'] == 'REJECTED'].copy()
 
 # Add timing calculations
 for df_subset in [approved, rejected]:
-    df_subset['processing_days'] = (df_subset['approved_date'] - df_subset['created_date']).dt.total_seconds() / 86400
+    df_subset['processing_days'] = df_subset['created_to_approved_days']
 
 # Row 1: Processing time distributions
 ax = axes[0, 0]
@@ -289,13 +284,13 @@ if 'company_type_id' in df_name.columns:
 ax = axes[1, 2]
 if 'company_type_id' in df_name.columns:
     # Get top company types overall
-    top_types = df_name['company_type_id'].value_counts().head(10).index
+    top_types = df_name['company_type_id'].value_counts().head(10)
+    type_by_status = profile['values']['company_type_id']
 
     success_rates = []
     type_labels = []
-    for ctype in top_types:
-        total = len(df_name[df_name['company_type_id'] == ctype])
-        approved_count = len(approved[approved['company_type_id'] == ctype])
+    for ctype, total in top_types.items():
+        approved_count = type_by_status.loc['APPROVED', ctype] if 'APPROVED' in type_by_status.index else 0
         if total > 0:
             success_rate = (approved_count / total) * 100
             success_rates.append(success_rate)
@@ -353,7 +348,7 @@ Based on the analysis, here's what you should focus on:
 """)
 
 # Determine likely workflow
-if len(verified_df) > 0 and verified_with_approval < len(verified_df) * 0.5:
+if verified_total > 0 and verified_with_approval < verified_total * 0.5:
     print("   Likely workflow: DRAFT → VERIFIED → APPROVED/REJECTED")
     print("   - DRAFT: Application being prepared")
     print("   - VERIFIED: Submitted and under review")
@@ -369,32 +364,19 @@ print(f"""
    - Average approval time: {approved_times.mean():.1f} days
    - Average rejection time: {rejected_times.mean():.1f} days
    - Total processed: {len(approved) + len(rejected):,}
-   - Pending (DRAFT/VERIFIED): {len(draft_df) + len(verified_df):,}
+   - Pending (DRAFT/VERIFIED): {draft_total + verified_total:,}
 """)
 
-# Export summary
-summary_data = {
-    'Status': [],
-    'Count': [],
-    'Percentage': [],
-    'Has_Approved_Date': [],
-    'Avg_Processing_Days': [],
-    'Median_Processing_Days': []
-}
-
-for status in status_counts.index:
-    status_df = df_name[df_name['status'] == status]
-    has_approved = status_df['approved_date'].notna().sum()
-    timing_data = status_df['created_to_approved_days'].dropna()
-
-    summary_data['Status'].append(status)
-    summary_data['Count'].append(len(status_df))
-    summary_data['Percentage'].append((len(status_df) / len(df_name)) * 100)
-    summary_data['Has_Approved_Date'].append(has_approved)
-    summary_data['Avg_Processing_Days'].append(timing_data.mean() if len(timing_data) > 0 else None)
-    summary_data['Median_Processing_Days'].append(timing_data.median() if len(timing_data) > 0 else None)
-
-summary_df = pd.DataFrame(summary_data)
+# Export summary (straight from the status profile)
+approval_stats = durations.xs('created_to_approved_days', level='duration')
+summary_df = pd.DataFrame({
+    'Status': status_counts.index.astype(str),
+    'Count': status_counts.to_numpy(),
+    'Percentage': (status_counts / len(df_name) * 100).to_numpy(),
+    'Has_Approved_Date': present['approved_date'].to_numpy(),
+    'Avg_Processing_Days': approval_stats['mean'].to_numpy(),
+    'Median_Processing_Days': approval_stats['median'].to_numpy(),
+})
 summary_df.to_csv('status_summary.csv', index=False)
 print("\n✓ Saved: status_summary.csv")
 
@@ -0,0 +1,127 @@
+import os
+import pandas as pd
+from feature_store import DURATION_FEATURES
+
+# Status column and columns worth profiling for every dataset the scripts use.
+# value_columns get a status x value count table.
+PROFILE_DATASETS = {
+    'name_registration': {
+        'status_column': 'status',
+        'duration_columns': list(DURATION_FEATURES['name_registration']),
+        'value_columns': ['company_type_id', 'master_company_category'],
+    },
+    'company_registration': {
+        'status_column': 'status',
+        'duration_columns': list(DURATION_FEATURES['company_registration']),
+        'value_columns': ['company_type_id'],
+    },
+    'deregistration': {
+        'status_column': 'application_status',
+        'duration_columns': list(DURATION_FEATURES['deregistration']),
+        'value_columns': ['de_registration_type', 'payment_status', 'payment_verification_status'],
+    },
+    'discounted_deregistration': {
+        'status_column': 'application_status',
+        'duration_columns': list(DURATION_FEATURES['discounted_deregistration']),
+        'value_columns': ['payment_status', 'payment_verification_status'],
+    },
+    'share': {
+        'status_column': 'post_event_process_status',
+        'duration_columns': list(DURATION_FEATURES['share']),
+        'value_columns': [],
+    },
+}
+
+DURATION_STATS = ['count', 'mean', 'median', 'std', 'min', 'max']
+
+
+def profile_by_status(df, status_column='status', duration_columns=(), value_columns=()):
+    """Profile a dataset by status with one grouped pass.
+
+    Returns a dict of:
+      counts     - records per status, most frequent first
+      present    - status x column count of non-null values
+      null_rate  - status x column percentage of null values
+      durations  - (status, duration column) x DURATION_STATS
+      values     - {column: status x value record counts}
+    Statuses are ordered by count in every table.
+    """
+    grouped = df.groupby(status_column, observed=True, sort=False)
+    counts = grouped.size().sort_values(ascending=False, kind='stable')
+    order = counts.index
+
+    other_columns = [col for col in df.columns if col != status_column]
+    present = grouped[other_columns].count().reindex(order)
+    null_rate = (1 - present.div(counts, axis=0)) * 100
+
+    duration_columns = [col for col in duration_columns if col in df.columns]
+    if duration_columns:
+        durations = grouped[duration_columns].agg(DURATION_STATS).reindex(order)
+        durations = durations.stack(level=0, future_stack=True)
+        durations.index.names = [status_column, 'duration']
+    else:
+        durations = pd.DataFrame(columns=DURATION_STATS)
+
+    values = {}
+    for col in value_columns:
+        if col in df.columns:
+            values[col] = pd.crosstab(df[status_column], df[col]).reindex(order, fill_value=0)
+
+    return {
+        'counts': counts,
+        'present': present,
+        'null_rate': null_rate,
+        'durations': durations,
+        'values': values,
+    }
+
+
+def profile_dataset(df, dataset):
+    """profile_by_status with the PROFILE_DATASETS settings of a dataset."""
+    return profile_by_status(df, **PROFILE_DATASETS[dataset])
+
+
+def print_profile(profile, title):
+    """Print a status profile as plain tables."""
+    print("="*80)
+    print(f"STATUS PROFILE: {title}")
+    print("="*80)
+    counts = profile['counts']
+    print(f"\nRecords per status ({counts.sum():,} total):")
+    print(counts.to_string())
+
+    print("\nNull rate per column and status (%):")
+    print(profile['null_rate'].T.astype(float).round(1).to_string())
+
+    if not profile['durations'].empty:
+        print("\nDuration statistics per status (days):")
+        print(profile['durations'].astype(float).round(1).to_string())
+
+    for col, table in profile['values'].items():
+        print(f"\n{col} by status:")
+        print(table.to_string())
+    print()
+
+
+if __name__ == "__main__":
+    from name_registration_data import load_name_registration
+    from company_registration_data import load_company_registration
+
+    print_profile(profile_dataset(load_name_registration(), 'name_registration'), 'name registration')
+    print_profile(profile_dataset(load_company_registration(), 'company_registration'),
+                  'company registration')
+
+    from deregistration_data import DEREGISTRATION_CSV, load_deregistration
+    from discounted_deregistration_data import DISCOUNTED_PHASE_FILES, load_discounted_phase
+    from share_process import SHARE_CSV, load_share_data
+
+    csv_datasets = [
+        ('deregistration', DEREGISTRATION_CSV, load_deregistration),
+        ('discounted_deregistration', DISCOUNTED_PHASE_FILES[1][0], lambda: load_discounted_phase(1)),
+        ('share', SHARE_CSV, load_share_data),
+    ]
+    for dataset, filename, load in csv_datasets:
+        if os.path.exists(filename):
+            print_profile(profile_dataset(load(), dataset), filename)
+        else:
+            print(f"Skipping {dataset}: {filename} not found\n")
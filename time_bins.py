@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+
+# A named, versioned bin scheme.
+#   right=True  -> intervals (a, b]   (pd.cut semantics)
+#   right=False -> intervals [a, b)   (np.digitize semantics)
+#   clip=True   -> values outside the edges (and NaN) fall into the first/last bin,
+#                  as the per-application np.digitize code in the workflow scripts did
+BinScheme = namedtuple('BinScheme', ['name', 'version', 'edges', 'labels', 'right', 'clip'])
+
+BIN_SCHEMES = {
+    ('period', 1): BinScheme(
+        'period', 1,
+        [-np.inf, 0, 1, 3, 7, 14, 30, 60, 90, 180, 365, np.inf],
+        ['Same day', '1 day', '2-3 days', '4-7 days', '1-2 weeks',
+         '2-4 weeks', '1-2 months', '2-3 months', '3-6 months', '6-12 months', '1+ year'],
+        right=True, clip=False),
+    ('workflow', 1): BinScheme(
+        'workflow', 1,
+        [0, 1, 2, 3, 4, 5, 6, 7, 14, 21, 28, 35, 60, 90, 180, 365, np.inf],
+        ['1d', '2d', '3d', '4d', '5d', '6d', '7d', '2wk', '3wk', '4wk', '5wk', '2mo', '3mo', '6mo', '1yr', '1yr+'],
+        right=False, clip=True),
+}
+
+
+def get_scheme(name, version=None):
+    """Look up a bin scheme; the latest version unless one is given."""
+    if version is None:
+        version = max(v for n, v in BIN_SCHEMES if n == name)
+    return BIN_SCHEMES[(name, version)]
+
+
+# 'Same day' … '1+ year'
+PERIOD_BINS = get_scheme('period')
+# '1d' … '1yr+'
+WORKFLOW_BINS = get_scheme('workflow')
+
+
+def assign_bins(values, scheme):
+    """Bin index for every value of a column (-1 for NaN/out of range unless clipped)."""
+    values = np.asarray(values, dtype=np.float64)
+    side = 'left' if scheme.right else 'right'
+    codes = np.searchsorted(np.asarray(scheme.edges, dtype=np.float64), values, side=side) - 1
+
+    num_bins = len(scheme.labels)
+    if scheme.clip:
+        return np.clip(codes, 0, num_bins - 1)
+
+    codes[(codes < 0) | (codes >= num_bins) | np.isnan(values)] = -1
+    return codes
+
+
+def cut(values, scheme):
+    """Drop-in for pd.cut(values, bins, labels): an ordered Categorical of bin labels."""
+    codes = assign_bins(values, scheme)
+    categorical = pd.Categorical.from_codes(codes, categories=scheme.labels, ordered=True)
+    if isinstance(values, pd.Series):
+        return pd.Series(categorical, index=values.index, name=values.name)
+    return categorical
+
+
+def distribution(values, scheme):
+    """Counts and percentages per bin, as lists in label order.
+
+    Percentages are relative to all values passed in, including any that
+    fall outside the bins (e.g. missing durations).
+    """
+    total = len(values)
+    num_bins = len(scheme.labels)
+    if total == 0:
+        return [0] * num_bins, [0] * num_bins
+
+    codes = assign_bins(values, scheme)
+    counts = np.bincount(codes[codes >= 0], minlength=num_bins)
+    percentages = counts / total * 100
+    return counts.tolist(), percentages.tolist()
+
+
+def grouped_distribution(values, groups, scheme):
+    """Counts and percentages per bin for every group in one pass.
+
+    Returns two DataFrames (groups x bin labels). Percentages are relative to
+    each group's row count.
+    """
+    group_codes, group_names = pd.factorize(pd.Series(groups), sort=True)
+    num_bins = len(scheme.labels)
+    num_groups = len(group_names)
+
+    codes = assign_bins(values, scheme)
+    valid = (codes >= 0) & (group_codes >= 0)
+    flat = group_codes[valid] * num_bins + codes[valid]
+    counts = np.bincount(flat, minlength=num_groups * num_bins).reshape(num_groups, num_bins)
+    totals = np.bincount(group_codes[group_codes >= 0], minlength=num_groups)
+
+    counts_df = pd.DataFrame(counts, index=group_names, columns=scheme.labels)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        percentages = np.where(totals[:, None] > 0, counts / totals[:, None] * 100, 0.0)
+    pct_df = pd.DataFrame(percentages, index=group_names, columns=scheme.labels)
+    return counts_df, pct_df
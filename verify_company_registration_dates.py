@@ -1,6 +1,6 @@
-import pandas as pd
-import numpy as np
 import warnings
+from company_registration_data import load_company_registration
+from date_rules import DATE_RULES, date_rule_mask, rule_flags, rule_summary
 warnings.filterwarnings('ignore')
 
 print("="*80)
@@ -8,16 +8,20 @@ print("VERIFYING COMPANY REGISTRATION DATE FIELDS")
 print("="*80)
 
 # Load data
-df = pd.read_csv('companyregistrationnewsystem.csv', low_memory=False)
-
-# Convert dates
-df['created_date'] = pd.to_datetime(df['created_date'], errors='coerce')
-df['approved_date'] = pd.to_datetime(df['approved_date'], errors='coerce')
-df['registration_date'] = pd.to_datetime(df['registration_date'], errors='coerce')
-df['submission_date'] = pd.to_datetime(df['submission_date'], errors='coerce')
+df = load_company_registration()
 
 print(f"\nTotal records: {len(df):,}")
 
+# Evaluate every date rule in one pass
+company_rules = DATE_RULES['company_registration']
+rule_mask = date_rule_mask(df, 'company_registration')
+
+print("\n" + "-"*80)
+print("DATE RULE SUMMARY")
+print("-"*80)
+print(f"Records flagged by at least one rule: {(rule_mask != 0).sum():,}")
+print(rule_summary(rule_mask, company_rules).to_string(index=False, float_format='%.1f'))
+
 print("\n" + "-"*80)
 print("DATE FIELD ANALYSIS")
 print("-"*80)
@@ -39,18 +43,13 @@ print("\n" + "-"*80)
 print("CHECKING REGISTRATION_DATE ISSUE")
 print("-"*80)
 
-# Calculate time differences
-df['created_to_approved'] = (df['approved_date'] - df['created_date']).dt.total_seconds() / 86400
-df['approved_to_registration'] = (df['registration_date'] - df['approved_date']).dt.total_seconds() / 86400
-df['created_to_registration'] = (df['registration_date'] - df['created_date']).dt.total_seconds() / 86400
-
 print("\nTime Period Statistics:")
 print("-"*80)
 
 periods = {
-    'Created → Approved': 'created_to_approved',
-    'Approved → Registration': 'approved_to_registration',
-    'Created → Registration': 'created_to_registration'
+    'Created → Approved': 'created_to_approved_days',
+    'Approved → Registration': 'approved_to_registration_days',
+    'Created → Registration': 'created_to_registration_days'
 }
 
 for name, col in periods.items():
@@ -74,7 +73,7 @@ print("-"*80)
 
 # Show some sample records
 sample = df[df['registration_date'].notna()][['application_number', 'created_date', 'approved_date',
-                                                'registration_date', 'created_to_registration']].head(10)
+                                                'registration_date', 'created_to_registration_days']].head(10)
 print("\nFirst 10 records with registration_date:")
 print(sample.to_string())
 
@@ -83,8 +82,8 @@ print("ANALYSIS OF REGISTRATION_DATE PATTERNS")
 print("-"*80)
 
 # Check if registration_date is before created_date (historical data)
-records_with_reg = df[df['registration_date'].notna()].copy()
-historical = records_with_reg[records_with_reg['registration_date'] < records_with_reg['created_date']]
+records_with_reg = df[df['registration_date'].notna()]
+historical = df[rule_flags(rule_mask, company_rules, 'registration_before_created')]
 
 print(f"\nTotal records with registration_date: {len(records_with_reg):,}")
 print(f"Registration dates BEFORE creation date: {len(historical):,} ({len(historical)/len(records_with_reg)*100:.1f}%)")
@@ -96,7 +95,7 @@ if len(historical) > 0:
 
     print("\nExamples of historical dates:")
     historical_sample = historical[['application_number', 'created_date', 'registration_date',
-                                    'created_to_registration']].head(5)
+                                    'created_to_registration_days']].head(5)
     print(historical_sample.to_string())
 
 print("\n" + "-"*80)
@@ -129,13 +128,10 @@ print("\n" + "-"*80)
 print("VERIFIED CORRECT METRICS")
 print("-"*80)
 
-df['created_to_submission'] = (df['submission_date'] - df['created_date']).dt.total_seconds() / 86400
-df['submission_to_approved'] = (df['approved_date'] - df['submission_date']).dt.total_seconds() / 86400
-
 valid_periods = {
-    'Created → Submission': 'created_to_submission',
-    'Submission → Approved': 'submission_to_approved',
-    'Created → Approved': 'created_to_approved'
+    'Created → Submission': 'created_to_submission_days',
+    'Submission → Approved': 'submission_to_approved_days',
+    'Created → Approved': 'created_to_approved_days'
 }
 
 print("\nCORRECT Time Period Statistics:")
@@ -5,6 +5,7 @@ import seaborn as sns
 from datetime import datetime
 from collections import defaultdict
 import warnings
+from time_bins import WORKFLOW_BINS, cut
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -35,8 +36,7 @@ print()
 df = df[df['workflow_datetime'].notna()].copy()
 
 # Define time bins
-bins = [0, 1, 2, 3, 4, 5, 6, 7, 14, 21, 28, 35, 60, 90, 180, 365, np.inf]
-bin_labels = ['1d', '2d', '3d', '4d', '5d', '6d', '7d', '2wk', '3wk', '4wk', '5wk', '2mo', '3mo', '6mo', '1yr', '1yr+']
+bin_labels = WORKFLOW_BINS.labels
 
 # Define processes to analyze
 processes_to_analyze = [
@@ -153,23 +153,19 @@ def calculate_application_data_by_status(process_name, status_category):
             else:
                 transitions[trans_key] = trans_pct
         
-        # Assign to bin
-        bin_idx = np.digitize([total_days], bins)[0] - 1
-        if bin_idx < 0:
-            bin_idx = 0
-        if bin_idx >= len(bin_labels):
-            bin_idx = len(bin_labels) - 1
-        
         application_data.append({
             'app_id': app_id,
             'total_days': total_days,
-            'bin': bin_labels[bin_idx],
             'transitions': transitions,
             'num_steps': len(app_records)
         })
     
     print(f"    Processed {len(application_data):,} applications successfully")
-    return pd.DataFrame(application_data)
+    app_df = pd.DataFrame(application_data)
+    if len(app_df) > 0:
+        # Bin the whole column at once
+        app_df['bin'] = cut(app_df['total_days'], WORKFLOW_BINS)
+    return app_df
 
 def aggregate_transitions_by_bin(app_df):
     """Aggregate transition percentages by time bin."""
@@ -5,6 +5,8 @@ import seaborn as sns
 from datetime import datetime
 from collections import defaultdict
 import warnings
+from time_bins import WORKFLOW_BINS, cut
+from snapshots import get_as_of, load_snapshot
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -39,6 +41,11 @@ print()
 # Filter to records with valid dates
 df = df[df['workflow_datetime'].notna()].copy()
 
+# Evaluation date for days since last activity (export date unless $AS_OF is
+# set); an earlier date replays only the workflow events up to it
+today = get_as_of('workflow')
+df = load_snapshot(df, 'workflow', today)
+
 # Create status lookup dictionary from authoritative source
 print("Creating authoritative status lookup...")
 status_lookup = {}
@@ -62,8 +69,7 @@ for status, count in status_counts.items():
 print()
 
 # Define time bins
-bins = [0, 1, 2, 3, 4, 5, 6, 7, 14, 21, 28, 35, 60, 90, 180, 365, np.inf]
-bin_labels = ['1d', '2d', '3d', '4d', '5d', '6d', '7d', '2wk', '3wk', '4wk', '5wk', '2mo', '3mo', '6mo', '1yr', '1yr+']
+bin_labels = WORKFLOW_BINS.labels
 
 # Define processes to analyze
 processes_to_analyze = [
@@ -81,9 +87,6 @@ processes_to_analyze = [
 forward_colors = plt.cm.Blues(np.linspace(0.4, 0.9, 10))
 review_colors = plt.cm.Oranges(np.linspace(0.4, 0.8, 10))
 
-# Today's date for calculating days since last activity
-today = pd.Timestamp('2026-01-28')
-
 # Status categories mapping from authoritative status
 # User decision needed: Should "Back for review" be IN-PROCESS or treated separately?
 status_categories = {
@@ -231,23 +234,19 @@ def calculate_application_data_by_status(process_name, status_category):
             else:
                 transitions[trans_key] = trans_pct
         
-        # Assign to bin
-        bin_idx = np.digitize([total_days], bins)[0] - 1
-        if bin_idx < 0:
-            bin_idx = 0
-        if bin_idx >= len(bin_labels):
-            bin_idx = len(bin_labels) - 1
-        
         application_data.append({
             'app_id': app_id,
             'total_days': total_days,
-            'bin': bin_labels[bin_idx],
             'transitions': transitions,
             'num_steps': len(app_records)
         })
     
     print(f"    Processed {len(application_data):,} applications successfully")
-    return pd.DataFrame(application_data)
+    app_df = pd.DataFrame(application_data)
+    if len(app_df) > 0:
+        # Bin the whole column at once
+        app_df['bin'] = cut(app_df['total_days'], WORKFLOW_BINS)
+    return app_df
 
 def aggregate_transitions_by_bin(app_df):
     """Aggregate transition percentages by time bin."""